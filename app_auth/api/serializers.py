@@ -1,10 +1,12 @@
+from django.conf import settings
 from rest_framework import serializers
-from django.contrib.auth import authenticate
 from app_auth.models import UserProfile
 from django.contrib.auth.models import User
+from app_auth.hashing import authenticate_credentials, hash_password
 from app_auth.models import UserProfile, USER_TYPES
+from app_reviews.api.serializers import RatingStatsSerializer
+from core.images import variant_urls
 
-MAX_FILE_SIZE = 2 * 1024 * 1024
 
 
 class RegistrationSerializer(serializers.ModelSerializer):
@@ -57,7 +59,8 @@ class RegistrationSerializer(serializers.ModelSerializer):
             username=validated_data['username'],
             email=validated_data['email']
         )
-        user.set_password(validated_data['password'])
+        # Hashed on the shared hashing pool (503 when it is saturated).
+        user.password = hash_password(validated_data['password'])
         user.save()
 
         UserProfile.objects.create(user=user, type=profile_type)
@@ -69,7 +72,8 @@ class BusinessSerializer(serializers.ModelSerializer):
     """
     Serializer for business user profiles.
 
-    Returns user info (username, first_name, last_name) and profile details.
+    Returns user info (username, first_name, last_name), profile details and
+    the rating aggregates (BusinessRatingStats).
     """
     username = serializers.CharField(
         source="user.username",
@@ -87,8 +91,13 @@ class BusinessSerializer(serializers.ModelSerializer):
         help_text="User's last name"
     )
     user = serializers.PrimaryKeyRelatedField(read_only=True)
+    ratings = RatingStatsSerializer(
+        source='user.rating_stats', read_only=True, allow_null=True,
+        help_text="Review count, average rating and histogram"
+    )
 
     file = serializers.SerializerMethodField(help_text="URL to the profile picture")
+    file_variants = serializers.SerializerMethodField(help_text="Resized profile picture URLs by width and format")
 
     class Meta:
         model = UserProfile 
@@ -98,11 +107,13 @@ class BusinessSerializer(serializers.ModelSerializer):
             'first_name',
             'last_name',
             'file', 
+            'file_variants',
             'location',
             'tel',
             'description',
             'working_hours',
-            'type'
+            'type',
+            'ratings'
         ]
         read_only_fields = ['type']
 
@@ -111,6 +122,9 @@ class BusinessSerializer(serializers.ModelSerializer):
             return obj.file.url
         return None
 
+    def get_file_variants(self, obj):
+        return variant_urls(obj.file.storage, obj.file_variants)
+
 class CustomerSerializer(serializers.ModelSerializer):
     """
     Serializer for customer user profiles.
@@ -135,6 +149,7 @@ class CustomerSerializer(serializers.ModelSerializer):
     user = serializers.PrimaryKeyRelatedField(read_only=True)
 
     file = serializers.SerializerMethodField(help_text="URL to the profile picture")
+    file_variants = serializers.SerializerMethodField(help_text="Resized profile picture URLs by width and format")
 
     class Meta:
         model = UserProfile 
@@ -144,6 +159,7 @@ class CustomerSerializer(serializers.ModelSerializer):
             'first_name',
             'last_name',
             'file',
+            'file_variants',
             'type'
         ]
         read_only_fields = ['type']
@@ -153,6 +169,9 @@ class CustomerSerializer(serializers.ModelSerializer):
             return obj.file.url
         return None
 
+    def get_file_variants(self, obj):
+        return variant_urls(obj.file.storage, obj.file_variants)
+
 class UserDetailSerializer(serializers.HyperlinkedModelSerializer):
     """
     Detailed serializer for user profiles.
@@ -178,6 +197,11 @@ class UserDetailSerializer(serializers.HyperlinkedModelSerializer):
     email = serializers.EmailField(source='user.email', help_text="User email address")
     user = serializers.PrimaryKeyRelatedField(read_only=True, help_text="User ID")
     file = serializers.ImageField(required=False, help_text="Profile picture URL")
+    file_variants = serializers.SerializerMethodField(help_text="Resized profile picture URLs by width and format")
+    ratings = RatingStatsSerializer(
+        source='user.rating_stats', read_only=True, allow_null=True,
+        help_text="Review count, average rating and histogram (business profiles only)"
+    )
 
     class Meta:
         model = UserProfile 
@@ -188,18 +212,25 @@ class UserDetailSerializer(serializers.HyperlinkedModelSerializer):
             'first_name',
             'last_name',
             'file',
+            'file_variants',
             'location',
             'tel',
             'description',
             'working_hours',
             'type',
             'email',
-            'created_at'
+            'created_at',
+            'ratings'
         ]
         read_only_fields = ['type']
 
+    def get_file_variants(self, obj):
+        """Derivative URLs, shortened like `file` (see to_representation)."""
+        return variant_urls(obj.file.storage, obj.file_variants, lambda url: url.lstrip('/'))
+
     def validate_file(self, value):
-        if value.size > MAX_FILE_SIZE:
+        """Multipart uploads are checked while streaming (core.uploads); this covers the rest."""
+        if value.size > settings.IMAGE_UPLOAD_MAX_SIZE:
             raise serializers.ValidationError("Image file too large (max 2MB)")
         return value
         
@@ -251,12 +282,12 @@ class LoginSerializer(serializers.Serializer):
     password = serializers.CharField(write_only=True, help_text="Password for Login")
 
     def validate(self, data):
-        """Authenticate user credentials."""
+        """Authenticate user credentials, hashing on the shared hashing pool (503 when it is saturated)."""
         username = data.get('username')
         password = data.get('password')
 
         if username and password:
-            user = authenticate(username=username, password=password)
+            user = authenticate_credentials(username, password)
             
             if not user:
                 raise serializers.ValidationError("Invalid email or password")
@@ -8,6 +8,8 @@ from rest_framework.authtoken.models import Token
 from drf_spectacular.utils import extend_schema, OpenApiResponse
 
 from app_auth.models import UserProfile
+from core.conditional import ConditionalGetMixin
+from core.uploads import ImageUploadMixin
 from .serializers import (
     UserDetailSerializer,
     RegistrationSerializer,
@@ -24,9 +26,10 @@ from .permissions import IsProfileOwnerOrAdmin
 )
 class ProfileListView(generics.ListAPIView):
     """Admin-only: list all user profiles."""
-    queryset = UserProfile.objects.all()
+    queryset = UserProfile.objects.select_related('user__rating_stats')
     serializer_class = UserDetailSerializer
     permission_classes = [IsAdminUser]
+    query_budget = 5
 
 
 @extend_schema(
@@ -38,10 +41,11 @@ class BusinessListView(generics.ListAPIView):
     queryset = UserProfile.objects.all()
     serializer_class = BusinessSerializer
     permission_classes = [IsAuthenticated]
+    query_budget = 5
 
     def get_queryset(self):
-        """Return only business profiles."""
-        return UserProfile.objects.filter(type="business")
+        """Return only business profiles, with the user and rating stats joined for the serializer."""
+        return UserProfile.objects.filter(type="business").select_related('user__rating_stats')
 
 
 @extend_schema(
@@ -53,21 +57,35 @@ class CustomerListView(generics.ListAPIView):
     queryset = UserProfile.objects.all()
     serializer_class = CustomerSerializer
     permission_classes = [IsAuthenticated]
+    query_budget = 5
 
     def get_queryset(self):
-        """Return only customer profiles."""
-        return UserProfile.objects.filter(type="customer")
+        """Return only customer profiles, with the user joined for the serializer."""
+        return UserProfile.objects.filter(type="customer").select_related('user')
 
 
 @extend_schema(
     description="Retrieve or update a user profile. Only the profile owner or admin can update.",
     responses=UserDetailSerializer
 )
-class ProfileDetailView(generics.RetrieveUpdateAPIView):
-    """Retrieve or update a user profile."""
-    queryset = UserProfile.objects.all()
+class ProfileDetailView(ImageUploadMixin, ConditionalGetMixin, generics.RetrieveUpdateAPIView):
+    """Retrieve or update a user profile. GET answers 304 while the profile is unchanged."""
+    queryset = UserProfile.objects.select_related('user__rating_stats')
     serializer_class = UserDetailSerializer
     permission_classes = [IsAuthenticated, IsProfileOwnerOrAdmin]
+    etag_fields = [
+        'user_id', 'type', 'file', 'file_variants', 'location', 'tel', 'description',
+        'working_hours', 'created_at', 'user__username', 'user__first_name',
+        'user__last_name', 'user__email', 'user__rating_stats__review_count',
+        'user__rating_stats__rating_sum', 'user__rating_stats__last_review_at',
+    ]
+
+    def get_validators(self):
+        """Profiles carry no updated_at, so the ETag hashes the profile, user and rating stats columns."""
+        row = UserProfile.objects.filter(pk=self.kwargs['pk']).values_list(*self.etag_fields).first()
+        if row is None:
+            return None
+        return row, None
 
     def get_permissions(self):
         """Allow read-only access for authenticated users."""
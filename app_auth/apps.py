@@ -4,4 +4,7 @@ from django.apps import AppConfig
 class AppAuthConfig(AppConfig):
     default_auto_field = 'django.db.models.BigAutoField'
     name = 'app_auth'
-    verbose_name = "App_Profiles"
\ No newline at end of file
+    verbose_name = "App_Profiles"
+
+    def ready(self):
+        from . import signals  # noqa: F401
@@ -0,0 +1,118 @@
+"""
+Token authentication with a per-process cache.
+
+DRF's TokenAuthentication runs one query per request for the token and its
+user, and the profile type checks need the profile on top. Here the token,
+user and profile are loaded with one query (of the profile only the type; the
+other columns are deferred and read fresh if used), and the result is kept in a
+bounded LRU per worker process for AUTH_TOKEN_CACHE_TIMEOUT seconds, so a
+cache hit costs no query at all. A token is cached from its second load in a
+process on, once its user id is known and the generation can be read before
+the query.
+
+Entries are tagged with the user's authentication generation from the shared
+cache (see app_auth.cache); the signals in app_auth.signals replace it when
+one of the user's tokens is deleted, the user is deactivated or changes the
+password, or the profile is created, deleted or changes its type, which
+invalidates that user's entries in every worker.
+"""
+import copy
+import threading
+import time
+from collections import OrderedDict
+
+from django.conf import settings
+from django.utils.translation import gettext_lazy as _
+from rest_framework import exceptions
+from rest_framework.authentication import TokenAuthentication
+from rest_framework.authtoken.models import Token
+
+from app_auth.cache import get_auth_generation
+from app_auth.models import UserProfile
+
+# Profile columns that can change without invalidating cached tokens.
+DEFERRED_PROFILE_FIELDS = [
+    f'user__profile__{field.name}' for field in UserProfile._meta.concrete_fields
+    if field.name not in ('id', 'user', 'type')
+]
+
+
+class TokenCache:
+    """
+    Thread-safe LRU of `token key -> Token` with a TTL and the user's
+    generation per entry. Expired and stale entries stay until evicted, so
+    the key's user id is known when the token is loaded again.
+    """
+
+    def __init__(self):
+        self._entries = OrderedDict()
+        self._lock = threading.Lock()
+
+    def get(self, key):
+        """
+        A private copy of the cached token, or None if missing, expired or
+        tagged with another generation than the user's current one.
+        """
+        with self._lock:
+            entry = self._entries.get(key)
+            if entry is None:
+                return None
+            token, expires_at, generation = entry
+            if expires_at <= time.monotonic():
+                return None
+            self._entries.move_to_end(key)
+        if generation != get_auth_generation(token.user_id):
+            return None
+        # Requests must not share (and mutate) one user instance.
+        return copy.deepcopy(token)
+
+    def user_id(self, key):
+        """The user id of a token loaded before, or None."""
+        with self._lock:
+            entry = self._entries.get(key)
+        return entry[0].user_id if entry is not None else None
+
+    def set(self, key, token, generation, timeout=None):
+        expires_at = time.monotonic() + (settings.AUTH_TOKEN_CACHE_TIMEOUT if timeout is None else timeout)
+        with self._lock:
+            self._entries[key] = (copy.deepcopy(token), expires_at, generation)
+            self._entries.move_to_end(key)
+            while len(self._entries) > settings.AUTH_TOKEN_CACHE_SIZE:
+                self._entries.popitem(last=False)
+
+    def clear(self):
+        with self._lock:
+            self._entries.clear()
+
+
+token_cache = TokenCache()
+
+
+class CachedTokenAuthentication(TokenAuthentication):
+    """
+    Drop-in replacement for TokenAuthentication: `request.user` comes with its
+    profile loaded, and repeated requests with the same token are answered
+    from the per-process cache.
+    """
+
+    def authenticate_credentials(self, key):
+        token = token_cache.get(key)
+        if token is None:
+            # The generation is read before the query: a change committed in
+            # between then leaves the entry tagged with the old generation.
+            user_id = token_cache.user_id(key)
+            generation = get_auth_generation(user_id, create=True) if user_id is not None else None
+            token = (
+                Token.objects.select_related('user__profile').defer(*DEFERRED_PROFILE_FIELDS).filter(key=key).first()
+            )
+            if token is None:
+                raise exceptions.AuthenticationFailed(_('Invalid token.'))
+            if not token.user.is_active:
+                raise exceptions.AuthenticationFailed(_('User inactive or deleted.'))
+            if generation is not None and token.user_id == user_id:
+                token_cache.set(key, token, generation)
+            else:
+                # First load in this process: only remember the user id, so the
+                # next request can read the generation first and cache the token.
+                token_cache.set(key, token, generation, timeout=0)
+        return (token.user, token)
@@ -0,0 +1,87 @@
+"""
+Cached profile type ('business' / 'customer') and authentication generation
+per user id.
+
+Permission checks and review validation only need the type, which cannot be
+changed through the API, so it is read from the Django cache instead of
+loading the profile on every write request. The entry is dropped when a
+profile is created, deleted or saved with a different type (see
+app_auth.signals), immediately and again after commit, like the offer list
+generation.
+
+The authentication generation is a random value per user in the shared
+cache. Workers keep resolved tokens in a per-process cache
+(app_auth.authentication) tagged with the user's generation at load time;
+replacing it (token deleted, user deactivated or password changed, profile
+type changed) drops that user's entries in every worker at once. Values are
+never reused, so a generation that expired or was culled only costs a
+reload.
+"""
+import uuid
+
+from django.conf import settings
+from django.core.cache import cache
+from django.db import transaction
+
+from app_auth.models import UserProfile
+
+NO_PROFILE = ''
+
+
+def type_cache_key(user_id):
+    return f'profiles:type:{user_id}'
+
+
+def get_profile_type(user_id):
+    """Profile type of the user, or NO_PROFILE if the user has none."""
+    key = type_cache_key(user_id)
+    profile_type = cache.get(key)
+    if profile_type is None:
+        profile_type = UserProfile.objects.filter(user_id=user_id).values_list('type', flat=True).first() or NO_PROFILE
+        cache.set(key, profile_type, timeout=settings.PROFILE_TYPE_CACHE_TIMEOUT)
+    return profile_type
+
+
+def profile_type_of(user):
+    """
+    Profile type of a user instance; uses the profile loaded with the user
+    (CachedTokenAuthentication does) before falling back to the cache.
+    """
+    related = type(user).profile.related
+    if related.is_cached(user):
+        profile = related.get_cached_value(user)
+        return profile.type if profile is not None else NO_PROFILE
+    return get_profile_type(user.id)
+
+
+def invalidate_profile_type(user_id):
+    """Forget the cached type now and once the surrounding transaction commits."""
+    key = type_cache_key(user_id)
+    cache.delete(key)
+    transaction.on_commit(lambda: cache.delete(key))
+
+
+def auth_generation_key(user_id):
+    return f'auth:generation:{user_id}'
+
+
+def get_auth_generation(user_id, create=False):
+    """
+    The user's authentication generation; with `create`, a missing one is
+    started first, so tokens are never tagged with "no generation".
+    """
+    key = auth_generation_key(user_id)
+    generation = cache.get(key)
+    if generation is None and create:
+        cache.add(key, uuid.uuid4().hex, timeout=None)
+        generation = cache.get(key)
+    return generation
+
+
+def invalidate_authentication(user_id):
+    """Replace the user's generation now and once the surrounding transaction commits."""
+    key = auth_generation_key(user_id)
+    def bump():
+        cache.set(key, uuid.uuid4().hex, timeout=None)
+    bump()
+    transaction.on_commit(bump)
@@ -0,0 +1,15 @@
+from django.conf import settings
+from django.contrib.auth.hashers import PBKDF2PasswordHasher
+
+
+class ConfigurablePBKDF2PasswordHasher(PBKDF2PasswordHasher):
+    """
+    PBKDF2-SHA256 with the iteration count from settings.PASSWORD_PBKDF2_ITERATIONS
+    (0: Django's default). It keeps the `pbkdf2_sha256` algorithm name, so
+    existing hashes verify as before; hashes with another iteration count
+    are rehashed on the next successful login (see app_auth.hashing).
+    """
+
+    @property
+    def iterations(self):
+        return settings.PASSWORD_PBKDF2_ITERATIONS or PBKDF2PasswordHasher.iterations
@@ -0,0 +1,148 @@
+"""
+Password hashing off the worker's CPU, with load shedding.
+
+PBKDF2 is deliberately slow, and a burst of logins or registrations used to
+occupy every worker. The hash computations now run in a small pool of
+separate processes per worker (PASSWORD_HASHING_WORKERS), started with the
+niceness PASSWORD_HASHING_NICENESS, so the kernel schedules the gunicorn
+workers first and the other endpoints keep their latency while hashes queue.
+At most PASSWORD_HASHING_QUEUE_LIMIT hashes may be running or waiting per
+worker; beyond that a request is rejected at once with 503 and Retry-After.
+
+Settings are resolved here (hasher, salt, iterations); the pool processes
+only get plain arguments, and database access stays on the request thread.
+"""
+import multiprocessing
+import os
+import threading
+from concurrent.futures import ProcessPoolExecutor, TimeoutError
+from concurrent.futures.process import BrokenProcessPool
+
+from django.conf import settings
+from django.contrib.auth import get_user_model
+from django.contrib.auth.hashers import PBKDF2PasswordHasher, get_hasher, identify_hasher, is_password_usable
+from rest_framework import status
+from rest_framework.exceptions import APIException
+
+_executor = None
+_slots = None
+_lock = threading.Lock()
+
+
+class HashingOverloaded(APIException):
+    """Too many password hashes in flight; the client should retry shortly."""
+    status_code = status.HTTP_503_SERVICE_UNAVAILABLE
+    default_detail = "Too many login attempts right now, please retry shortly."
+    default_code = 'hashing_overloaded'
+
+    def __init__(self):
+        super().__init__()
+        # DRF's exception handler turns `wait` into a Retry-After header.
+        self.wait = settings.PASSWORD_HASHING_RETRY_AFTER
+
+
+def get_executor():
+    """The hashing pool and the semaphore bounding the hashes in flight."""
+    global _executor, _slots
+    with _lock:
+        if _slots is None:
+            _slots = threading.BoundedSemaphore(settings.PASSWORD_HASHING_QUEUE_LIMIT)
+        if _executor is None:
+            # spawn, not fork: forking a threaded gunicorn worker is unsafe.
+            _executor = ProcessPoolExecutor(
+                max_workers=settings.PASSWORD_HASHING_WORKERS,
+                mp_context=multiprocessing.get_context('spawn'),
+                initializer=os.nice,
+                initargs=(settings.PASSWORD_HASHING_NICENESS,),
+            )
+    return _executor, _slots
+
+
+def reset_executor(executor):
+    """Drop a pool whose process died, so the next hash starts a new one."""
+    global _executor
+    with _lock:
+        if _executor is executor:
+            _executor = None
+    executor.shutdown(wait=False)
+
+
+def run_hashing(func, *args):
+    """
+    Run `func(*args)` on the hashing pool and wait for the result, or raise
+    HashingOverloaded if the pool is at its queue limit or the hash does not
+    finish within PASSWORD_HASHING_TIMEOUT seconds (the niced pool gets no
+    CPU while the workers are saturated). `func` and `args` must be picklable.
+    """
+    executor, slots = get_executor()
+    if not slots.acquire(blocking=False):
+        raise HashingOverloaded()
+    try:
+        future = executor.submit(func, *args)
+        try:
+            return future.result(timeout=settings.PASSWORD_HASHING_TIMEOUT)
+        except TimeoutError:
+            future.cancel()
+            raise HashingOverloaded()
+    except BrokenProcessPool:
+        reset_executor(executor)
+        raise
+    finally:
+        slots.release()
+
+
+def encode(hasher, password, salt, params):
+    """hasher.encode(), in a pool process."""
+    return hasher.encode(password, salt, **params)
+
+
+def verify(hasher, password, encoded):
+    """hasher.verify(), in a pool process."""
+    return hasher.verify(password, encoded)
+
+
+def hash_password(password):
+    """make_password() with the hashing done on the pool."""
+    hasher = get_hasher('default')
+    # The pool does not see overridden settings: pass the work factor along.
+    params = {'iterations': hasher.iterations} if isinstance(hasher, PBKDF2PasswordHasher) else {}
+    return run_hashing(encode, hasher, password, hasher.salt(), params)
+
+
+def check_password(password, encoded):
+    """django.contrib.auth.hashers.check_password() with the hashing done on the pool."""
+    if password is None or not is_password_usable(encoded):
+        return False
+    try:
+        hasher = identify_hasher(encoded)
+    except ValueError:
+        return False
+    return run_hashing(verify, hasher, password, encoded)
+
+
+def needs_rehash(encoded):
+    """Whether a verified hash was made by another hasher or with other parameters than the preferred one."""
+    preferred = get_hasher('default')
+    return identify_hasher(encoded).algorithm != preferred.algorithm or preferred.must_update(encoded)
+
+
+def authenticate_credentials(username, password):
+    """
+    The active user with these credentials, or None; what ModelBackend does,
+    with the hashing on the pool. A hash made with other parameters than the
+    current hasher's (e.g. PASSWORD_PBKDF2_ITERATIONS changed) is replaced.
+    """
+    user_model = get_user_model()
+    try:
+        user = user_model._default_manager.get_by_natural_key(username)
+    except user_model.DoesNotExist:
+        # Hash anyway, so response times do not reveal which usernames exist.
+        hash_password(password)
+        return None
+
+    if not check_password(password, user.password) or not user.is_active:
+        return None
+    if needs_rehash(user.password):
+        user.password = hash_password(password)
+        user.save(update_fields=['password'])
+    return user
@@ -0,0 +1,138 @@
+import json
+import multiprocessing
+import random
+import threading
+import time
+from collections import Counter
+from urllib.error import HTTPError, URLError
+from urllib.request import Request, urlopen
+
+from django.core.management.base import BaseCommand
+
+
+def percentile(timings, fraction):
+    timings = sorted(timings)
+    return timings[min(len(timings) - 1, int(len(timings) * fraction))] if timings else float('nan')
+
+
+def fetch(request):
+    """Status code of the request ('error' if the connection failed) and its Retry-After seconds."""
+    try:
+        with urlopen(request, timeout=30) as response:
+            response.read()
+            return response.status, None
+    except HTTPError as error:
+        retry_after = error.headers.get('Retry-After')
+        return error.code, int(retry_after) if retry_after and retry_after.isdigit() else None
+    except (URLError, OSError):  # refused, reset or timed out
+        return 'error', None
+
+
+def run_threads(target, count, duration):
+    """Run `count` threads of `target(deadline)` for `duration` seconds."""
+    deadline = time.monotonic() + duration
+    threads = [threading.Thread(target=target, args=(deadline,)) for _ in range(count)]
+    for thread in threads:
+        thread.start()
+    for thread in threads:
+        thread.join()
+
+
+def run_storm(url, body, threads, duration, honor_retry_after, started, results):
+    """
+    Post logins from `threads` threads for `duration` seconds and put the
+    statuses on `results`. Runs in its own process, so the storm does not
+    compete with the probe threads for the benchmark's GIL.
+    """
+    logins, lock = Counter(), threading.Lock()
+
+    def storm(deadline):
+        while time.monotonic() < deadline:
+            code, retry_after = fetch(Request(url, data=body, headers={'Content-Type': 'application/json'}))
+            with lock:
+                logins[code] += 1
+            if retry_after and honor_retry_after:
+                pause = retry_after * (1 + random.random())
+                time.sleep(min(pause, max(deadline - time.monotonic(), 0)))
+
+    started.set()
+    run_threads(storm, threads, duration)
+    results.put(dict(logins))
+
+
+class Command(BaseCommand):
+    """
+    Measure another endpoint's latency with and without a login storm
+    against a running server (e.g. the Docker image under gunicorn).
+
+    Probe threads request `--probe` for `--duration` seconds, once alone and
+    once while `--storm` threads (in a separate process) post logins as fast
+    as they can. After a 503 they wait Retry-After plus up to as much again of
+    random jitter, like a well-behaved client (`--ignore-retry-after` retries
+    at once). Logins are counted by status: 503 means they were shed by the
+    hashing pool.
+    """
+    help = "Benchmark p50/p99 of a probe endpoint during a login storm against a live server."
+
+    def add_arguments(self, parser):
+        parser.add_argument('--url', default='http://127.0.0.1:8000', help="Base URL of the running server.")
+        parser.add_argument('--probe', default='/api/base-info/', help="Path measured during the storm.")
+        parser.add_argument('--username', default='Guest Customer')
+        parser.add_argument('--password', default='123456')
+        parser.add_argument('--storm', type=int, default=50, help="Concurrent login threads.")
+        parser.add_argument('--probes', type=int, default=4, help="Concurrent probe threads.")
+        parser.add_argument(
+            '--rate', type=float, default=25.0,
+            help="Probes per second per probe thread (0: back to back, which saturates a small server).",
+        )
+        parser.add_argument('--duration', type=float, default=10.0, help="Seconds per phase.")
+        parser.add_argument('--ignore-retry-after', action='store_true', help="Retry shed logins at once.")
+
+    def handle(self, *args, **options):
+        base = options['url'].rstrip('/')
+        probe_url = base + options['probe']
+        self.interval = 1 / options['rate'] if options['rate'] > 0 else 0
+        baseline = self.run_probes(probe_url, options['probes'], options['duration'])
+
+        context = multiprocessing.get_context('spawn')
+        started, results = context.Event(), context.Queue()
+        storm = context.Process(target=run_storm, args=(
+            base + '/api/login/',
+            json.dumps({'username': options['username'], 'password': options['password']}).encode(),
+            options['storm'], options['duration'], not options['ignore_retry_after'], started, results,
+        ))
+        storm.start()
+        started.wait()
+        during = self.run_probes(probe_url, options['probes'], options['duration'])
+        logins = results.get()
+        storm.join()
+
+        for name, (timings, probes) in (("baseline", baseline), ("login storm", during)):
+            self.stdout.write(
+                f"{name:<12} {len(timings):6d} probes   p50 {percentile(timings, 0.5) * 1000:8.2f} ms   "
+                f"p99 {percentile(timings, 0.99) * 1000:8.2f} ms   by status: {self.format_statuses(probes)}"
+            )
+        self.stdout.write(f"logins by status: {self.format_statuses(logins)}")
+
+    def run_probes(self, probe_url, threads, duration):
+        """Request the probe from `threads` threads for `duration` seconds; return the timings and statuses."""
+        timings, probes, lock = [], Counter(), threading.Lock()
+
+        def probe(deadline):
+            # Open loop: a slow response does not delay the next probe's schedule.
+            next_at = time.monotonic() + random.random() * self.interval
+            while next_at < deadline:
+                time.sleep(max(next_at - time.monotonic(), 0))
+                start = time.perf_counter()
+                code, _ = fetch(probe_url)
+                elapsed = time.perf_counter() - start
+                with lock:
+                    timings.append(elapsed)
+                    probes[code] += 1
+                next_at = max(next_at + self.interval, time.monotonic()) if self.interval else time.monotonic()
+
+        run_threads(probe, threads, duration)
+        return timings, probes
+
+    def format_statuses(self, statuses):
+        return ", ".join(f"{code}: {count}" for code, count in sorted(statuses.items(), key=str)) or "-"
@@ -0,0 +1,27 @@
+from django.core.management.base import BaseCommand
+
+from app_auth.models import UserProfile
+from app_auth.signals import build_profile_picture_variants
+
+
+class Command(BaseCommand):
+    """
+    Render missing profile picture derivatives synchronously.
+
+    Covers pictures whose background job was lost (e.g. a worker restart) and
+    pictures uploaded before the image pipeline existed.
+    """
+    help = "Generate resized derivatives for profile pictures that have none."
+
+    def add_arguments(self, parser):
+        parser.add_argument('--all', action='store_true', help="Regenerate derivatives for every profile picture.")
+
+    def handle(self, *args, **options):
+        profiles = UserProfile.objects.exclude(file='')
+        if not options['all']:
+            profiles = profiles.filter(file_variants={})
+        count = 0
+        for profile_id in profiles.values_list('id', flat=True).iterator():
+            build_profile_picture_variants(profile_id)
+            count += 1
+        self.stdout.write(self.style.SUCCESS(f"Generated derivatives for {count} profile picture(s)."))
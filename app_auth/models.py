@@ -26,21 +26,56 @@ def profile_picture_path(instance, filename):
         return f'profile_pictures/user_{instance.user.id}/profile.{ext}'
 
 
+def profile_picture_derivative_path(instance, width, ext):
+    """
+    Generate the path of a resized derivative of a profile picture.
+
+    The file is saved next to the original:
+        MEDIA_ROOT/profile_pictures/user_<id>/profile_<width>.<ext>
+
+    Args:
+        instance (UserProfile): The profile instance associated with the user.
+        width (int): Width of the derivative in pixels.
+        ext (str): File extension of the derivative format.
+    """
+    return f'profile_pictures/user_{instance.user_id}/profile_{width}.{ext}'
+
+
 class UserProfile(models.Model):
     """
     Extended profile model linked to User.
 
     Stores profile picture, contact info, description,
     and optional working hours for both business and customer users.
+    `file_variants` lists the resized derivatives of the picture once generated.
     """
     user = models.OneToOneField(User, on_delete=models.CASCADE, related_name='profile')
     type = models.CharField(max_length=8, choices=USER_TYPES, blank=False, null=False)
     file = models.FileField(upload_to=profile_picture_path, blank=True, null=False, storage=OverwriteStorage())
+    file_variants = models.JSONField(default=dict, blank=True, editable=False)
     location = models.CharField(max_length = 80, blank=True)
     tel = models.CharField(max_length = 30, blank=True)
     description = models.TextField(blank=True)
     working_hours = models.TextField(blank=True)
     created_at = models.DateTimeField(auto_now_add=True)
 
+    class Meta:
+        """Index the business / customer profile lists."""
+        indexes = [
+            models.Index(fields=['type'], name='userprofile_type_idx'),
+        ]
+
     def __str__(self):
         return self.user.username
+
+    @classmethod
+    def from_db(cls, db, field_names, values):
+        """Remember the stored type, so a save can tell whether it changed."""
+        instance = super().from_db(db, field_names, values)
+        instance._saved_type = instance.__dict__.get('type')
+        return instance
+
+    def save(self, *args, **kwargs):
+        super().save(*args, **kwargs)
+        # After post_save: every receiver sees the type this save replaced.
+        self._saved_type = self.type
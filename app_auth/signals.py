@@ -0,0 +1,93 @@
+from django.contrib.auth.models import User
+from django.db.models.signals import pre_save, post_init, post_save, post_delete
+from django.dispatch import receiver
+from rest_framework.authtoken.models import Token
+
+from app_auth.cache import invalidate_authentication, invalidate_profile_type
+from app_auth.models import UserProfile, profile_picture_derivative_path
+from core.images import enqueue_after_commit, generate_derivatives
+
+
+def build_profile_picture_variants(profile_id):
+    """Worker job: render the derivatives of a profile picture and record them."""
+    profile = UserProfile.objects.filter(pk=profile_id).only('id', 'user_id', 'file').first()
+    if profile is None or not profile.file:
+        return
+    variants = generate_derivatives(
+        profile.file, lambda width, ext: profile_picture_derivative_path(profile, width, ext)
+    )
+    UserProfile.objects.filter(pk=profile_id, file=profile.file.name).update(file_variants=variants)
+
+
+@receiver(pre_save, sender=UserProfile)
+def reset_file_variants_on_upload(sender, instance, raw=False, **kwargs):
+    """A new (or removed) picture makes the old derivatives stale."""
+    instance._file_uploaded = bool(instance.file) and not instance.file._committed
+    if raw:
+        return
+    if instance._file_uploaded or not instance.file:
+        instance.file_variants = {}
+
+
+@receiver(post_save, sender=UserProfile)
+def queue_file_variants_on_upload(sender, instance, raw=False, **kwargs):
+    """Render derivatives off the request path once the upload is committed."""
+    if raw or not getattr(instance, '_file_uploaded', False):
+        return
+    enqueue_after_commit(build_profile_picture_variants, instance.pk)
+
+
+@receiver(post_save, sender=UserProfile)
+def invalidate_cached_profile_type_on_save(sender, instance, created, raw=False, **kwargs):
+    """A new profile or a changed type (admin only) makes the cached type stale."""
+    if raw:
+        return
+    # Also after commit: a concurrent request may cache "no profile" until then.
+    if created or getattr(instance, '_saved_type', None) != instance.type:
+        invalidate_profile_type(instance.user_id)
+
+
+@receiver(post_delete, sender=UserProfile)
+def invalidate_cached_profile_type_on_delete(sender, instance, **kwargs):
+    """A deleted profile makes the cached type stale."""
+    invalidate_profile_type(instance.user_id)
+
+
+@receiver(post_save, sender=UserProfile)
+def invalidate_authentication_on_profile_save(sender, instance, created, raw=False, **kwargs):
+    """Cached tokens carry the profile type: a new profile or a changed type makes the user's stale."""
+    if raw:
+        return
+    if created or getattr(instance, '_saved_type', None) != instance.type:
+        invalidate_authentication(instance.user_id)
+
+
+@receiver(post_delete, sender=UserProfile)
+def invalidate_authentication_on_profile_delete(sender, instance, **kwargs):
+    invalidate_authentication(instance.user_id)
+
+
+def auth_state(user):
+    """The user columns cached tokens depend on (None where not loaded)."""
+    return user.__dict__.get('is_active'), user.__dict__.get('password')
+
+
+@receiver(post_init, sender=User)
+def remember_auth_state(sender, instance, **kwargs):
+    instance._saved_auth_state = auth_state(instance)
+
+
+@receiver(post_save, sender=User)
+def invalidate_authentication_on_user_change(sender, instance, created, raw=False, **kwargs):
+    """Deactivating a user or changing the password stops the user's cached tokens; other edits do not."""
+    if raw:
+        return
+    if not created and auth_state(instance) != instance._saved_auth_state:
+        invalidate_authentication(instance.pk)
+    instance._saved_auth_state = auth_state(instance)
+
+
+@receiver(post_delete, sender=Token)
+def invalidate_authentication_on_token_delete(sender, instance, **kwargs):
+    """A deleted token must stop authenticating in every worker."""
+    invalidate_authentication(instance.user_id)
@@ -0,0 +1,83 @@
+from django.contrib.auth.hashers import identify_hasher
+from django.contrib.auth.models import User
+from django.test import override_settings
+from django.urls import reverse
+from rest_framework import status
+from rest_framework.test import APIClient, APITestCase
+
+from app_auth.hashing import get_executor
+from app_auth.models import UserProfile
+
+
+@override_settings(PASSWORD_PBKDF2_ITERATIONS=1000)
+class LoginTests(APITestCase):
+
+    def setUp(self):
+        """ User, Profile """
+        self.user = User.objects.create_user(username="cust", password="pass123")
+        UserProfile.objects.create(user=self.user, type="customer")
+        self.client = APIClient()
+
+    def login(self, password="pass123"):
+        return self.client.post(reverse("login"), {"username": "cust", "password": password}, format="json")
+
+    def iterations(self):
+        self.user.refresh_from_db()
+        return identify_hasher(self.user.password).decode(self.user.password)["iterations"]
+
+
+    """ TESTS LOGIN """
+    """ ----------- """
+    # login hashes on the pool and returns a token (valid)
+    def test_login(self):
+        response = self.login()
+        self.assertEqual(response.status_code, status.HTTP_200_OK)
+        self.assertEqual(response.data["user_id"], self.user.id)
+
+
+    # wrong password and unknown user (invalid)
+    def test_login_invalid_credentials(self):
+        self.assertEqual(self.login("wrong").status_code, status.HTTP_400_BAD_REQUEST)
+        response = self.client.post(reverse("login"), {"username": "nobody", "password": "pass123"}, format="json")
+        self.assertEqual(response.status_code, status.HTTP_400_BAD_REQUEST)
+
+
+    # a changed iteration count rehashes the password on login (valid)
+    def test_login_rehashes_password(self):
+        self.assertEqual(self.iterations(), 1000)
+        with override_settings(PASSWORD_PBKDF2_ITERATIONS=2000):
+            self.assertEqual(self.login().status_code, status.HTTP_200_OK)
+        self.assertEqual(self.iterations(), 2000)
+        self.assertEqual(self.login().status_code, status.HTTP_200_OK)
+
+
+    # a saturated hashing pool sheds logins and registrations with 503 (invalid)
+    def test_hashing_pool_saturated(self):
+        _, slots = get_executor()
+        acquired = 0
+        while slots.acquire(blocking=False):
+            acquired += 1
+        try:
+            response = self.login()
+            self.assertEqual(response.status_code, status.HTTP_503_SERVICE_UNAVAILABLE)
+            self.assertIn("Retry-After", response)
+
+            response = self.client.post(reverse("register"), {
+                "username": "new", "email": "new@example.com", "password": "pass123",
+                "repeated_password": "pass123", "type": "customer",
+            }, format="json")
+            self.assertEqual(response.status_code, status.HTTP_503_SERVICE_UNAVAILABLE)
+            self.assertFalse(User.objects.filter(username="new").exists())
+        finally:
+            for _ in range(acquired):
+                slots.release()
+
+        self.assertEqual(self.login().status_code, status.HTTP_200_OK)
+
+
+    # a hash that does not finish in time is shed with 503 (invalid)
+    @override_settings(PASSWORD_HASHING_TIMEOUT=0)
+    def test_hashing_timeout(self):
+        response = self.login()
+        self.assertEqual(response.status_code, status.HTTP_503_SERVICE_UNAVAILABLE)
+        self.assertIn("Retry-After", response)
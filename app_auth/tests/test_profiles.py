@@ -0,0 +1,273 @@
+import shutil
+import tempfile
+from io import BytesIO
+
+from PIL import Image
+from django.core.files.uploadedfile import SimpleUploadedFile
+from django.db import connection
+from django.test import override_settings
+from django.urls import reverse
+from rest_framework import status
+from rest_framework.test import APIClient, APITestCase
+from django.contrib.auth.models import User
+from rest_framework.authtoken.models import Token
+
+from app_auth.cache import NO_PROFILE, get_profile_type, invalidate_authentication
+from app_auth.models import UserProfile
+from core.query_budget import QueryBudgetTestMixin
+
+
+class ProfileTests(QueryBudgetTestMixin, APITestCase):
+
+    def setUp(self):
+        """ Users, Profiles, Tokens """
+        self.business_user = User.objects.create_user(username="biz", password="pass123")
+        self.customer_user = User.objects.create_user(username="cust", password="pass123")
+
+        self.business_profile = UserProfile.objects.create(user=self.business_user, type="business")
+        self.customer_profile = UserProfile.objects.create(user=self.customer_user, type="customer")
+
+        self.business_token = Token.objects.create(user=self.business_user)
+        self.customer_token = Token.objects.create(user=self.customer_user)
+
+        self.client = APIClient()
+
+    def authenticate_user(self, user_type):
+        if user_type == "business":
+            token = self.business_token
+        elif user_type == "customer":
+            token = self.customer_token
+        else:
+            raise ValueError("Unknown user type")
+        self.client.credentials(HTTP_AUTHORIZATION='Token ' + token.key)
+
+    def make_image(self, name="profile.png", size=(800, 400)):
+        buffer = BytesIO()
+        Image.new("RGB", size, "orange").save(buffer, format="PNG")
+        return SimpleUploadedFile(name, buffer.getvalue(), content_type="image/png")
+
+    def use_temp_media(self):
+        media_root = tempfile.mkdtemp()
+        self.addCleanup(shutil.rmtree, media_root, ignore_errors=True)
+        settings_override = override_settings(MEDIA_ROOT=media_root, IMAGE_PIPELINE_EAGER=True)
+        settings_override.enable()
+        self.addCleanup(settings_override.disable)
+        return media_root
+
+    def create_profiles(self, profile_type, count=3):
+        for index in range(count):
+            user = User.objects.create(username=f"{profile_type}{index}", first_name="First")
+            UserProfile.objects.create(user=user, type=profile_type)
+
+
+    """ TESTS PROFILES """
+    """ -------------- """
+    # GET business profiles (valid)
+    def test_get_business_profiles(self):
+        self.authenticate_user("customer")
+        response = self.client.get(reverse("business-list"))
+
+        self.assertEqual(response.status_code, status.HTTP_200_OK)
+        self.assertEqual(len(response.data), 1)
+        self.assertEqual(response.data[0]["username"], "biz")
+
+
+    # GET profile detail (valid)
+    def test_get_profile_detail(self):
+        self.authenticate_user("customer")
+        response = self.client.get(reverse("userprofile-detail", args=[self.business_profile.pk]))
+
+        self.assertEqual(response.status_code, status.HTTP_200_OK)
+        self.assertEqual(response.data["username"], "biz")
+        self.assertEqual(response.data["type"], "business")
+
+
+    # profile detail answers 304 until the profile or its user changes (valid)
+    def test_profile_detail_conditional_get(self):
+        self.authenticate_user("customer")
+        url = reverse("userprofile-detail", args=[self.business_profile.pk])
+        etag = self.client.get(url)["ETag"]
+
+        with self.assertQueryBudget(3):  # token, user, validators
+            response = self.client.get(url, HTTP_IF_NONE_MATCH=etag)
+        self.assertEqual(response.status_code, status.HTTP_304_NOT_MODIFIED)
+
+        User.objects.filter(pk=self.business_user.pk).update(first_name="Bea")
+        response = self.client.get(url, HTTP_IF_NONE_MATCH=etag)
+        self.assertEqual(response.status_code, status.HTTP_200_OK)
+        self.assertEqual(response.data["first_name"], "Bea")
+
+
+    """ TESTS QUERY BUDGET """
+    """ ------------------ """
+    # profile lists do not grow queries with number of profiles (valid)
+    def test_profile_lists_constant_queries(self):
+        self.authenticate_user("customer")
+        for url_name, profile_type in (("business-list", "business"), ("customer-list", "customer")):
+            url = reverse(url_name)
+            self.assertConstantQueries(
+                lambda: self.client.get(url),
+                lambda: self.create_profiles(profile_type),
+            )
+
+
+    # admin profile list does not grow queries with number of profiles (valid)
+    def test_admin_profile_list_constant_queries(self):
+        admin = User.objects.create_superuser(username="admin", password="pass123")
+        self.client.force_authenticate(admin)
+        url = reverse("profile-list")
+
+        self.assertConstantQueries(lambda: self.client.get(url), lambda: self.create_profiles("customer"))
+
+
+
+    """ TESTS IMAGE DERIVATIVES """
+    """ ----------------------- """
+    # upload returns at once, derivatives are generated after commit (valid)
+    def test_profile_picture_derivatives(self):
+        self.use_temp_media()
+        self.authenticate_user("business")
+        url = reverse("userprofile-detail", args=[self.business_profile.pk])
+
+        with self.captureOnCommitCallbacks(execute=True) as callbacks:
+            response = self.client.patch(url, {"file": self.make_image()}, format="multipart")
+        self.assertEqual(response.status_code, status.HTTP_200_OK)
+        self.assertEqual(response.data["file_variants"], {})
+        self.assertEqual(len(callbacks), 1)
+
+        self.business_profile.refresh_from_db()
+        variants = self.business_profile.file_variants
+        self.assertEqual(sorted(variants, key=int), ["160", "320", "640"])
+        with self.business_profile.file.storage.open(variants["160"]["webp"]) as derivative:
+            self.assertEqual(Image.open(derivative).size, (160, 80))
+
+        response = self.client.get(url)
+        self.assertEqual(
+            response.data["file_variants"]["320"]["jpg"],
+            f"media/profile_pictures/user_{self.business_user.id}/profile_320.jpg"
+        )
+
+
+    # new upload resets stale derivatives (valid)
+    def test_profile_picture_reupload_resets_variants(self):
+        self.use_temp_media()
+        self.business_profile.file = self.make_image()
+        with self.captureOnCommitCallbacks(execute=True):
+            self.business_profile.save()
+        self.business_profile.refresh_from_db()
+        self.assertTrue(self.business_profile.file_variants)
+
+        self.business_profile.file = self.make_image(size=(100, 100))
+        with self.captureOnCommitCallbacks(execute=False):
+            self.business_profile.save()
+        self.business_profile.refresh_from_db()
+        self.assertEqual(self.business_profile.file_variants, {})
+
+
+    # upload is named after its sniffed type, not the client's extension (valid)
+    def test_profile_picture_type_sniffed(self):
+        self.use_temp_media()
+        self.authenticate_user("business")
+        url = reverse("userprofile-detail", args=[self.business_profile.pk])
+
+        with self.captureOnCommitCallbacks(execute=False):
+            response = self.client.patch(url, {"file": self.make_image(name="photo.txt")}, format="multipart")
+        self.assertEqual(response.status_code, status.HTTP_200_OK)
+        self.business_profile.refresh_from_db()
+        self.assertTrue(self.business_profile.file.name.endswith("/profile.png"))
+
+
+    # bogus, oversized and too many pixels are rejected while streaming (invalid)
+    def test_profile_picture_rejected(self):
+        self.use_temp_media()
+        self.authenticate_user("business")
+        url = reverse("userprofile-detail", args=[self.business_profile.pk])
+        uploads = [
+            (SimpleUploadedFile("profile.png", b"<html>not an image</html>"), "Unsupported image type"),
+            (SimpleUploadedFile("profile.png", b"\x89PNG\r\n\x1a\n" + b"\0" * (2 * 1024 * 1024)), "too large"),
+            (self.make_image(size=(2000, 1000)), "dimensions too large"),
+        ]
+        with override_settings(IMAGE_UPLOAD_MAX_PIXELS=1_000_000):
+            for upload, message in uploads:
+                response = self.client.patch(url, {"file": upload}, format="multipart")
+                self.assertEqual(response.status_code, status.HTTP_400_BAD_REQUEST)
+                self.assertIn(message, response.data["detail"])
+        self.business_profile.refresh_from_db()
+        self.assertFalse(self.business_profile.file)
+
+
+    # profile type is cached and dropped when the profile goes away (valid)
+    def test_cached_profile_type(self):
+        self.assertEqual(get_profile_type(self.business_user.pk), "business")
+        with self.assertQueryBudget(0):
+            self.assertEqual(get_profile_type(self.business_user.pk), "business")
+
+        self.business_profile.delete()
+        self.assertEqual(get_profile_type(self.business_user.pk), NO_PROFILE)
+
+
+    # token, user and profile are cached per process; repeated requests skip the lookup (valid)
+    def test_cached_token_authentication(self):
+        self.authenticate_user("customer")
+        url = reverse("orders-list")
+        self.client.get(url)  # the first load only learns the token's user
+        with self.assertQueryBudget(3) as cold:
+            self.client.get(url)
+        with self.assertQueryBudget(3) as warm:
+            response = self.client.get(url)
+
+        self.assertEqual(response.status_code, status.HTTP_200_OK)
+        self.assertEqual(len(warm.captured_queries), len(cold.captured_queries) - 1)
+
+
+    # other users' writes and profile edits keep the cached token (valid)
+    def test_cached_token_survives_unrelated_writes(self):
+        self.authenticate_user("customer")
+        url = reverse("orders-list")
+        self.client.get(url)
+        with self.assertQueryBudget(3) as cold:
+            self.client.get(url)
+
+        self.customer_user.first_name = "Renamed"
+        self.customer_user.save()
+        other = User.objects.create_user(username="other", password="pass123")
+        UserProfile.objects.create(user=other, type="business")
+        Token.objects.create(user=other).delete()
+
+        with self.assertQueryBudget(3) as warm:
+            self.client.get(url)
+        self.assertEqual(len(warm.captured_queries), len(cold.captured_queries) - 1)
+
+
+    # deactivated users and deleted tokens are not served from the cache (invalid)
+    def test_cached_token_invalidated(self):
+        self.authenticate_user("customer")
+        url = reverse("orders-list")
+        self.assertEqual(self.client.get(url).status_code, status.HTTP_200_OK)
+
+        self.customer_user.is_active = False
+        self.customer_user.save()
+        self.assertEqual(self.client.get(url).status_code, status.HTTP_401_UNAUTHORIZED)
+
+        self.authenticate_user("business")
+        self.assertEqual(self.client.get(url).status_code, status.HTTP_200_OK)
+        self.business_token.delete()
+        self.assertEqual(self.client.get(url).status_code, status.HTTP_401_UNAUTHORIZED)
+
+
+    # a password change during the token lookup is not cached under the new generation (invalid)
+    def test_cached_token_generation_read_before_lookup(self):
+        self.authenticate_user("customer")
+        url = reverse("orders-list")
+        self.client.get(url)
+
+        def change_password(execute, sql, params, many, context):
+            if 'authtoken_token' in sql:
+                invalidate_authentication(self.customer_user.pk)
+            return execute(sql, params, many, context)
+
+        with connection.execute_wrapper(change_password):
+            self.client.get(url)
+        with self.assertQueryBudget(3) as reloaded:
+            self.client.get(url)
+        self.assertTrue(any('authtoken_token' in query['sql'] for query in reloaded.captured_queries))
@@ -18,5 +18,5 @@ class BaseInfoSerializer(serializers.Serializer):
     )
     offer_count = serializers.IntegerField(
         read_only=True,
-        help_text="Total number of business profiles."
+        help_text="Total number of offers."
     )
\ No newline at end of file
@@ -1,31 +1,41 @@
-from rest_framework.views import APIView
-from django.db.models import Avg
-from rest_framework.response import Response
+from django.conf import settings
+from django.utils.cache import patch_cache_control
+from rest_framework import generics
 from rest_framework.permissions import AllowAny
 
 from drf_spectacular.utils import extend_schema
 
-from app_reviews.models import Review
-from app_auth.models import UserProfile
-from app_offers.models import Offer
+from app_meta import platform
+from core.conditional import ConditionalGetMixin
 from .serializers import BaseInfoSerializer
 
 @extend_schema(
     description="Retrieve basic platform statistics, including total reviews, average rating, number of business profiles, and total offers.",
     responses=BaseInfoSerializer
 )
-class BaseInfoView(APIView):
-    """Provide aggregated base information about the platform for dashboard or overview purposes."""
+class BaseInfoView(ConditionalGetMixin, generics.RetrieveAPIView):
+    """
+    Provide aggregated base information about the platform for dashboard or overview purposes.
+    Served from the PlatformStats row with one primary-key read; the response
+    carries ETag / Last-Modified and a public Cache-Control max-age, so
+    clients and proxies can absorb repeated requests.
+    """
     permission_classes = [AllowAny]
-    
-    def get(self, request):
-        """Return total counts and average rating for reviews, business profiles, and offers."""
-        average_rating =  Review.objects.aggregate(average=Avg('rating'))['average']
-        serializer = BaseInfoSerializer({
-            'review_count' : Review.objects.count(),
-            'average_rating': average_rating,
-            'business_profile_count': UserProfile.objects.filter(type='business').count(),
-            'offer_count': Offer.objects.count()
-            })
-        
-        return Response(serializer.data)
+    serializer_class = BaseInfoSerializer
+    query_budget = 1
+
+    def get_object(self):
+        if not hasattr(self, '_stats'):
+            self._stats = platform.get_stats()
+        return self._stats
+
+    def get_validators(self):
+        stats = self.get_object()
+        source = (stats.review_count, stats.rating_sum, stats.business_profile_count, stats.offer_count)
+        return source, stats.updated_at
+
+    def finalize_response(self, request, response, *args, **kwargs):
+        response = super().finalize_response(request, response, *args, **kwargs)
+        if response.status_code in (200, 304):
+            patch_cache_control(response, public=True, max_age=settings.BASE_INFO_MAX_AGE)
+        return response
@@ -0,0 +1,167 @@
+import re
+import uuid
+from collections import namedtuple
+
+from django.conf import settings
+from django.contrib.auth.models import User
+from django.core.management.base import BaseCommand, CommandError
+from django.db import connection, transaction
+from django.test.utils import CaptureQueriesContext, override_settings
+from django.urls import URLPattern, URLResolver, get_resolver, resolve, reverse
+from rest_framework.mixins import ListModelMixin
+from rest_framework.test import APIRequestFactory, force_authenticate
+
+from app_auth.models import UserProfile
+from app_offers.models import Offer, OfferDetail
+from app_orders.models import Order
+from app_reviews.models import Review
+
+Scenario = namedtuple('Scenario', ['label', 'role', 'params', 'full_scan_ok'], defaults=[False])
+
+# Default and filtered requests per list endpoint. `{business}` / `{customer}`
+# are replaced with the ids of the fixture users, `role` picks who is logged in.
+SCENARIOS = {
+    'offers-list': [
+        Scenario('default', None, {}),
+        Scenario('creator', None, {'creator_id': '{business}'}),
+        Scenario('min price', None, {'min_price': '50'}),
+        Scenario('max delivery time', None, {'max_delivery_time': '3'}),
+        Scenario('ordering by price', None, {'ordering': 'min_price'}),
+        Scenario('search', None, {'search': 'logo'}),
+        Scenario('cursor', None, {'pagination': 'cursor'}),
+    ],
+    'orders-list': [
+        Scenario('customer', 'customer', {}),
+        Scenario('business', 'business', {}),
+        Scenario('admin', 'admin', {}),
+    ],
+    'review-list': [
+        Scenario('default', 'customer', {}),
+        Scenario('business user', 'customer', {'business_user_id': '{business}'}),
+        Scenario('business user by rating', 'customer', {'business_user_id': '{business}', 'ordering': '-rating'}),
+        Scenario('by rating', 'customer', {'ordering': 'rating'}),
+        Scenario('business user with count', 'customer', {'business_user_id': '{business}', 'with_count': 'true'}),
+        Scenario('reviewer', 'customer', {'reviewer_id': '{customer}'}),
+    ],
+    'business-list': [Scenario('default', 'customer', {})],
+    'customer-list': [Scenario('default', 'customer', {})],
+    # Admin-only export of every profile, unpaginated by design.
+    'profile-list': [Scenario('default', 'admin', {}, full_scan_ok=True)],
+}
+
+# Swapped in for the run: cached pages, types and generations of rolled-back
+# fixtures must not outlive the transaction.
+DUMMY_CACHES = {
+    alias: {'BACKEND': 'django.core.cache.backends.dummy.DummyCache'} for alias in settings.CACHES
+}
+
+SQLITE_FULL_SCAN = re.compile(r'^SCAN [^\s(]+$')
+
+
+def iter_list_endpoints(patterns=None):
+    """Yield the URL names of all routes served by a DRF list view."""
+    if patterns is None:
+        patterns = get_resolver().url_patterns
+    for pattern in patterns:
+        if isinstance(pattern, URLResolver):
+            yield from iter_list_endpoints(pattern.url_patterns)
+        elif isinstance(pattern, URLPattern) and pattern.name:
+            view_class = getattr(pattern.callback, 'view_class', None)
+            if view_class and issubclass(view_class, ListModelMixin):
+                yield pattern.name
+
+
+class Command(BaseCommand):
+    """
+    EXPLAIN every SELECT that the list endpoints run, for their default and
+    filtered requests, and fail if any of them reads a whole table.
+
+    Each request is served by the real view against a few fixture rows, and
+    the captured SQL is explained as is. On SQLite a bare `SCAN <table>` is a
+    full scan (`SCAN ... USING INDEX` walks an index in order and is fine); on
+    PostgreSQL sequential scans are disabled first, so any remaining `Seq Scan`
+    means no usable index exists. Fixtures are created in a transaction that
+    is rolled back, and the views run against a dummy cache, so neither the
+    fixtures nor the pages rendered from them reach the shared cache.
+    """
+    help = "Fail if a list endpoint query uses a full table scan."
+
+    def handle(self, *args, **options):
+        if connection.vendor not in ('sqlite', 'postgresql'):
+            raise CommandError(f"EXPLAIN checks are not implemented for {connection.vendor}.")
+
+        self.run_id = uuid.uuid4().hex
+        missing = sorted(set(iter_list_endpoints()) - set(SCENARIOS))
+        failures = [f"{name}: no EXPLAIN scenario registered" for name in missing]
+
+        with override_settings(CACHES=DUMMY_CACHES), transaction.atomic():
+            if connection.vendor == 'postgresql':
+                with connection.cursor() as cursor:
+                    cursor.execute('SET LOCAL enable_seqscan = off')
+            users = self.create_fixtures()
+            for url_name, scenarios in SCENARIOS.items():
+                for scenario in scenarios:
+                    failures += self.check_scenario(url_name, scenario, users)
+            transaction.set_rollback(True)
+
+        for failure in failures:
+            self.stderr.write(failure)
+        if failures:
+            raise CommandError(f"{len(failures)} list endpoint queries without a usable index.")
+        self.stdout.write(self.style.SUCCESS("All list endpoint queries use an index."))
+
+    def create_fixtures(self):
+        business = User.objects.create_user(username='explain-business')
+        customer = User.objects.create_user(username='explain-customer')
+        admin = User.objects.create_superuser(username='explain-admin')
+        UserProfile.objects.create(user=business, type='business')
+        UserProfile.objects.create(user=customer, type='customer')
+
+        offer = Offer.objects.create(user=business, title='Logo design', description='Explain')
+        for offer_type, price in (('basic', 50), ('standard', 100), ('premium', 200)):
+            detail = OfferDetail.objects.create(
+                offer=offer, title=offer_type, offer_type=offer_type, price=price, delivery_time_in_days=3
+            )
+        Order.objects.create(customer_user=customer, offer_detail=detail)
+        Review.objects.create(business_user=business, reviewer=customer, rating=5)
+        return {'business': business, 'customer': customer, 'admin': admin}
+
+    def check_scenario(self, url_name, scenario, users):
+        ids = {role: user.pk for role, user in users.items()}
+        params = {key: value.format(**ids) for key, value in scenario.params.items()}
+        url = reverse(url_name)
+        request = APIRequestFactory().get(url, params, HTTP_HOST=self.get_host())
+        if scenario.role:
+            force_authenticate(request, users[scenario.role])
+
+        with CaptureQueriesContext(connection) as captured:
+            response = resolve(url).func(request)
+        label = f"{url_name} [{scenario.label}]"
+        if response.status_code != 200:
+            return [f"{label}: returned {response.status_code}"]
+
+        failures = []
+        selects = [query['sql'] for query in captured.captured_queries if query['sql'].startswith('SELECT')]
+        for sql in selects:
+            scans = self.full_scans(sql)
+            if scans and not scenario.full_scan_ok:
+                failures.append(f"{label}: full scan of {', '.join(scans)}\n    {sql}")
+        status = 'full scan (expected)' if scenario.full_scan_ok else ('FAIL' if failures else 'ok')
+        self.stdout.write(f"{label:<55} {len(selects)} queries  {status}")
+        return failures
+
+    def full_scans(self, sql):
+        """Tables (SQLite) or plan nodes (PostgreSQL) read without an index."""
+        with connection.cursor() as cursor:
+            if connection.vendor == 'sqlite':
+                # sqlite3 caches prepared statements, and a cached EXPLAIN is not
+                # re-planned after a schema change: make each run's text unique.
+                cursor.execute(f'EXPLAIN QUERY PLAN {sql} /* {self.run_id} */')
+                details = [row[3] for row in cursor.fetchall()]
+                return [detail.split()[1] for detail in details if SQLITE_FULL_SCAN.match(detail)]
+            cursor.execute(f'EXPLAIN {sql}')
+            return [row[0].strip() for row in cursor.fetchall() if 'Seq Scan' in row[0]]
+
+    def get_host(self):
+        host = next((host for host in settings.ALLOWED_HOSTS if host not in ('', '*')), 'localhost')
+        return host.lstrip('.')
@@ -0,0 +1,20 @@
+from django.core.management.base import BaseCommand
+
+from app_meta import platform
+
+
+class Command(BaseCommand):
+    """
+    Recount PlatformStats from the reviews, profiles and offers tables.
+
+    Corrects drift from writes that bypassed the model layer (raw SQL,
+    queryset.update(), fixtures, ...). Meant to be run from cron.
+    """
+    help = "Rebuild the platform stats behind the base-info endpoint."
+
+    def handle(self, *args, **options):
+        values = platform.rebuild()
+        self.stdout.write(self.style.SUCCESS(
+            "Rebuilt platform stats: "
+            + ", ".join(f"{field}={value}" for field, value in values.items())
+        ))
@@ -0,0 +1,55 @@
+# Generated by Django 5.2.5 on 2026-10-18 06:37
+
+from django.db import migrations, models
+from django.db.models import Count, Sum
+from django.utils import timezone
+
+
+def backfill_platform_stats(apps, schema_editor):
+    """Count the existing reviews, business profiles and offers into the stats row."""
+    Review = apps.get_model('app_reviews', 'Review')
+    UserProfile = apps.get_model('app_auth', 'UserProfile')
+    Offer = apps.get_model('app_offers', 'Offer')
+    PlatformStats = apps.get_model('app_meta', 'PlatformStats')
+
+    reviews = Review.objects.aggregate(count=Count('pk'), total=Sum('rating'))
+    now = timezone.now()
+    PlatformStats.objects.create(
+        pk=1,
+        review_count=reviews['count'],
+        rating_sum=reviews['total'] or 0,
+        business_profile_count=UserProfile.objects.filter(type='business').count(),
+        offer_count=Offer.objects.count(),
+        updated_at=now,
+        recomputed_at=now,
+    )
+
+
+class Migration(migrations.Migration):
+
+    initial = True
+
+    dependencies = [
+        ('app_auth', '0003_list_indexes'),
+        ('app_offers', '0007_offer_facet_count'),
+        ('app_reviews', '0006_review_cursor_indexes'),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name='PlatformStats',
+            fields=[
+                ('id', models.BigAutoField(auto_created=True, primary_key=True, serialize=False, verbose_name='ID')),
+                ('review_count', models.IntegerField(default=0)),
+                ('rating_sum', models.IntegerField(default=0)),
+                ('business_profile_count', models.IntegerField(default=0)),
+                ('offer_count', models.IntegerField(default=0)),
+                ('updated_at', models.DateTimeField()),
+                ('recomputed_at', models.DateTimeField()),
+            ],
+            options={
+                'verbose_name_plural': 'platform stats',
+            },
+        ),
+        migrations.RunPython(backfill_platform_stats, migrations.RunPython.noop),
+    ]
@@ -1 +1,31 @@
 from django.db import models
+
+
+class PlatformStats(models.Model):
+    """
+    Platform totals for the base-info endpoint, in a single row (pk=1).
+
+    Kept current by the signals in app_meta.signals with +/- deltas on every
+    review, business profile and offer create / delete (and rating and profile
+    type change); `app_meta.platform.rebuild()` recounts everything and is run
+    from cron to correct drift.
+    """
+    review_count = models.IntegerField(default=0)
+    rating_sum = models.IntegerField(default=0)
+    business_profile_count = models.IntegerField(default=0)
+    offer_count = models.IntegerField(default=0)
+    updated_at = models.DateTimeField()
+    recomputed_at = models.DateTimeField()
+
+    class Meta:
+        verbose_name_plural = "platform stats"
+
+    def __str__(self):
+        return f"{self.review_count} reviews, {self.business_profile_count} businesses, {self.offer_count} offers"
+
+    @property
+    def average_rating(self):
+        """Mean rating rounded to one decimal, None without reviews."""
+        if not self.review_count:
+            return None
+        return round(self.rating_sum / self.review_count, 1)
@@ -0,0 +1,82 @@
+"""
+Platform totals behind BaseInfoView.
+
+PlatformStats holds one row with the review count and rating sum, the number
+of business profiles and the number of offers. The signals in
+app_meta.signals apply +/- deltas inside the writing transaction, so the view
+is a single primary-key read; `rebuild()` recounts everything (see the
+rebuild_platform_stats command, meant to run from cron).
+"""
+from django.db.models import Count, F, Subquery, Sum, Value
+from django.db.models.functions import Coalesce
+from django.utils import timezone
+
+from app_auth.models import UserProfile
+from app_meta.models import PlatformStats
+from app_offers.models import Offer
+from app_reviews.models import Review
+
+STATS_PK = 1
+
+
+def apply_deltas(deltas):
+    """Add `{field: delta}` to the platform totals with one UPDATE."""
+    deltas = {field: delta for field, delta in deltas.items() if delta}
+    if not deltas:
+        return
+    # No row yet means nothing to correct: the first read runs rebuild().
+    PlatformStats.objects.filter(pk=STATS_PK).update(
+        updated_at=timezone.now(), **{field: F(field) + delta for field, delta in deltas.items()}
+    )
+
+
+def actual_counts():
+    """The true totals as subquery expressions, one aggregate per table."""
+    def scalar(queryset, aggregate):
+        # Group by a constant so the subquery yields exactly one row.
+        return Coalesce(Subquery(
+            queryset.order_by().annotate(group=Value(1)).values('group').annotate(value=aggregate).values('value')
+        ), 0)
+
+    return {
+        'review_count': scalar(Review.objects.all(), Count('pk')),
+        'rating_sum': scalar(Review.objects.all(), Sum('rating')),
+        'business_profile_count': scalar(UserProfile.objects.filter(type='business'), Count('pk')),
+        'offer_count': scalar(Offer.objects.all(), Count('pk')),
+    }
+
+
+def rebuild():
+    """
+    Recount everything into the stats row without locking it.
+
+    The stored and true totals are read in one SELECT and only the difference
+    is added to the row, so deltas committed during the scans are kept.
+    """
+    actual = actual_counts()
+    now = timezone.now()
+    # A missing row starts at zero and is corrected like any other.
+    PlatformStats.objects.bulk_create(
+        [PlatformStats(pk=STATS_PK, updated_at=now, recomputed_at=now)], ignore_conflicts=True
+    )
+    row = (
+        PlatformStats.objects.filter(pk=STATS_PK)
+        .annotate(**{f'actual_{field}': expression for field, expression in actual.items()})
+        .values(*actual, *(f'actual_{field}' for field in actual))
+        .get()
+    )
+    values = {field: row[f'actual_{field}'] for field in actual}
+    PlatformStats.objects.filter(pk=STATS_PK).update(
+        updated_at=now, recomputed_at=now,
+        **{field: F(field) + (values[field] - row[field]) for field in actual},
+    )
+    return values
+
+
+def get_stats():
+    """The stats row, recounted first if it does not exist yet."""
+    stats = PlatformStats.objects.filter(pk=STATS_PK).first()
+    if stats is None:
+        rebuild()
+        stats = PlatformStats.objects.get(pk=STATS_PK)
+    return stats
@@ -0,0 +1,62 @@
+from django.db.models.signals import post_save, post_delete
+from django.dispatch import receiver
+
+from app_auth.models import UserProfile
+from app_meta import platform
+from app_offers.models import Offer
+from app_offers.signals import offers_bulk_created
+from app_reviews.models import Review
+
+
+@receiver(post_save, sender=Review)
+def count_review_on_save(sender, instance, created, raw=False, **kwargs):
+    """Count a new review; a changed rating moves the rating sum."""
+    if raw:
+        return
+    if created:
+        platform.apply_deltas({'review_count': 1, 'rating_sum': instance.rating})
+        return
+    _, previous = getattr(instance, '_saved_rating', (None, None))
+    if previous is not None:
+        platform.apply_deltas({'rating_sum': instance.rating - previous})
+
+
+@receiver(post_delete, sender=Review)
+def count_review_on_delete(sender, instance, **kwargs):
+    """Uncount a deleted review, cascaded deletes included."""
+    _, rating = getattr(instance, '_saved_rating', None) or (None, instance.rating)
+    platform.apply_deltas({'review_count': -1, 'rating_sum': -rating})
+
+
+@receiver(post_save, sender=UserProfile)
+def count_business_profile_on_save(sender, instance, created, raw=False, **kwargs):
+    """Count new business profiles and profiles switching to or from business."""
+    if raw:
+        return
+    previous = None if created else getattr(instance, '_saved_type', instance.type)
+    delta = (instance.type == 'business') - (previous == 'business')
+    platform.apply_deltas({'business_profile_count': delta})
+
+
+@receiver(post_delete, sender=UserProfile)
+def count_business_profile_on_delete(sender, instance, **kwargs):
+    if instance.type == 'business':
+        platform.apply_deltas({'business_profile_count': -1})
+
+
+@receiver(post_save, sender=Offer)
+def count_offer_on_save(sender, instance, created, raw=False, **kwargs):
+    if raw or not created:
+        return
+    platform.apply_deltas({'offer_count': 1})
+
+
+@receiver(post_delete, sender=Offer)
+def count_offer_on_delete(sender, instance, **kwargs):
+    platform.apply_deltas({'offer_count': -1})
+
+
+@receiver(offers_bulk_created)
+def count_offers_on_bulk_create(sender, offers, **kwargs):
+    """Count offers inserted with bulk_create (no post_save)."""
+    platform.apply_deltas({'offer_count': len(offers)})
@@ -0,0 +1,106 @@
+from io import StringIO
+
+from django.contrib.auth.models import User
+from django.core.management import call_command
+from django.urls import reverse
+from rest_framework import status
+from rest_framework.test import APITestCase
+
+from app_auth.models import UserProfile
+from app_meta.models import PlatformStats
+from app_offers.models import Offer
+from app_reviews.models import Review
+from core.query_budget import QueryBudgetTestMixin
+
+
+class BaseInfoTests(QueryBudgetTestMixin, APITestCase):
+
+    def setUp(self):
+        """ Users, Profiles, Offer, Review """
+        self.business_user = User.objects.create_user(username="biz", password="pass123")
+        self.customer_user = User.objects.create_user(username="cust", password="pass123")
+        UserProfile.objects.create(user=self.business_user, type="business")
+        UserProfile.objects.create(user=self.customer_user, type="customer")
+
+        self.offer = Offer.objects.create(user=self.business_user, title="Logo Design", description="Desc")
+        self.review = Review.objects.create(
+            business_user=self.business_user, reviewer=self.customer_user, rating=4, description="Good"
+        )
+        self.url = reverse("base-info")
+
+
+    """ TESTS BASE INFO """
+    """ --------------- """
+    # GET base info from the stats row with one query (valid)
+    def test_get_base_info(self):
+        with self.assertQueryBudget(1):
+            response = self.client.get(self.url)
+
+        self.assertEqual(response.status_code, status.HTTP_200_OK)
+        self.assertEqual(response.data["review_count"], 1)
+        self.assertEqual(response.data["average_rating"], "4.0")
+        self.assertEqual(response.data["business_profile_count"], 1)
+        self.assertEqual(response.data["offer_count"], 1)
+        self.assertIn("public", response["Cache-Control"])
+        self.assertIn("max-age=", response["Cache-Control"])
+
+
+    # stats follow review, profile and offer writes (valid)
+    def test_stats_follow_writes(self):
+        self.review.rating = 2
+        self.review.save()
+        Offer.objects.create(user=self.business_user, title="Second", description="Desc")
+        self.business_user.delete()
+
+        stats = PlatformStats.objects.get()
+        self.assertEqual(
+            (stats.review_count, stats.rating_sum, stats.business_profile_count, stats.offer_count),
+            (0, 0, 0, 0),
+        )
+
+
+    # unchanged stats answer 304, a new review changes the ETag (valid)
+    def test_base_info_not_modified(self):
+        etag = self.client.get(self.url)["ETag"]
+
+        response = self.client.get(self.url, HTTP_IF_NONE_MATCH=etag)
+        self.assertEqual(response.status_code, status.HTTP_304_NOT_MODIFIED)
+        self.assertIn("public", response["Cache-Control"])
+
+        self.review.rating = 5
+        self.review.save()
+        response = self.client.get(self.url, HTTP_IF_NONE_MATCH=etag)
+        self.assertEqual(response.status_code, status.HTTP_200_OK)
+        self.assertEqual(response.data["average_rating"], "5.0")
+
+
+    # business profile count follows profile type changes (valid)
+    def test_business_count_follows_type_change(self):
+        profile = UserProfile.objects.get(user=self.customer_user)
+        profile.type = "business"
+        profile.save()
+        self.assertEqual(PlatformStats.objects.get().business_profile_count, 2)
+
+        profile.type = "customer"
+        profile.save()
+        self.assertEqual(PlatformStats.objects.get().business_profile_count, 1)
+
+
+    # rebuild command reconciles writes that bypassed the signals (valid)
+    def test_rebuild_platform_stats_command(self):
+        Review.objects.filter(pk=self.review.pk).update(rating=1)
+        UserProfile.objects.filter(user=self.customer_user).update(type="business")
+        PlatformStats.objects.all().delete()
+
+        call_command("rebuild_platform_stats", stdout=StringIO())
+
+        stats = PlatformStats.objects.get()
+        self.assertEqual(
+            (stats.review_count, stats.rating_sum, stats.business_profile_count, stats.offer_count),
+            (1, 1, 2, 1),
+        )
+
+        # Stale stored totals are corrected in place.
+        PlatformStats.objects.update(offer_count=7)
+        call_command("rebuild_platform_stats", stdout=StringIO())
+        self.assertEqual(PlatformStats.objects.get().offer_count, 1)
@@ -0,0 +1,42 @@
+from io import StringIO
+
+from django.core.management import CommandError, call_command
+from django.db import connection
+from django.test import TestCase
+from django.urls import reverse
+
+from app_meta.management.commands.explain_list_endpoints import SCENARIOS, iter_list_endpoints
+from app_offers import cache as offer_cache
+
+
+class ExplainListEndpointsTests(TestCase):
+
+    """ TESTS EXPLAIN """
+    """ ------------- """
+    # every list endpoint has a scenario and none scans a full table (valid)
+    def test_list_endpoints_use_indexes(self):
+        self.assertLessEqual(set(iter_list_endpoints()), set(SCENARIOS))
+        out = StringIO()
+        call_command("explain_list_endpoints", stdout=out)
+        self.assertIn("All list endpoint queries use an index.", out.getvalue())
+
+
+    # the fixtures never reach the shared cache (valid)
+    def test_list_endpoints_leave_cache_alone(self):
+        url = reverse("offers-list")
+        etag = self.client.get(url)["ETag"]
+        generation = offer_cache.get_generation()
+
+        call_command("explain_list_endpoints", stdout=StringIO())
+
+        self.assertEqual(offer_cache.get_generation(), generation)
+        self.assertEqual(self.client.get(url, HTTP_IF_NONE_MATCH=etag).status_code, 304)
+        self.assertEqual(self.client.get(url).data["count"], 0)
+
+
+    # a missing index is reported (invalid)
+    def test_list_endpoints_missing_index(self):
+        with connection.cursor() as cursor:
+            cursor.execute('DROP INDEX "userprofile_type_idx"')
+        with self.assertRaises(CommandError):
+            call_command("explain_list_endpoints", stdout=StringIO(), stderr=StringIO())
@@ -1,5 +1,8 @@
 import django_filters
+from rest_framework import filters
+
 from app_offers.models import Offer
+from app_offers.search import search_offers
 
 class OfferFilter(django_filters.FilterSet):
     creator_id = django_filters.NumberFilter(field_name="user_id")
@@ -8,4 +11,14 @@ class OfferFilter(django_filters.FilterSet):
 
     class Meta:
         model = Offer
-        fields = []
\ No newline at end of file
+        fields = []
+
+
+class OfferSearchFilter(filters.SearchFilter):
+    """
+    `?search=` backed by the offer full-text index instead of `icontains` scans.
+    Results are ranked best match first unless `?ordering=` is given.
+    """
+
+    def filter_queryset(self, request, queryset, view):
+        return search_offers(queryset, self.get_search_terms(request))
@@ -1,6 +1,26 @@
 from rest_framework.pagination import PageNumberPagination
 
+from core.pagination import KeysetPagination
+
 class LargeResultsSetPagination(PageNumberPagination):
     page_size = 6
     page_size_query_param = 'page_size'
-    max_page_size = 100 
\ No newline at end of file
+    max_page_size = 100
+
+
+class OfferCursorPagination(KeysetPagination):
+    """
+    Opt-in cursor pagination for the public offer list (`?pagination=cursor`).
+    Keyed on `(updated_at, id)` or `(min_price, id)`, matching the view's ordering_fields.
+    """
+    page_size = LargeResultsSetPagination.page_size
+    max_page_size = LargeResultsSetPagination.max_page_size
+    ordering_fields = ['updated_at', 'min_price']
+    default_ordering = '-updated_at'
+    opt_in_query_param = 'pagination'
+
+    @classmethod
+    def is_requested(cls, request):
+        """Cursor mode is used when asked for explicitly or when following a cursor link."""
+        params = request.query_params
+        return params.get(cls.opt_in_query_param) == 'cursor' or cls.cursor_query_param in params
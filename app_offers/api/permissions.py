@@ -1,5 +1,7 @@
 from rest_framework import permissions
 
+from app_auth.cache import profile_type_of
+
 class IsAssignedBusinessOrAdmin(permissions.BasePermission):
     """
     Object-level permission to only allow owners of an offer object to edit it.
@@ -7,10 +9,10 @@ class IsAssignedBusinessOrAdmin(permissions.BasePermission):
     """
 
     def has_object_permission(self, request, view, obj):
-        is_owner = obj.user == request.user
+        is_owner = obj.user_id == request.user.id
         is_admin = request.user.is_staff or request.user.is_superuser
         return is_owner or is_admin
     
 class IsBusinessUser(permissions.BasePermission):
     def has_permission(self, request, view):
-        return request.user.profile.type == "business"
\ No newline at end of file
+        return profile_type_of(request.user) == "business"
\ No newline at end of file
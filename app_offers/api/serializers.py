@@ -1,13 +1,55 @@
 from rest_framework import serializers
 from app_offers.models import Offer, OfferDetail
+from app_offers.signals import offer_details_bulk_created, offers_bulk_created
 from django.contrib.auth.models import User
+from django.db import transaction
+from core.fields import TemplatedHyperlinkedIdentityField
+from core.images import variant_urls
+
+MAX_BULK_OFFERS = 500
+DETAIL_UPDATE_FIELDS = ['title', 'delivery_time_in_days', 'price', 'features', 'revisions']
+
+
+def build_offer(validated_data, user):
+    """
+    Build an unsaved Offer and its unsaved OfferDetails from validated data.
+    min_price / min_delivery_time are computed here, so no refresh query is needed.
+    """
+    details_list = validated_data.pop('details')
+    offer = Offer(user=user, **validated_data)
+    details = [OfferDetail(offer=offer, **single_detail) for single_detail in details_list]
+    offer.min_price = min(detail.price for detail in details)
+    offer.min_delivery_time = min(detail.delivery_time_in_days for detail in details)
+    return offer, details
+
+
+class OfferBulkCreateSerializer(serializers.ListSerializer):
+    """
+    Creates many offers with two bulk INSERTs (offers, then all their details)
+    inside one transaction.
+    """
+
+    @transaction.atomic
+    def create(self, validated_data):
+        built = [build_offer(attrs, attrs.pop('user')) for attrs in validated_data]
+        offers = Offer.objects.bulk_create([offer for offer, _ in built], batch_size=MAX_BULK_OFFERS)
+        details = OfferDetail.objects.bulk_create(
+            [detail for _, details in built for detail in details],
+            batch_size=MAX_BULK_OFFERS,
+        )
+        offers_bulk_created.send(sender=Offer, offers=offers)
+        offer_details_bulk_created.send(sender=OfferDetail, details=details)
+        return offers
 
 
 class OfferDetailNestedReadSerializer(serializers.HyperlinkedModelSerializer):
     """
     Serializer for nested representation of OfferDetail in read-only mode.
     Provides only the 'id' and hyperlink to the OfferDetail.
+    The hyperlink is formatted from a URL template instead of reversed per detail.
     """
+    serializer_url_field = TemplatedHyperlinkedIdentityField
+
     class Meta:
         model = OfferDetail
         fields = ['id','url']
@@ -51,13 +93,14 @@ class UserDetailsNestedSerializer(serializers.ModelSerializer):
 
 class OfferListSerializer(serializers.ModelSerializer):
     """
-    Serializer for listing offers with aggregated min_price and min_delivery_time.
-    Includes nested details and user information.
+    Serializer for listing offers with their stored min_price and min_delivery_time.
+    Includes nested details, user information and resized logo URLs.
     """
     min_price = serializers.DecimalField(max_digits=10, decimal_places=2, read_only=True)
     min_delivery_time = serializers.IntegerField(read_only=True)
     details = OfferDetailNestedReadSerializer(many=True)
     user_details = UserDetailsNestedSerializer(source="user", read_only=True)
+    image_variants = serializers.SerializerMethodField(help_text="Resized logo URLs by width and format.")
 
     class Meta:
         model = Offer
@@ -66,6 +109,7 @@ class OfferListSerializer(serializers.ModelSerializer):
             "user",
             "title",
             "image",
+            "image_variants",
             "description",
             "created_at",
             "updated_at",
@@ -75,6 +119,12 @@ class OfferListSerializer(serializers.ModelSerializer):
             'user_details'
         ]
 
+    def get_image_variants(self, obj):
+        """Absolute URLs of the generated logo derivatives (empty until they are ready)."""
+        request = self.context.get('request')
+        build_url = request.build_absolute_uri if request else None
+        return variant_urls(obj.image.storage, obj.image_variants, build_url)
+
 class OfferCreateUpdateSerializer(serializers.ModelSerializer):
     """
     Serializer for creating and updating offers.
@@ -109,6 +159,7 @@ class OfferCreateUpdateSerializer(serializers.ModelSerializer):
             "min_price",
             "min_delivery_time"
         ]
+        list_serializer_class = OfferBulkCreateSerializer
 
     def validate_details(self, value):
         """
@@ -137,45 +188,54 @@ class OfferCreateUpdateSerializer(serializers.ModelSerializer):
         return value
 
 
+    @transaction.atomic
     def create(self, validated_data):
         """
         Create a new Offer instance along with its nested OfferDetails.
         The current authenticated user is automatically set as the offer owner.
+        Details are written with a single bulk INSERT.
         """
-        details_list = validated_data.pop('details')
         current_user = self.context['request'].user
+        new_offer, details = build_offer(validated_data, current_user)
 
-        # Create offer
-        new_offer = Offer.objects.create(user=current_user, **validated_data)
-
-        # Create details
-        for single_detail in details_list:
-            OfferDetail.objects.create(offer=new_offer, **single_detail)
+        new_offer.save()
+        OfferDetail.objects.bulk_create(details)
+        offer_details_bulk_created.send(sender=OfferDetail, details=details)
 
         return new_offer
 
 
+    @transaction.atomic
     def update(self, instance, validated_data):
         """
         Update an existing Offer instance and its nested OfferDetails.
-        - Only updates provided fields in the details and increments revisions.
+        - Only updates provided fields in the details.
         - Updates offer fields: title, image, description if present.
+        All details are read with one query and written with one bulk UPDATE;
+        the whole update is atomic.
         """
         details_list = validated_data.pop('details', [])
 
         # Update Details
-        for single_detail in details_list:
-            offer_type_to_update = single_detail.get('offer_type')
-            
-            if offer_type_to_update:
-                detail = instance.details.get(offer_type=offer_type_to_update)
-
-                for field in ['title', 'delivery_time_in_days', 'price', 'features', 'revisions']:
+        if details_list:
+            details_by_type = {detail.offer_type: detail for detail in instance.details.all()}
+            changed, changed_fields = [], set()
+            for single_detail in details_list:
+                detail = details_by_type.get(single_detail['offer_type'])
+                if detail is None:
+                    raise serializers.ValidationError(
+                        {"offer_type": f"No detail with offer_type '{single_detail['offer_type']}' on this offer."}
+                    )
+                for field in DETAIL_UPDATE_FIELDS:
                     if field in single_detail:
                         setattr(detail, field, single_detail[field])
+                        changed_fields.add(field)
+                changed.append(detail)
 
-                # detail.revisions += 1
-                detail.save()
+            if changed_fields:
+                OfferDetail.objects.bulk_update(changed, sorted(changed_fields))
+            instance.min_price = min(detail.price for detail in details_by_type.values())
+            instance.min_delivery_time = min(detail.delivery_time_in_days for detail in details_by_type.values())
 
         # Update main Offer fields
         for field in ['title', 'image', 'description']:
@@ -185,4 +245,3 @@ class OfferCreateUpdateSerializer(serializers.ModelSerializer):
         instance.save()
 
         return instance
-
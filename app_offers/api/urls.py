@@ -1,8 +1,11 @@
 from django.urls import path
-from .views import OffersListCreateView, OfferDetailView
+from .views import OffersListCreateView, OfferDetailView, OfferCacheStatsView, OfferBulkCreateView, OfferFacetsView
 
 
 urlpatterns = [
     path('', OffersListCreateView.as_view(), name="offers-list"),
     path('<int:pk>/', OfferDetailView.as_view(), name="offer-detail"),
+    path('bulk/', OfferBulkCreateView.as_view(), name="offers-bulk-create"),
+    path('facets/', OfferFacetsView.as_view(), name="offers-facets"),
+    path('cache-stats/', OfferCacheStatsView.as_view(), name="offers-cache-stats"),
 ]
\ No newline at end of file
@@ -1,27 +1,38 @@
-from rest_framework import generics, filters
-from rest_framework.permissions import IsAuthenticated, AllowAny, SAFE_METHODS
+from rest_framework import generics, filters, status
+from rest_framework.views import APIView
+from rest_framework.response import Response
+from rest_framework.permissions import IsAuthenticated, AllowAny, SAFE_METHODS, IsAdminUser
+from rest_framework.settings import api_settings
 from django_filters.rest_framework import DjangoFilterBackend
 
-from django.db.models import Min
+from django.db.models import Count, Max, Prefetch
 
 from drf_spectacular.utils import extend_schema, OpenApiResponse
 
-from .paginations import LargeResultsSetPagination
-from .filters import OfferFilter
+from .paginations import LargeResultsSetPagination, OfferCursorPagination
+from .filters import OfferFilter, OfferSearchFilter
+from app_offers import cache as offer_cache
+from app_offers import facets
 from app_offers.models import Offer, OfferDetail
-from .serializers import OfferCreateUpdateSerializer, OfferDetailNestedDetailSerializer, OfferListSerializer
+from core.conditional import ConditionalGetMixin
+from core.uploads import ImageUploadMixin
+from .serializers import (
+    MAX_BULK_OFFERS,
+    OfferCreateUpdateSerializer,
+    OfferDetailNestedDetailSerializer,
+    OfferListSerializer,
+)
 from .permissions import IsAssignedBusinessOrAdmin,IsBusinessUser
 
 
-def add_min_fields_to_offer():
+def get_offer_read_queryset():
     """
-    Annotates Offer queryset with minimum price and minimum delivery time
-    from related OfferDetails.
+    Offers with everything OfferListSerializer touches loaded up front:
+    the user joined, the detail ids prefetched in one query for the whole page.
     """
-    return Offer.objects.all().annotate(
-            min_price=Min("details__price"),
-            min_delivery_time=Min("details__delivery_time_in_days"),
-        )
+    return Offer.objects.select_related('user').prefetch_related(
+        Prefetch('details', queryset=OfferDetail.objects.only('id', 'offer_id'))
+    )
 
 
 @extend_schema(
@@ -31,20 +42,50 @@ def add_min_fields_to_offer():
         201: OpenApiResponse(response=OfferCreateUpdateSerializer, description="Offer successfully created.")
     }
 )
-class OffersListCreateView(generics.ListCreateAPIView):
+class OffersListCreateView(ImageUploadMixin, ConditionalGetMixin, generics.ListCreateAPIView):
     """
     GET: List all offers with optional filters, search, and ordering.
+         Page-number pagination by default, cursor pagination with `?pagination=cursor`.
+         The ETag follows the offer cache generation, so revalidation needs no query.
     POST: Create a new offer (Business users only).
     """
-    filter_backends = [DjangoFilterBackend, filters.SearchFilter, filters.OrderingFilter]
+    filter_backends = [DjangoFilterBackend, OfferSearchFilter, filters.OrderingFilter]
     ordering_fields = ['updated_at', 'min_price']
-    search_fields = ['title', 'description']
     filterset_class = OfferFilter
     pagination_class = LargeResultsSetPagination
+    query_budget = 5
+
+    @property
+    def paginator(self):
+        """Use keyset pagination when the client opts in, page numbers otherwise."""
+        if not hasattr(self, '_paginator'):
+            if OfferCursorPagination.is_requested(self.request):
+                self._paginator = OfferCursorPagination()
+            else:
+                self._paginator = self.pagination_class()
+        return self._paginator
 
     def get_queryset(self):
-        """Return queryset with annotated min_price and min_delivery_time."""
-        return add_min_fields_to_offer()
+        """
+        Return offers with user and detail ids preloaded for the list serializer,
+        newest first unless search ranking or `?ordering=` replaces the order.
+        """
+        if self.request.method in SAFE_METHODS:
+            return get_offer_read_queryset().order_by('-updated_at', '-id')
+        return Offer.objects.all()
+
+    def get_validators(self):
+        """Every offer write bumps the generation, which covers max(updated_at) and deletes."""
+        return ('offers', offer_cache.get_generation()), None
+
+    def list(self, request, *args, **kwargs):
+        """Serve the page from the offer list cache, filling it on a miss."""
+        key, data = offer_cache.get_list(request)
+        if data is not None:
+            return Response(data)
+        response = super().list(request, *args, **kwargs)
+        offer_cache.set_list(key, response.data)
+        return response
     
     def get_serializer_class(self):
         """Select serializer based on HTTP method."""
@@ -59,6 +100,64 @@ class OffersListCreateView(generics.ListCreateAPIView):
         return [IsAuthenticated(), IsBusinessUser()]
 
 
+@extend_schema(
+    description=(
+        "Histograms of min price and min delivery time plus counts per offer_type. "
+        "Accepts the same filter and search parameters as the offer list."
+    ),
+    responses={200: OpenApiResponse(description="Offer count, bucketed histograms (`from` inclusive, `to` exclusive) and offer_type counts.")}
+)
+class OfferFacetsView(generics.GenericAPIView):
+    """
+    GET: Facets for the offer search UI.
+         Unfiltered requests read the precomputed summary table (O(buckets));
+         filtered requests aggregate over the filtered offers.
+    """
+    queryset = Offer.objects.all()
+    filter_backends = [DjangoFilterBackend, OfferSearchFilter]
+    filterset_class = OfferFilter
+    permission_classes = [AllowAny]
+    pagination_class = None
+    query_budget = 3
+
+    def is_filtered(self):
+        params = [*OfferFilter.base_filters, api_settings.SEARCH_PARAM]
+        return any(self.request.query_params.get(param) for param in params)
+
+    def get(self, request):
+        if self.is_filtered():
+            counts = facets.filtered_counts(self.filter_queryset(self.get_queryset()))
+        else:
+            counts = facets.stored_counts()
+        return Response(facets.serialize(counts))
+
+
+@extend_schema(
+    description=f"Create up to {MAX_BULK_OFFERS} offers in one request (Business users only).",
+    request=OfferCreateUpdateSerializer(many=True),
+    responses={
+        201: OpenApiResponse(description="Offers created. Returns the number of offers and their ids."),
+        400: OpenApiResponse(description="Validation errors, listed per offer.")
+    }
+)
+class OfferBulkCreateView(generics.CreateAPIView):
+    """
+    POST: Create many offers with their details at bulk-insert speed.
+    All offers are created in one transaction, or none on validation errors.
+    """
+    serializer_class = OfferCreateUpdateSerializer
+    permission_classes = [IsAuthenticated, IsBusinessUser]
+
+    def create(self, request, *args, **kwargs):
+        serializer = self.get_serializer(data=request.data, many=True, max_length=MAX_BULK_OFFERS)
+        serializer.is_valid(raise_exception=True)
+        offers = serializer.save(user=request.user)
+        return Response(
+            {"count": len(offers), "ids": [offer.pk for offer in offers]},
+            status=status.HTTP_201_CREATED
+        )
+
+
 @extend_schema(
     description="Retrieve, update, or delete a specific offer.",
     responses={
@@ -67,17 +166,41 @@ class OffersListCreateView(generics.ListCreateAPIView):
         403: OpenApiResponse(description="Permission denied.")
     }
 )
-class OfferDetailView(generics.RetrieveUpdateDestroyAPIView):
+class OfferDetailView(ImageUploadMixin, ConditionalGetMixin, generics.RetrieveUpdateDestroyAPIView):
     """
-    GET: Retrieve offer details.
+    GET: Retrieve offer details (ETag / Last-Modified, 304 when unchanged).
     PUT/PATCH: Update offer (assigned business or admin only).
     DELETE: Delete offer (assigned business or admin only).
     """
 
+    query_budget = 5
+
     def get_queryset(self):
-        """Return queryset with annotated min_price and min_delivery_time."""
-        return add_min_fields_to_offer()
-    
+        """Return offers, preloaded for the read serializer on GET."""
+        if self.request.method in SAFE_METHODS:
+            return get_offer_read_queryset()
+        return Offer.objects.all()
+
+    def get_validators(self):
+        """
+        One row with everything the body depends on besides `updated_at`:
+        the stored min fields and logo variants (written with update()),
+        the user names and the set of detail ids.
+        """
+        row = (
+            Offer.objects.filter(pk=self.kwargs['pk'])
+            .annotate(detail_count=Count('details'), last_detail_id=Max('details__id'))
+            .values_list(
+                'updated_at', 'min_price', 'min_delivery_time', 'image_variants',
+                'user__username', 'user__first_name', 'user__last_name',
+                'detail_count', 'last_detail_id',
+            )
+            .first()
+        )
+        if row is None:
+            return None
+        return row, row[0]
+
     def get_serializer_class(self):
         """Select serializer based on HTTP method."""
         if self.request.method in ["PUT", "PATCH"]:
@@ -98,10 +221,30 @@ class OfferDetailView(generics.RetrieveUpdateDestroyAPIView):
         403: OpenApiResponse(description="Permission denied.")
     }
 )
-class OfferDetailsDetailView(generics.RetrieveAPIView):
+class OfferDetailsDetailView(ConditionalGetMixin, generics.RetrieveAPIView):
     """
     GET: Retrieve detailed information for a single OfferDetail.
+    OfferDetail has no timestamp, so the ETag hashes its serialized fields.
     """
     queryset = OfferDetail.objects.all()
     serializer_class = OfferDetailNestedDetailSerializer
-    permission_classes = [IsAuthenticated]
\ No newline at end of file
+    permission_classes = [IsAuthenticated]
+
+    def get_validators(self):
+        fields = self.serializer_class.Meta.fields
+        row = OfferDetail.objects.filter(pk=self.kwargs['pk']).values_list(*fields).first()
+        if row is None:
+            return None
+        return row, None
+
+
+@extend_schema(
+    description="Hit/miss counters of the offer list response cache. Admin-only endpoint.",
+    responses={200: OpenApiResponse(description="Cache hits, misses and current offers generation.")}
+)
+class OfferCacheStatsView(APIView):
+    """Admin-only: expose offer list cache counters for scraping."""
+    permission_classes = [IsAdminUser]
+
+    def get(self, request):
+        return Response(offer_cache.stats())
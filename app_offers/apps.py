@@ -1,6 +1,21 @@
 from django.apps import AppConfig
+from django.db.models.signals import post_migrate
+
+
+def ensure_offer_search_index(sender, using="default", **kwargs):
+    """
+    Recreate FTS triggers that a table rebuild during migrate dropped
+    (SQLite remakes the offer table for some ALTERs); a no-op when they are all there.
+    """
+    from .search import ensure_search_index, search_triggers_missing
+    if search_triggers_missing(using):
+        ensure_search_index(using)
 
 
 class AppOffersConfig(AppConfig):
     default_auto_field = 'django.db.models.BigAutoField'
     name = 'app_offers'
+
+    def ready(self):
+        from . import signals  # noqa: F401
+        post_migrate.connect(ensure_offer_search_index, sender=self)
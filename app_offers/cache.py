@@ -0,0 +1,93 @@
+"""
+Response cache for the public offer list.
+
+Every cached page is stored under the current "offers generation". Any
+Offer/OfferDetail write replaces the generation with a fresh token, which
+orphans all cached pages at once (O(1) invalidation); they expire by TTL.
+The generation lives in the configured Django cache, so invalidation is
+shared by all workers as long as that cache is shared (file, memcached,
+redis) -- the local-memory default is meant for tests and runserver.
+"""
+import hashlib
+import uuid
+
+from django.conf import settings
+from django.core.cache import caches
+from django.db import transaction
+
+GENERATION_KEY = 'offers:generation'
+HITS_KEY = 'offers:list:hits'
+MISSES_KEY = 'offers:list:misses'
+
+
+def get_cache():
+    return caches[settings.OFFERS_CACHE_ALIAS]
+
+
+def get_generation():
+    """Return the current offers generation, creating one if missing or evicted."""
+    cache = get_cache()
+    generation = cache.get(GENERATION_KEY)
+    if generation is None:
+        cache.add(GENERATION_KEY, uuid.uuid4().hex, timeout=None)
+        generation = cache.get(GENERATION_KEY)
+    return generation
+
+
+def _new_generation():
+    # A fresh token instead of incr(): no read-modify-write race between workers.
+    get_cache().set(GENERATION_KEY, uuid.uuid4().hex, timeout=None)
+
+
+def bump_generation():
+    """
+    Invalidate every cached offer list page.
+
+    Bumped immediately and again once the surrounding transaction commits, so
+    a page rendered from pre-commit data cannot outlive the write.
+    """
+    _new_generation()
+    transaction.on_commit(_new_generation)
+
+
+def list_cache_key(request, generation):
+    """Cache key from host + normalized query string (sorted, empty values dropped)."""
+    params = sorted(
+        (key, sorted(value for value in values if value != ''))
+        for key, values in request.query_params.lists()
+    )
+    normalized = '&'.join(f'{key}={",".join(values)}' for key, values in params if values)
+    digest = hashlib.sha1(f'{request.scheme}://{request.get_host()}?{normalized}'.encode()).hexdigest()
+    return f'offers:list:{generation}:{digest}'
+
+
+def get_list(request):
+    """Return (cache key, cached data or None) and count the hit/miss."""
+    key = list_cache_key(request, get_generation())
+    data = get_cache().get(key)
+    _count(HITS_KEY if data is not None else MISSES_KEY)
+    return key, data
+
+
+def set_list(key, data):
+    get_cache().set(key, data, timeout=settings.OFFERS_CACHE_TIMEOUT)
+
+
+def _count(key):
+    cache = get_cache()
+    try:
+        cache.incr(key)
+    except ValueError:
+        if not cache.add(key, 1, timeout=None):
+            cache.incr(key)
+
+
+def stats():
+    """Hit/miss counters of the offer list cache."""
+    cache = get_cache()
+    values = cache.get_many([HITS_KEY, MISSES_KEY])
+    return {
+        'hits': values.get(HITS_KEY, 0),
+        'misses': values.get(MISSES_KEY, 0),
+        'generation': get_generation(),
+    }
@@ -0,0 +1,150 @@
+"""
+Price / delivery-time histograms and offer_type counts for the offer search UI.
+
+Filtered facets are computed with two aggregate queries over the filtered
+offers. The unfiltered facets are read from OfferFacetCount, which the
+signals in app_offers.signals keep current with +/- deltas, so that request
+costs one query over a handful of rows however many offers exist.
+
+Buckets are half-open `[from, to)` ranges keyed by their lower edge; values
+below the first edge fall into the first bucket, the last bucket is open.
+Offers without details (no min fields) are counted in `count` only.
+"""
+from bisect import bisect_right
+from collections import Counter
+
+from django.db import transaction
+from django.db.models import Case, Count, F, Q, Value, When
+
+from app_offers.models import Offer, OfferDetail, OfferFacetCount
+
+TOTAL = ('count', '')
+PRICE_FACET = 'min_price'
+DELIVERY_FACET = 'min_delivery_time'
+TYPE_FACET = 'offer_type'
+
+BUCKET_EDGES = {
+    PRICE_FACET: (0, 50, 100, 250, 500, 1000),
+    DELIVERY_FACET: (1, 3, 7, 14, 30),
+}
+OFFER_TYPES = ('basic', 'standard', 'premium')
+
+
+def bucket_key(facet, value):
+    """Lower edge (as stored) of the bucket holding `value`."""
+    edges = BUCKET_EDGES[facet]
+    return str(edges[max(bisect_right(edges, value) - 1, 0)])
+
+
+def offer_keys(min_fields):
+    """Counter keys an offer with the given `(min_price, min_delivery_time)` contributes to."""
+    keys = [TOTAL]
+    for facet, value in zip((PRICE_FACET, DELIVERY_FACET), min_fields):
+        if value is not None:
+            keys.append((facet, bucket_key(facet, value)))
+    return keys
+
+
+def offer_deltas(old_min_fields, new_min_fields):
+    """Deltas for an offer whose min fields went from old to new (None = no offer)."""
+    deltas = Counter(offer_keys(new_min_fields) if new_min_fields is not None else [])
+    deltas.subtract(offer_keys(old_min_fields) if old_min_fields is not None else [])
+    return deltas
+
+
+def type_deltas(offer_types, sign=1):
+    """Deltas for details of the given offer_types being added (sign=1) or removed (sign=-1)."""
+    return Counter({(TYPE_FACET, offer_type): sign * count for offer_type, count in Counter(offer_types).items()})
+
+
+def apply_deltas(deltas):
+    """Add the deltas to the stored counters with a single UPDATE."""
+    deltas = {key: delta for key, delta in deltas.items() if delta}
+    if not deltas:
+        return
+    matches, whens = Q(), []
+    for (facet, bucket), delta in deltas.items():
+        condition = Q(facet=facet, bucket=bucket)
+        matches |= condition
+        whens.append(When(condition, then=Value(delta)))
+    updated = OfferFacetCount.objects.filter(matches).update(count=F('count') + Case(*whens))
+    if updated < len(deltas):
+        # Rows are seeded by rebuild(); only bucket edges changed without one get here.
+        existing = set(OfferFacetCount.objects.filter(matches).values_list('facet', 'bucket'))
+        OfferFacetCount.objects.bulk_create(
+            [OfferFacetCount(facet=facet, bucket=bucket, count=delta)
+             for (facet, bucket), delta in deltas.items() if (facet, bucket) not in existing],
+            ignore_conflicts=True,
+        )
+
+
+def bucket_filters(facet):
+    """`(key, Q)` for every bucket of a numeric facet."""
+    edges = BUCKET_EDGES[facet]
+    for index, lower in enumerate(edges):
+        condition = Q(**{f'{facet}__isnull': False})
+        if index:
+            condition &= Q(**{f'{facet}__gte': lower})
+        if index + 1 < len(edges):
+            condition &= Q(**{f'{facet}__lt': edges[index + 1]})
+        yield str(lower), condition
+
+
+def count_facets(offers, details):
+    """
+    Count all facets over the given Offer and OfferDetail querysets, with one
+    aggregate each.
+    """
+    aggregates = {'total': Count('pk')}
+    names = {}
+    for facet in BUCKET_EDGES:
+        for key, condition in bucket_filters(facet):
+            names[f'{facet}_{key}'] = (facet, key)
+            aggregates[f'{facet}_{key}'] = Count('pk', filter=condition)
+    values = offers.order_by().aggregate(**aggregates)
+
+    counts = Counter({TOTAL: values.pop('total')})
+    counts.update({names[name]: value for name, value in values.items()})
+    counts.update({(TYPE_FACET, offer_type): 0 for offer_type in OFFER_TYPES})
+    for row in details.order_by().values('offer_type').annotate(count=Count('pk')):
+        counts[(TYPE_FACET, row['offer_type'])] = row['count']
+    return counts
+
+
+def filtered_counts(offers):
+    """Facet counts over a filtered offer queryset."""
+    return count_facets(offers, OfferDetail.objects.filter(offer__in=offers.order_by().values('pk')))
+
+
+def stored_counts():
+    """Facet counts over all offers, read from the summary table."""
+    return Counter({
+        (facet, bucket): count
+        for facet, bucket, count in OfferFacetCount.objects.values_list('facet', 'bucket', 'count')
+    })
+
+
+def rebuild():
+    """
+    Recount everything and replace the summary table, with a row for every
+    bucket (zeros included).
+    """
+    counts = count_facets(Offer.objects.all(), OfferDetail.objects.all())
+    with transaction.atomic():
+        OfferFacetCount.objects.all().delete()
+        OfferFacetCount.objects.bulk_create(
+            OfferFacetCount(facet=facet, bucket=bucket, count=count) for (facet, bucket), count in counts.items()
+        )
+
+
+def serialize(counts):
+    """Response body: histograms with every bucket (zeros included) and offer_type counts."""
+    data = {'count': counts[TOTAL]}
+    for facet, edges in BUCKET_EDGES.items():
+        data[facet] = [
+            {'from': lower, 'to': edges[index + 1] if index + 1 < len(edges) else None,
+             'count': counts[(facet, str(lower))]}
+            for index, lower in enumerate(edges)
+        ]
+    data[TYPE_FACET] = {offer_type: counts[(TYPE_FACET, offer_type)] for offer_type in OFFER_TYPES}
+    return data
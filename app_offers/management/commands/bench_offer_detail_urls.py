@@ -0,0 +1,55 @@
+import time
+
+from django.conf import settings
+from django.core.management.base import BaseCommand, CommandError
+from rest_framework import serializers
+from rest_framework.request import Request
+from rest_framework.test import APIRequestFactory
+
+from app_offers.api.serializers import OfferDetailNestedReadSerializer
+from app_offers.models import OfferDetail
+
+
+class ReverseOfferDetailSerializer(OfferDetailNestedReadSerializer):
+    """The nested detail serializer as it was: reverse() + build_absolute_uri() per detail."""
+    serializer_url_field = serializers.HyperlinkedIdentityField
+
+
+class Command(BaseCommand):
+    """
+    Micro-benchmark the nested offer detail hyperlinks of the offer list:
+    per-detail reverse() against the precompiled URL template.
+    Works on unsaved in-memory details, so it needs no data.
+    """
+    help = "Benchmark offer detail hyperlink generation (reverse vs URL template)."
+
+    def add_arguments(self, parser):
+        parser.add_argument('--details', type=int, default=300, help="Details per page (100 offers x 3 tiers).")
+        parser.add_argument('--repeat', type=int, default=200, help="Timed pages per serializer.")
+
+    def handle(self, *args, **options):
+        host = next((host for host in settings.ALLOWED_HOSTS if host not in ('', '*')), 'localhost')
+        request = Request(APIRequestFactory().get('/api/offers/', HTTP_HOST=host.lstrip('.')))
+        details = [OfferDetail(pk=pk, offer_id=pk // 3 + 1) for pk in range(1, options['details'] + 1)]
+
+        baseline = ReverseOfferDetailSerializer(details, many=True, context={'request': request}).data
+        templated = OfferDetailNestedReadSerializer(details, many=True, context={'request': request}).data
+        if baseline != templated:
+            raise CommandError("URL template output differs from reverse().")
+
+        old = self.time_page(ReverseOfferDetailSerializer, details, request, options['repeat'])
+        new = self.time_page(OfferDetailNestedReadSerializer, details, request, options['repeat'])
+        self.stdout.write(
+            f"{len(details)} detail links per page   reverse {old * 1000:8.3f} ms   "
+            f"template {new * 1000:8.3f} ms   x{old / new if new else float('inf'):.1f}"
+        )
+
+    def time_page(self, serializer_class, details, request, repeat):
+        """Median time to serialize one page of details."""
+        timings = []
+        for _ in range(repeat):
+            start = time.perf_counter()
+            serializer_class(details, many=True, context={'request': request}).data
+            timings.append(time.perf_counter() - start)
+        timings.sort()
+        return timings[len(timings) // 2]
@@ -0,0 +1,83 @@
+import random
+import time
+
+from django.contrib.auth.models import User
+from django.core.management.base import BaseCommand
+from django.db import transaction
+from django.db.models import Q
+
+from app_offers.models import Offer
+from app_offers.search import search_offers
+
+WORDS = (
+    "logo design website development django react photo editing video animation brand "
+    "identity copywriting translation marketing seo audit mobile app ios android backend "
+    "api database cloud devops illustration icon banner flyer podcast voice music mixing"
+).split()
+
+
+class Command(BaseCommand):
+    """
+    Compare offer search latency of the full-text index against the old
+    `icontains` scan (DRF SearchFilter) at increasing table sizes.
+
+    Synthetic offers are inserted inside a transaction that is rolled back at
+    the end, but run this against a scratch database, not production.
+    """
+    help = "Benchmark full-text offer search against icontains at 10k/100k/1M offers."
+
+    def add_arguments(self, parser):
+        parser.add_argument('--sizes', nargs='+', type=int, default=[10_000, 100_000, 1_000_000])
+        parser.add_argument('--repeat', type=int, default=20, help="Timed runs per query and size.")
+        parser.add_argument('--terms', nargs='+', default=["logo", "django react", "podcast mix"])
+
+    def handle(self, *args, **options):
+        random.seed(42)
+        with transaction.atomic():
+            user = User.objects.create(username="bench-offer-search")
+            total = 0
+            for size in sorted(options['sizes']):
+                self.insert_offers(user, size - total)
+                total = size
+                self.report(size, options['terms'], options['repeat'])
+            transaction.set_rollback(True)
+
+    def insert_offers(self, user, count, batch_size=5_000):
+        while count > 0:
+            batch = min(batch_size, count)
+            Offer.objects.bulk_create(
+                Offer(
+                    user=user,
+                    title=" ".join(random.choices(WORDS, k=3)),
+                    description=" ".join(random.choices(WORDS, k=20)),
+                )
+                for _ in range(batch)
+            )
+            count -= batch
+
+    def report(self, size, terms, repeat):
+        self.stdout.write(f"\n{size:,} offers")
+        for term in terms:
+            words = term.split()
+            icontains = Offer.objects.all()
+            for word in words:
+                icontains = icontains.filter(Q(title__icontains=word) | Q(description__icontains=word))
+            full_text = search_offers(Offer.objects.all(), words)
+
+            old = self.time_query(icontains.order_by('-updated_at'), repeat)
+            new = self.time_query(full_text, repeat)
+            self.stdout.write(
+                f"  {term!r:<16} icontains {old * 1000:8.2f} ms   full-text {new * 1000:8.2f} ms   "
+                f"x{old / new if new else float('inf'):.1f}"
+            )
+
+    def time_query(self, queryset, repeat):
+        """Median time of one list page (6 rows) plus the pagination count."""
+        timings = []
+        for _ in range(repeat):
+            start = time.perf_counter()
+            list(queryset[:6])
+            queryset.count()
+            timings.append(time.perf_counter() - start)
+        timings.sort()
+        return timings[len(timings) // 2]
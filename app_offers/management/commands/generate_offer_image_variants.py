@@ -0,0 +1,27 @@
+from django.core.management.base import BaseCommand
+
+from app_offers.models import Offer
+from app_offers.signals import build_offer_image_variants
+
+
+class Command(BaseCommand):
+    """
+    Render missing offer logo derivatives synchronously.
+
+    Covers offers whose background job was lost (e.g. a worker restart) and
+    logos uploaded before the image pipeline existed.
+    """
+    help = "Generate resized derivatives for offer logos that have none."
+
+    def add_arguments(self, parser):
+        parser.add_argument('--all', action='store_true', help="Regenerate derivatives for every offer logo.")
+
+    def handle(self, *args, **options):
+        offers = Offer.objects.exclude(image='').exclude(image__isnull=True)
+        if not options['all']:
+            offers = offers.filter(image_variants={})
+        count = 0
+        for offer_id in offers.values_list('id', flat=True).iterator():
+            build_offer_image_variants(offer_id)
+            count += 1
+        self.stdout.write(self.style.SUCCESS(f"Generated derivatives for {count} offer logo(s)."))
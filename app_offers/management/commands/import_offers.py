@@ -0,0 +1,46 @@
+import json
+
+from django.contrib.auth.models import User
+from django.core.management.base import BaseCommand, CommandError
+
+from app_offers.api.serializers import MAX_BULK_OFFERS, OfferCreateUpdateSerializer
+
+
+class Command(BaseCommand):
+    """
+    Import offers for a business user from a JSON file.
+
+    The file holds a list of offers in the same format as POST /api/offers/
+    (title, description, details with basic/standard/premium). Offers are
+    validated and bulk-inserted in chunks of MAX_BULK_OFFERS; each chunk is
+    atomic.
+    """
+    help = "Bulk-import offers for a business user from a JSON file."
+
+    def add_arguments(self, parser):
+        parser.add_argument('username', help="Owner of the imported offers (business user).")
+        parser.add_argument('path', help="JSON file with a list of offers.")
+
+    def handle(self, *args, **options):
+        try:
+            user = User.objects.select_related('profile').get(username=options['username'])
+        except User.DoesNotExist:
+            raise CommandError(f"User '{options['username']}' does not exist.")
+        if getattr(getattr(user, 'profile', None), 'type', None) != 'business':
+            raise CommandError(f"User '{user.username}' is not a business user.")
+
+        with open(options['path'], encoding='utf-8') as file:
+            offers = json.load(file)
+        if not isinstance(offers, list):
+            raise CommandError("The file must contain a JSON list of offers.")
+
+        created = 0
+        for start in range(0, len(offers), MAX_BULK_OFFERS):
+            chunk = offers[start:start + MAX_BULK_OFFERS]
+            serializer = OfferCreateUpdateSerializer(data=chunk, many=True)
+            if not serializer.is_valid():
+                errors = {start + index: error for index, error in enumerate(serializer.errors) if error}
+                raise CommandError(f"Invalid offers (by index), {created} imported before: {errors}")
+            created += len(serializer.save(user=user))
+
+        self.stdout.write(self.style.SUCCESS(f"Imported {created} offer(s) for '{user.username}'."))
@@ -0,0 +1,17 @@
+from django.core.management.base import BaseCommand
+
+from app_offers import facets
+
+
+class Command(BaseCommand):
+    """
+    Recount the unfiltered offer facets from the offer and offer detail tables.
+
+    Used to repair drift caused by writes that bypassed the model layer
+    (raw SQL, queryset.update(), fixtures, ...) or after changing the bucket edges.
+    """
+    help = "Rebuild the offer facet summary table."
+
+    def handle(self, *args, **options):
+        facets.rebuild()
+        self.stdout.write(self.style.SUCCESS("Offer facets rebuilt."))
@@ -0,0 +1,38 @@
+from django.core.management.base import BaseCommand
+from django.db.models import Min, OuterRef, Q, Subquery
+
+from app_offers import facets
+from app_offers.cache import bump_generation
+from app_offers.models import Offer, OfferDetail
+
+
+class Command(BaseCommand):
+    """
+    Recompute Offer.min_price and Offer.min_delivery_time from the OfferDetails.
+
+    Used to backfill the denormalized columns or to repair drift caused by
+    writes that bypassed the model layer (raw SQL, fixtures, ...).
+    """
+    help = "Backfill / repair the denormalized min_price and min_delivery_time columns on Offer."
+
+    def handle(self, *args, **options):
+        details = OfferDetail.objects.filter(offer=OuterRef('pk')).values('offer')
+        calc_price = Subquery(details.annotate(value=Min('price')).values('value'))
+        calc_days = Subquery(details.annotate(value=Min('delivery_time_in_days')).values('value'))
+
+        # NULL-safe "differs": a plain != is never true when either side is NULL.
+        drifted = Offer.objects.alias(calc_price=calc_price, calc_days=calc_days).filter(
+            Q(min_price__isnull=False, calc_price__isnull=False) & ~Q(min_price=calc_price)
+            | Q(min_price__isnull=True, calc_price__isnull=False)
+            | Q(min_price__isnull=False, calc_price__isnull=True)
+            | Q(min_delivery_time__isnull=False, calc_days__isnull=False) & ~Q(min_delivery_time=calc_days)
+            | Q(min_delivery_time__isnull=True, calc_days__isnull=False)
+            | Q(min_delivery_time__isnull=False, calc_days__isnull=True)
+        )
+        updated = drifted.update(min_price=calc_price, min_delivery_time=calc_days)
+        if updated:
+            # update() bypassed the signals: re-bucket the facets and drop cached list pages.
+            facets.rebuild()
+            bump_generation()
+
+        self.stdout.write(self.style.SUCCESS(f"Repaired min fields on {updated} offer(s)."))
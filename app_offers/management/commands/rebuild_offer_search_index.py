@@ -0,0 +1,15 @@
+from django.core.management.base import BaseCommand
+
+from app_offers.search import rebuild_search_index
+
+
+class Command(BaseCommand):
+    """Rebuild the offer full-text index from the offer table (SQLite FTS5 only)."""
+    help = "Rebuild the offer full-text search index."
+
+    def add_arguments(self, parser):
+        parser.add_argument('--database', default='default', help="Database alias to rebuild.")
+
+    def handle(self, *args, **options):
+        rebuild_search_index(options['database'])
+        self.stdout.write(self.style.SUCCESS("Offer search index rebuilt."))
@@ -0,0 +1,36 @@
+# Generated by Django 5.2.5 on 2026-10-18 05:23
+
+from django.db import migrations, models
+from django.db.models import Min, OuterRef, Subquery
+
+
+def backfill_min_fields(apps, schema_editor):
+    """Populate min_price / min_delivery_time for existing offers."""
+    Offer = apps.get_model('app_offers', 'Offer')
+    OfferDetail = apps.get_model('app_offers', 'OfferDetail')
+    details = OfferDetail.objects.filter(offer=OuterRef('pk')).values('offer')
+    Offer.objects.update(
+        min_price=Subquery(details.annotate(value=Min('price')).values('value')),
+        min_delivery_time=Subquery(details.annotate(value=Min('delivery_time_in_days')).values('value')),
+    )
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('app_offers', '0001_initial'),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name='offer',
+            name='min_delivery_time',
+            field=models.PositiveIntegerField(blank=True, db_index=True, editable=False, null=True),
+        ),
+        migrations.AddField(
+            model_name='offer',
+            name='min_price',
+            field=models.DecimalField(blank=True, db_index=True, decimal_places=2, editable=False, max_digits=10, null=True),
+        ),
+        migrations.RunPython(backfill_min_fields, migrations.RunPython.noop),
+    ]
@@ -0,0 +1,82 @@
+# Generated by Django 5.2.5 on 2026-10-18 05:24
+
+import app_offers.models
+import django.db.models.deletion
+from django.db import migrations, models
+
+# The search schema as of this migration, frozen here so later changes to
+# app_offers.search do not rewrite history.
+FTS_TABLE = 'app_offers_offer_fts'
+PG_INDEX = 'app_offers_offer_search_gin'
+
+SQLITE_SCHEMA = [
+    """CREATE VIRTUAL TABLE IF NOT EXISTS app_offers_offer_fts USING fts5(
+        title, description,
+        content='app_offers_offer', content_rowid='id',
+        tokenize='unicode61 remove_diacritics 2'
+    )""",
+    """CREATE TRIGGER IF NOT EXISTS app_offers_offer_fts_ai AFTER INSERT ON app_offers_offer BEGIN
+        INSERT INTO app_offers_offer_fts(rowid, title, description) VALUES (new.id, new.title, new.description);
+    END""",
+    """CREATE TRIGGER IF NOT EXISTS app_offers_offer_fts_ad AFTER DELETE ON app_offers_offer BEGIN
+        INSERT INTO app_offers_offer_fts(app_offers_offer_fts, rowid, title, description)
+        VALUES ('delete', old.id, old.title, old.description);
+    END""",
+    """CREATE TRIGGER IF NOT EXISTS app_offers_offer_fts_au AFTER UPDATE OF title, description ON app_offers_offer BEGIN
+        INSERT INTO app_offers_offer_fts(app_offers_offer_fts, rowid, title, description)
+        VALUES ('delete', old.id, old.title, old.description);
+        INSERT INTO app_offers_offer_fts(rowid, title, description) VALUES (new.id, new.title, new.description);
+    END""",
+    "INSERT INTO app_offers_offer_fts(app_offers_offer_fts) VALUES ('rebuild')",
+]
+
+POSTGRES_SCHEMA = [
+    "CREATE INDEX IF NOT EXISTS app_offers_offer_search_gin ON app_offers_offer USING GIN ("
+    "to_tsvector('simple', coalesce(title, '') || ' ' || coalesce(description, '')))",
+]
+
+
+def create_search_index(apps, schema_editor):
+    """Create the FTS5 table + triggers (SQLite) and fill it, or the GIN index (PostgreSQL)."""
+    vendor = schema_editor.connection.vendor
+    if vendor == 'sqlite':
+        statements = SQLITE_SCHEMA
+    elif vendor == 'postgresql':
+        statements = POSTGRES_SCHEMA
+    else:
+        return
+    for statement in statements:
+        schema_editor.execute(statement)
+
+
+def drop_search_index(apps, schema_editor):
+    vendor = schema_editor.connection.vendor
+    if vendor == 'sqlite':
+        for suffix in ('ai', 'ad', 'au'):
+            schema_editor.execute(f'DROP TRIGGER IF EXISTS {FTS_TABLE}_{suffix}')
+        schema_editor.execute(f'DROP TABLE IF EXISTS {FTS_TABLE}')
+    elif vendor == 'postgresql':
+        schema_editor.execute(f'DROP INDEX IF EXISTS {PG_INDEX}')
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('app_offers', '0002_offer_min_fields'),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name='OfferSearchIndex',
+            fields=[
+                ('offer', models.OneToOneField(db_column='rowid', on_delete=django.db.models.deletion.DO_NOTHING, primary_key=True, related_name='search_index', serialize=False, to='app_offers.offer')),
+                ('document', app_offers.models.SearchDocumentField(db_column='app_offers_offer_fts')),
+                ('rank', models.FloatField()),
+            ],
+            options={
+                'db_table': 'app_offers_offer_fts',
+                'managed': False,
+            },
+        ),
+        migrations.RunPython(create_search_index, drop_search_index),
+    ]
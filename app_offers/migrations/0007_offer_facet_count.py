@@ -0,0 +1,65 @@
+# Generated by Django 5.2.5 on 2026-10-18 05:48
+
+from django.db import migrations, models
+from django.db.models import Count, Q
+
+# Bucket edges as of this migration; later changes go through rebuild_offer_facets.
+BUCKET_EDGES = {
+    'min_price': (0, 50, 100, 250, 500, 1000),
+    'min_delivery_time': (1, 3, 7, 14, 30),
+}
+OFFER_TYPES = ('basic', 'standard', 'premium')
+
+
+def backfill_facet_counts(apps, schema_editor):
+    """
+    Count the existing offers into the new summary table: the total, a row
+    per histogram bucket and per offer_type (zeros included).
+    """
+    Offer = apps.get_model('app_offers', 'Offer')
+    OfferDetail = apps.get_model('app_offers', 'OfferDetail')
+    OfferFacetCount = apps.get_model('app_offers', 'OfferFacetCount')
+
+    aggregates = {'count': Count('pk')}
+    for facet, edges in BUCKET_EDGES.items():
+        for index, lower in enumerate(edges):
+            condition = Q(**{f'{facet}__isnull': False})
+            if index:
+                condition &= Q(**{f'{facet}__gte': lower})
+            if index + 1 < len(edges):
+                condition &= Q(**{f'{facet}__lt': edges[index + 1]})
+            aggregates[f'{facet}:{lower}'] = Count('pk', filter=condition)
+    counts = {
+        (name, '') if name == 'count' else tuple(name.split(':')): value
+        for name, value in Offer.objects.order_by().aggregate(**aggregates).items()
+    }
+    counts.update({('offer_type', offer_type): 0 for offer_type in OFFER_TYPES})
+    for row in OfferDetail.objects.order_by().values('offer_type').annotate(count=Count('pk')):
+        counts[('offer_type', row['offer_type'])] = row['count']
+
+    OfferFacetCount.objects.bulk_create(
+        OfferFacetCount(facet=facet, bucket=bucket, count=count) for (facet, bucket), count in counts.items()
+    )
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('app_offers', '0006_list_indexes'),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name='OfferFacetCount',
+            fields=[
+                ('id', models.BigAutoField(auto_created=True, primary_key=True, serialize=False, verbose_name='ID')),
+                ('facet', models.CharField(max_length=20)),
+                ('bucket', models.CharField(blank=True, max_length=20)),
+                ('count', models.IntegerField(default=0)),
+            ],
+            options={
+                'constraints': [models.UniqueConstraint(fields=('facet', 'bucket'), name='unique_offer_facet_bucket')],
+            },
+        ),
+        migrations.RunPython(backfill_facet_counts, migrations.RunPython.noop),
+    ]
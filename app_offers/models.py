@@ -1,4 +1,6 @@
-from django.db import models
+from django.db import models, transaction
+from django.db.models import Min
+from django.utils import timezone
 from django.contrib.auth.models import User
 from .storages import OverwriteStorage
 
@@ -19,15 +21,87 @@ def offer_picture_path(instance, filename):
         return f'offers/offer_{instance.user.id}/logo.{ext}'
 
 
+def offer_picture_derivative_path(instance, width, ext, digest):
+    """
+    Generate the path of a resized derivative of an offer picture.
+
+    The file is saved next to the original, keyed by the offer and a hash of
+    the logo it was rendered from (re-uploads keep the original's name):
+        MEDIA_ROOT/offers/offer_<user_id>/logo_<offer_id>_<digest>_<width>.<ext>
+    """
+    return f'offers/offer_{instance.user_id}/{offer_picture_derivative_prefix(instance)}{digest}_{width}.{ext}'
+
+
+def offer_picture_derivative_prefix(instance):
+    """File name prefix shared by all derivatives of one offer's logo."""
+    return f'logo_{instance.pk}_'
+
+
 class Offer(models.Model):
-    """Represents an offer created by a user, including title, description, and logo image."""
+    """
+    Represents an offer created by a user, including title, description, and logo image.
+
+    `min_price` and `min_delivery_time` are denormalized from the related
+    OfferDetails and kept current by `refresh_min_fields()`.
+    `image_variants` lists the resized derivatives of `image` once generated.
+    """
     user = models.ForeignKey(User, on_delete=models.CASCADE)
     title = models.CharField(max_length=150)
     description = models.TextField()
     image = models.ImageField(upload_to=offer_picture_path, blank=True, null=True, storage=OverwriteStorage())
+    image_variants = models.JSONField(default=dict, blank=True, editable=False)
+    min_price = models.DecimalField(max_digits=10, decimal_places=2, null=True, blank=True, editable=False, db_index=True)
+    min_delivery_time = models.PositiveIntegerField(null=True, blank=True, editable=False, db_index=True)
     created_at = models.DateTimeField(auto_now_add=True)
     updated_at = models.DateTimeField(auto_now=True)
 
+    class Meta:
+        """
+        Support keyset pagination on (updated_at, id) and the
+        `?creator_id=` filter in the default updated_at order.
+        """
+        indexes = [
+            models.Index(fields=['updated_at', 'id'], name='offer_updated_at_id_idx'),
+            models.Index(fields=['user', 'updated_at'], name='offer_user_updated_at_idx'),
+        ]
+
+    @classmethod
+    def from_db(cls, db, field_names, values):
+        """Remember the stored min fields, so a later save() can tell what changed."""
+        instance = super().from_db(db, field_names, values)
+        instance.mark_min_fields_saved()
+        return instance
+
+    def mark_min_fields_saved(self):
+        """Record the current min fields as the stored ones (None if they are deferred)."""
+        loaded = self.get_deferred_fields().isdisjoint({'min_price', 'min_delivery_time'})
+        self._saved_min_fields = (self.min_price, self.min_delivery_time) if loaded else None
+
+    def refresh_min_fields(self):
+        """
+        Recompute min_price and min_delivery_time from the current OfferDetails
+        and store them on this instance and in the database.
+        Returns the previously stored `(min_price, min_delivery_time)`, or None if the offer is gone.
+        """
+        with transaction.atomic():
+            previous = (
+                Offer.objects.select_for_update()
+                .filter(pk=self.pk)
+                .values_list('min_price', 'min_delivery_time')
+                .first()
+            )
+            values = self.details.aggregate(
+                min_price=Min("price"),
+                min_delivery_time=Min("delivery_time_in_days"),
+            )
+            self.min_price = values["min_price"]
+            self.min_delivery_time = values["min_delivery_time"]
+            # update() skips auto_now; Last-Modified of the offer detail reads updated_at.
+            self.updated_at = timezone.now()
+            Offer.objects.filter(pk=self.pk).update(updated_at=self.updated_at, **values)
+        self.mark_min_fields_saved()
+        return previous
+
 
 class OfferDetail(models.Model):
     """
@@ -48,13 +122,77 @@ class OfferDetail(models.Model):
     price = models.DecimalField(max_digits=10, decimal_places=2)
     features = models.JSONField(default=list, blank=True)
 
+    @classmethod
+    def from_db(cls, db, field_names, values):
+        """Remember the stored offer_type, so a later save() can tell if it changed."""
+        instance = super().from_db(db, field_names, values)
+        instance._saved_offer_type = instance.__dict__.get('offer_type')
+        return instance
 
     class Meta:
-        """Ensure each offer has only one detail per offer_type."""
+        """
+        Ensure each offer has only one detail per offer_type.
+        The (offer, price, delivery_time_in_days) index covers the min-field aggregates.
+        """
         constraints = [
             models.UniqueConstraint(
                 fields=['offer', 'offer_type'],
                 name='unique_offer_type_per_offer'
             )
         ]
+        indexes = [
+            models.Index(fields=['offer', 'price', 'delivery_time_in_days'], name='offerdetail_offer_price_idx'),
+        ]
+
+
+
+class OfferFacetCount(models.Model):
+    """
+    Incrementally maintained offer counts per facet bucket, behind the
+    unfiltered `/api/offers/facets/`. One row per (facet, bucket); the buckets
+    and the maintenance rules live in `app_offers.facets`.
+    """
+    facet = models.CharField(max_length=20)
+    bucket = models.CharField(max_length=20, blank=True)
+    count = models.IntegerField(default=0)
+
+    class Meta:
+        """One counter per bucket."""
+        constraints = [
+            models.UniqueConstraint(fields=['facet', 'bucket'], name='unique_offer_facet_bucket'),
+        ]
+
+    def __str__(self):
+        return f"{self.facet}[{self.bucket}] = {self.count}"
+
 
+class SearchDocumentField(models.TextField):
+    """Column standing for a whole SQLite FTS5 row; supports the `match` lookup."""
+
+
+@SearchDocumentField.register_lookup
+class Match(models.Lookup):
+    lookup_name = 'match'
+
+    def as_sql(self, compiler, connection):
+        lhs, lhs_params = self.process_lhs(compiler, connection)
+        rhs, rhs_params = self.process_rhs(compiler, connection)
+        return f'{lhs} MATCH {rhs}', lhs_params + rhs_params
+
+
+class OfferSearchIndex(models.Model):
+    """
+    Read-only mapping of the SQLite FTS5 table indexing Offer.title and Offer.description.
+
+    The table and its sync triggers are created by migrations (see app_offers.search),
+    so the model is unmanaged and only used to join the index in search queries.
+    """
+    offer = models.OneToOneField(
+        Offer, on_delete=models.DO_NOTHING, primary_key=True, db_column='rowid', related_name='search_index'
+    )
+    document = SearchDocumentField(db_column='app_offers_offer_fts')
+    rank = models.FloatField()
+
+    class Meta:
+        managed = False
+        db_table = 'app_offers_offer_fts'
@@ -0,0 +1,128 @@
+"""
+Full-text search for offers.
+
+SQLite: an FTS5 external-content table (`app_offers_offer_fts`) indexes
+Offer.title / Offer.description and is kept in sync by triggers, so every
+write path (ORM, bulk_create, raw SQL) updates the index.
+
+PostgreSQL: a GIN expression index over a `simple` tsvector of the same
+columns; nothing needs to be kept in sync by hand.
+
+Any other engine falls back to case-insensitive substring matching.
+"""
+import re
+
+from django.db import connections
+from django.db.models import BooleanField, F, FloatField, Q
+from django.db.models.expressions import RawSQL
+
+FTS_TABLE = "app_offers_offer_fts"
+PG_INDEX = "app_offers_offer_search_gin"
+PG_VECTOR = (
+    "to_tsvector('simple', coalesce(app_offers_offer.title, '') || ' ' || "
+    "coalesce(app_offers_offer.description, ''))"
+)
+
+SQLITE_SCHEMA = [
+    f"""CREATE VIRTUAL TABLE IF NOT EXISTS {FTS_TABLE} USING fts5(
+        title, description,
+        content='app_offers_offer', content_rowid='id',
+        tokenize='unicode61 remove_diacritics 2'
+    )""",
+    f"""CREATE TRIGGER IF NOT EXISTS {FTS_TABLE}_ai AFTER INSERT ON app_offers_offer BEGIN
+        INSERT INTO {FTS_TABLE}(rowid, title, description) VALUES (new.id, new.title, new.description);
+    END""",
+    f"""CREATE TRIGGER IF NOT EXISTS {FTS_TABLE}_ad AFTER DELETE ON app_offers_offer BEGIN
+        INSERT INTO {FTS_TABLE}({FTS_TABLE}, rowid, title, description)
+        VALUES ('delete', old.id, old.title, old.description);
+    END""",
+    f"""CREATE TRIGGER IF NOT EXISTS {FTS_TABLE}_au AFTER UPDATE OF title, description ON app_offers_offer BEGIN
+        INSERT INTO {FTS_TABLE}({FTS_TABLE}, rowid, title, description)
+        VALUES ('delete', old.id, old.title, old.description);
+        INSERT INTO {FTS_TABLE}(rowid, title, description) VALUES (new.id, new.title, new.description);
+    END""",
+]
+
+SQLITE_TRIGGERS = {f"{FTS_TABLE}_{suffix}" for suffix in ("ai", "ad", "au")}
+
+POSTGRES_SCHEMA = [
+    f"CREATE INDEX IF NOT EXISTS {PG_INDEX} ON app_offers_offer USING GIN ("
+    "to_tsvector('simple', coalesce(title, '') || ' ' || coalesce(description, '')))",
+]
+
+
+def ensure_search_index(using="default"):
+    """
+    Create the search index objects if they are missing.
+
+    Safe to call repeatedly. On SQLite the triggers are recreated here because
+    Django rebuilds the offer table (dropping its triggers) for some ALTERs.
+    """
+    connection = connections[using]
+    if connection.vendor == "sqlite":
+        statements = SQLITE_SCHEMA
+    elif connection.vendor == "postgresql":
+        statements = POSTGRES_SCHEMA
+    else:
+        return
+    with connection.cursor() as cursor:
+        for statement in statements:
+            cursor.execute(statement)
+
+
+def search_triggers_missing(using="default"):
+    """True if the SQLite FTS table exists but some of its sync triggers do not."""
+    connection = connections[using]
+    if connection.vendor != "sqlite" or FTS_TABLE not in connection.introspection.table_names():
+        return False
+    with connection.cursor() as cursor:
+        cursor.execute("SELECT name FROM sqlite_master WHERE type = 'trigger' AND tbl_name = 'app_offers_offer'")
+        return not SQLITE_TRIGGERS <= {name for name, in cursor.fetchall()}
+
+
+def rebuild_search_index(using="default"):
+    """Rebuild the SQLite FTS index from the offer table (no-op on other engines)."""
+    connection = connections[using]
+    if connection.vendor != "sqlite":
+        return
+    ensure_search_index(using)
+    with connection.cursor() as cursor:
+        cursor.execute(f"INSERT INTO {FTS_TABLE}({FTS_TABLE}) VALUES ('rebuild')")
+
+
+def tokenize(terms):
+    """Split search terms into word tokens understood by both FTS backends."""
+    tokens = []
+    for term in terms:
+        tokens.extend(re.findall(r"\w+", term))
+    return tokens
+
+
+def search_offers(queryset, terms):
+    """
+    Restrict `queryset` to offers matching all `terms` (prefix match on each
+    word) and annotate a `search_rank`. The queryset is ordered best match
+    first; a later `order_by()` (e.g. OrderingFilter) replaces that order.
+    """
+    tokens = tokenize(terms)
+    if not tokens:
+        return queryset
+
+    vendor = connections[queryset.db].vendor
+    if vendor == "sqlite":
+        match = " ".join(f'"{token}"*' for token in tokens)
+        return queryset.filter(search_index__document__match=match).annotate(
+            search_rank=F("search_index__rank")
+        ).order_by("search_rank", "id")
+
+    if vendor == "postgresql":
+        query = " & ".join(f"{token}:*" for token in tokens)
+        return queryset.annotate(
+            search_hit=RawSQL(f"{PG_VECTOR} @@ to_tsquery('simple', %s)", [query], output_field=BooleanField()),
+            search_rank=RawSQL(f"ts_rank({PG_VECTOR}, to_tsquery('simple', %s))", [query], output_field=FloatField()),
+        ).filter(search_hit=True).order_by("-search_rank", "id")
+
+    condition = Q()
+    for token in tokens:
+        condition &= Q(title__icontains=token) | Q(description__icontains=token)
+    return queryset.filter(condition)
@@ -0,0 +1,200 @@
+import posixpath
+from collections import Counter
+
+from django.contrib.auth.models import User
+from django.db import transaction
+from django.db.models.signals import pre_save, post_init, post_save, post_delete
+from django.dispatch import Signal, receiver
+
+from app_offers import facets
+from app_offers.cache import bump_generation
+from app_offers.models import (
+    Offer, OfferDetail, offer_picture_derivative_path, offer_picture_derivative_prefix
+)
+from core.images import enqueue_after_commit, generate_derivatives, read_source, variant_names
+
+
+# Sent after offers (and their details) were created with bulk_create, which
+# bypasses post_save. Arguments: `offers` (list of saved Offer instances).
+offers_bulk_created = Signal()
+
+# Sent after offer details were created with bulk_create.
+# Arguments: `details` (list of saved OfferDetail instances).
+offer_details_bulk_created = Signal()
+
+
+def _is_detail_delete(origin):
+    """True if the delete was started on OfferDetail itself (not cascaded from Offer or User)."""
+    model = getattr(origin, "model", type(origin))
+    return model is OfferDetail
+
+
+@receiver(post_save, sender=OfferDetail)
+def refresh_min_fields_on_detail_save(sender, instance, raw=False, **kwargs):
+    """Keep Offer.min_price / min_delivery_time current after a detail is saved."""
+    if raw:
+        return
+    _refresh_min_fields(instance.offer)
+
+
+@receiver(post_delete, sender=OfferDetail)
+def refresh_min_fields_on_detail_delete(sender, instance, origin=None, **kwargs):
+    """
+    Keep Offer.min_price / min_delivery_time current after a detail is deleted.
+    Skipped when the offer itself is being deleted.
+    """
+    if not _is_detail_delete(origin):
+        return
+    _refresh_min_fields(instance.offer)
+
+
+def _refresh_min_fields(offer):
+    """Refresh the offer's min fields and move it between facet buckets accordingly."""
+    previous = offer.refresh_min_fields()
+    if previous is not None:
+        facets.apply_deltas(facets.offer_deltas(previous, (offer.min_price, offer.min_delivery_time)))
+
+
+@receiver(post_save, sender=Offer)
+def count_offer_facets_on_save(sender, instance, created, raw=False, **kwargs):
+    """Count a new offer, or move a saved one to the buckets of its new min fields."""
+    if raw:
+        return
+    previous = None if created else getattr(instance, '_saved_min_fields', None)
+    if created or previous is not None:
+        facets.apply_deltas(facets.offer_deltas(previous, (instance.min_price, instance.min_delivery_time)))
+    instance.mark_min_fields_saved()
+
+
+@receiver(post_delete, sender=Offer)
+def count_offer_facets_on_delete(sender, instance, **kwargs):
+    """Remove a deleted offer from the total and its buckets."""
+    previous = getattr(instance, '_saved_min_fields', None) or (instance.min_price, instance.min_delivery_time)
+    facets.apply_deltas(facets.offer_deltas(previous, None))
+
+
+@receiver(offers_bulk_created)
+def count_offer_facets_on_bulk_create(sender, offers, **kwargs):
+    """Count offers inserted with bulk_create (no post_save)."""
+    deltas = Counter()
+    for offer in offers:
+        deltas.update(facets.offer_deltas(None, (offer.min_price, offer.min_delivery_time)))
+    facets.apply_deltas(deltas)
+
+
+@receiver(post_save, sender=OfferDetail)
+def count_offer_type_on_detail_save(sender, instance, created, raw=False, **kwargs):
+    """Count the detail's offer_type; a changed offer_type moves the count."""
+    if raw:
+        return
+    previous = None if created else getattr(instance, '_saved_offer_type', None)
+    if created or (previous is not None and previous != instance.offer_type):
+        deltas = facets.type_deltas([instance.offer_type])
+        if previous is not None:
+            deltas.update(facets.type_deltas([previous], sign=-1))
+        facets.apply_deltas(deltas)
+    instance._saved_offer_type = instance.offer_type
+
+
+@receiver(post_delete, sender=OfferDetail)
+def count_offer_type_on_detail_delete(sender, instance, **kwargs):
+    """Uncount the detail's offer_type, cascaded deletes included."""
+    facets.apply_deltas(facets.type_deltas([instance.offer_type], sign=-1))
+
+
+@receiver(offer_details_bulk_created)
+def count_offer_types_on_bulk_create(sender, details, **kwargs):
+    """Count details inserted with bulk_create (no post_save)."""
+    facets.apply_deltas(facets.type_deltas(detail.offer_type for detail in details))
+
+
+@receiver(post_save, sender=Offer)
+@receiver(post_delete, sender=Offer)
+@receiver(post_save, sender=OfferDetail)
+@receiver(post_delete, sender=OfferDetail)
+@receiver(offers_bulk_created)
+def invalidate_offer_list_cache(sender, raw=False, **kwargs):
+    """Any offer or offer detail write invalidates every cached offer list page."""
+    if raw:
+        return
+    bump_generation()
+
+
+def user_details_state(user):
+    """The user columns offer responses embed as `user_details` (None where not loaded)."""
+    return tuple(user.__dict__.get(field) for field in ('username', 'first_name', 'last_name'))
+
+
+@receiver(post_init, sender=User)
+def remember_user_details(sender, instance, **kwargs):
+    instance._saved_user_details = user_details_state(instance)
+
+
+@receiver(post_save, sender=User)
+def invalidate_offer_list_cache_on_rename(sender, instance, created, raw=False, **kwargs):
+    """Cached offer list pages (and their ETag) carry the creators' names; other user edits keep them."""
+    if raw:
+        return
+    if not created and user_details_state(instance) != instance._saved_user_details:
+        bump_generation()
+    instance._saved_user_details = user_details_state(instance)
+
+
+
+def build_offer_image_variants(offer_id):
+    """
+    Worker job: render the derivatives of an offer's logo and record them.
+
+    Re-uploads keep the logo's name (OverwriteStorage), so the derivatives are
+    named by a hash of the logo they were rendered from, and are only recorded
+    if the logo still has that hash under the offer's row lock. A job that
+    lost the race to a newer upload removes its files (the upload queued its
+    own job); a recorded one removes the files of earlier logos.
+    """
+    offer = Offer.objects.filter(pk=offer_id).only('id', 'user_id', 'image').first()
+    if offer is None or not offer.image:
+        return
+    content, digest = read_source(offer.image)
+    variants = generate_derivatives(
+        offer.image, lambda width, ext: offer_picture_derivative_path(offer, width, ext, digest), content
+    )
+    storage, names = offer.image.storage, variant_names(variants)
+
+    with transaction.atomic():
+        current = Offer.objects.select_for_update().filter(pk=offer_id).only('id', 'user_id', 'image').first()
+        recorded = (
+            current is not None and current.image.name == offer.image.name
+            and read_source(current.image)[1] == digest
+        )
+        if not recorded:
+            stale = names
+        else:
+            Offer.objects.filter(pk=offer_id).update(image_variants=variants)
+            directory, _ = posixpath.split(offer.image.name)
+            prefix = offer_picture_derivative_prefix(offer)
+            stale = {
+                posixpath.join(directory, file_name) for file_name in storage.listdir(directory)[1]
+                if file_name.startswith(prefix)
+            } - names
+        for name in stale:
+            storage.delete(name)
+    if recorded:
+        bump_generation()
+
+
+@receiver(pre_save, sender=Offer)
+def reset_image_variants_on_upload(sender, instance, raw=False, **kwargs):
+    """A new (or removed) logo makes the old derivatives stale."""
+    instance._image_uploaded = bool(instance.image) and not instance.image._committed
+    if raw:
+        return
+    if instance._image_uploaded or not instance.image:
+        instance.image_variants = {}
+
+
+@receiver(post_save, sender=Offer)
+def queue_image_variants_on_upload(sender, instance, raw=False, **kwargs):
+    """Render derivatives off the request path once the upload is committed."""
+    if raw or not getattr(instance, '_image_uploaded', False):
+        return
+    enqueue_after_commit(build_offer_image_variants, instance.pk)
@@ -1,14 +1,32 @@
+import json
+import os
+import shutil
+import tempfile
+from io import BytesIO, StringIO
+
+from unittest import mock
+
+from PIL import Image
+from django.core.cache import cache
+from django.core.files.uploadedfile import SimpleUploadedFile
+from django.test import override_settings
+from django.core.management import call_command
 from django.urls import reverse
 from rest_framework import status
 from rest_framework.test import APIClient, APITestCase
 from django.contrib.auth.models import User
+from app_auth.cache import get_profile_type
+from app_offers import cache as offer_cache
+from app_offers import facets, signals
+from app_offers.api.views import OffersListCreateView
 from app_offers.models import Offer, OfferDetail
 from rest_framework.authtoken.models import Token
 
 from app_auth.models import UserProfile
+from core.query_budget import QueryBudgetTestMixin
 
 
-class OfferTests(APITestCase):
+class OfferTests(QueryBudgetTestMixin, APITestCase):
 
     def setUp(self):
         """ Create Users"""
@@ -39,6 +57,7 @@ class OfferTests(APITestCase):
 
         # Single APIClient
         self.client = APIClient()
+        cache.clear()
 
 
     def authenticate_user(self, user_type):
@@ -172,4 +191,678 @@ class OfferTests(APITestCase):
         response = self.client.delete(url, format="json")
 
         self.assertEqual(response.status_code, status.HTTP_204_NO_CONTENT)
-        self.assertFalse(Offer.objects.filter(pk=self.offer.pk).exists()) 
\ No newline at end of file
+        self.assertFalse(Offer.objects.filter(pk=self.offer.pk).exists()) 
+
+    """ TESTS MIN FIELDS """
+    """ ---------------- """
+    # min_price & min_delivery_time are stored on the offer (valid)
+    def test_min_fields_stored_on_offer(self):
+        self.offer.refresh_from_db()
+        self.assertEqual(self.offer.min_price, 50)
+        self.assertEqual(self.offer.min_delivery_time, 1)
+
+
+    # PATCH details updates stored min fields (valid)
+    def test_patch_offer_details_updates_min_fields(self):
+        self.authenticate_user("business")
+        url = reverse("offer-detail", args=[self.offer.pk])
+        payload = {
+            "details": [
+                {"offer_type": "basic", "price": 20},
+                {"offer_type": "premium", "delivery_time_in_days": 4},
+            ]
+        }
+        response = self.client.patch(url, payload, format="json")
+
+        self.assertEqual(response.status_code, status.HTTP_200_OK)
+        self.assertEqual(response.data["min_price"], "20.00")
+        self.assertEqual(response.data["min_delivery_time"], 3)
+        self.offer.refresh_from_db()
+        self.assertEqual(self.offer.min_price, 20)
+        self.assertEqual(self.offer.min_delivery_time, 3)
+
+
+    # detail writes move the offer's updated_at (Last-Modified) (valid)
+    def test_detail_write_touches_offer_updated_at(self):
+        self.offer.refresh_from_db()
+        before = self.offer.updated_at
+        detail = self.offer.details.get(offer_type="basic")
+        detail.price = 10
+        detail.save()
+
+        self.offer.refresh_from_db()
+        self.assertGreater(self.offer.updated_at, before)
+
+
+    # DELETE single detail updates stored min fields (valid)
+    def test_delete_detail_updates_min_fields(self):
+        self.offer.details.get(offer_type="basic").delete()
+
+        self.offer.refresh_from_db()
+        self.assertEqual(self.offer.min_price, 100)
+
+
+    # filter by min_price uses stored column (valid)
+    def test_filter_offer_list_by_min_price(self):
+        url = reverse("offers-list")
+
+        response = self.client.get(url, {"min_price": 60}, format="json")
+        self.assertEqual(len(response.data["results"]), 0)
+
+        response = self.client.get(url, {"min_price": 50, "max_delivery_time": 1}, format="json")
+        self.assertEqual(len(response.data["results"]), 1)
+
+
+    # repair command fixes drifted min fields (valid)
+    def test_rebuild_offer_min_fields_command(self):
+        Offer.objects.filter(pk=self.offer.pk).update(min_price=999, min_delivery_time=None)
+
+        call_command("rebuild_offer_min_fields", stdout=StringIO())
+
+        self.offer.refresh_from_db()
+        self.assertEqual(self.offer.min_price, 50)
+        self.assertEqual(self.offer.min_delivery_time, 1)
+
+
+    # repair command clears min fields of offers without details (valid)
+    def test_rebuild_offer_min_fields_clears_stale_values(self):
+        offer = Offer.objects.create(user=self.business_user, title="Empty", description="Desc")
+        Offer.objects.filter(pk=offer.pk).update(min_price=10, min_delivery_time=3)
+
+        call_command("rebuild_offer_min_fields", stdout=StringIO())
+
+        offer.refresh_from_db()
+        self.assertIsNone(offer.min_price)
+        self.assertIsNone(offer.min_delivery_time)
+
+
+    # repair command invalidates cached offer list pages (valid)
+    def test_rebuild_offer_min_fields_refreshes_list_cache(self):
+        def listed_min_price():
+            response = self.client.get(reverse("offers-list"))
+            return next(o["min_price"] for o in response.data["results"] if o["id"] == self.offer.pk)
+
+        self.assertEqual(listed_min_price(), "50.00")  # fill list cache
+        Offer.objects.filter(pk=self.offer.pk).update(min_price=999)
+        self.assertEqual(listed_min_price(), "50.00")  # served from cache
+
+        call_command("rebuild_offer_min_fields", stdout=StringIO())
+
+        self.assertEqual(listed_min_price(), "50.00")
+        self.assertEqual(offer_cache.stats()["misses"], 2)
+
+
+    """ TESTS SEARCH """
+    """ ------------ """
+    def create_offer(self, title, description="Desc", price=50):
+        offer = Offer.objects.create(user=self.business_user, title=title, description=description)
+        OfferDetail.objects.create(
+            offer=offer, title="Basic", offer_type="basic", price=price, delivery_time_in_days=5
+        )
+        return offer
+
+
+    # search matches words and prefixes in title and description (valid)
+    def test_search_offers_full_text(self):
+        self.create_offer("Website Development", description="Django and React")
+        url = reverse("offers-list")
+
+        response = self.client.get(url, {"search": "logo"}, format="json")
+        self.assertEqual([o["title"] for o in response.data["results"]], ["Logo Design"])
+
+        response = self.client.get(url, {"search": "reac djang"}, format="json")
+        self.assertEqual([o["title"] for o in response.data["results"]], ["Website Development"])
+
+        response = self.client.get(url, {"search": "logo react"}, format="json")
+        self.assertEqual(len(response.data["results"]), 0)
+
+
+    # search ranks better matches first (valid)
+    def test_search_offers_ranked(self):
+        self.create_offer("Photo editing", description="Retouch")
+        self.create_offer("Photo photo editing", description="Photo retouch and photo color grading")
+        url = reverse("offers-list")
+        response = self.client.get(url, {"search": "photo"}, format="json")
+
+        self.assertEqual(
+            [o["title"] for o in response.data["results"]],
+            ["Photo photo editing", "Photo editing"]
+        )
+
+
+    # search composes with filters and ordering (valid)
+    def test_search_offers_with_filter_and_ordering(self):
+        self.create_offer("Logo Animation", price=80)
+        self.create_offer("Logo Redesign", price=20)
+        url = reverse("offers-list")
+
+        response = self.client.get(url, {"search": "logo", "min_price": 40, "ordering": "-min_price"}, format="json")
+        self.assertEqual(
+            [o["title"] for o in response.data["results"]],
+            ["Logo Animation", "Logo Design"]
+        )
+
+
+    # search index follows offer updates and deletes (valid)
+    def test_search_index_kept_in_sync(self):
+        url = reverse("offers-list")
+        self.offer.title = "Brand Identity"
+        self.offer.save()
+
+        response = self.client.get(url, {"search": "logo"}, format="json")
+        self.assertEqual(len(response.data["results"]), 0)
+        response = self.client.get(url, {"search": "brand"}, format="json")
+        self.assertEqual(len(response.data["results"]), 1)
+
+        self.offer.delete()
+        response = self.client.get(url, {"search": "brand"}, format="json")
+        self.assertEqual(len(response.data["results"]), 0)
+
+
+    """ TESTS CURSOR PAGINATION """
+    """ ----------------------- """
+    # walk all pages forward and back by min_price with ties (valid)
+    def test_offer_list_cursor_pagination_by_min_price(self):
+        for index, price in enumerate([30, 30, 30, 70, 10]):
+            self.create_offer(f"Offer {index}", price=price)
+        Offer.objects.create(user=self.business_user, title="Draft", description="No details yet")
+        expected = list(
+            Offer.objects.order_by("min_price", "id").values_list("id", flat=True)
+        )
+        url = reverse("offers-list")
+
+        seen, pages = [], []
+        response = self.client.get(url, {"pagination": "cursor", "ordering": "min_price", "page_size": 2})
+        self.assertNotIn("count", response.data)
+        self.assertIsNone(response.data["previous"])
+        while True:
+            pages.append(response.data)
+            seen += [offer["id"] for offer in response.data["results"]]
+            if not response.data["next"]:
+                break
+            response = self.client.get(response.data["next"])
+        self.assertEqual(seen, expected)
+
+        response = self.client.get(pages[-1]["previous"])
+        self.assertEqual(response.data["results"], pages[-2]["results"])
+
+
+    # cursor pagination by -updated_at with optional count (valid)
+    def test_offer_list_cursor_pagination_by_updated_at(self):
+        for index in range(4):
+            self.create_offer(f"Offer {index}")
+        url = reverse("offers-list")
+
+        response = self.client.get(url, {"pagination": "cursor", "page_size": 3, "with_count": "true"})
+        self.assertEqual(response.data["count"], 5)
+        self.assertEqual(
+            [offer["title"] for offer in response.data["results"]],
+            ["Offer 3", "Offer 2", "Offer 1"]
+        )
+
+        response = self.client.get(response.data["next"])
+        self.assertEqual([offer["title"] for offer in response.data["results"]], ["Offer 0", "Logo Design"])
+        self.assertIsNone(response.data["next"])
+
+
+    # invalid cursor (invalid)
+    def test_offer_list_invalid_cursor(self):
+        url = reverse("offers-list")
+        response = self.client.get(url, {"cursor": "not-a-cursor"})
+
+        self.assertEqual(response.status_code, status.HTTP_404_NOT_FOUND)
+
+
+
+    """ TESTS LIST CACHE """
+    """ ---------------- """
+    # second identical request is served from cache without queries (valid)
+    def test_offer_list_cached(self):
+        url = reverse("offers-list")
+        first = self.client.get(url, {"ordering": "min_price", "page_size": 5})
+
+        with self.assertNumQueries(0):
+            second = self.client.get(url, {"page_size": 5, "ordering": "min_price", "search": ""})
+        self.assertEqual(second.data, first.data)
+
+        self.client.get(url, {"page_size": 4})  # different query string
+        self.assertEqual(offer_cache.stats()["misses"], 2)
+
+
+    # any offer / offer detail write invalidates the cache (valid)
+    def test_offer_list_cache_invalidated_on_write(self):
+        url = reverse("offers-list")
+        self.client.get(url)
+
+        detail = self.offer.details.get(offer_type="basic")
+        detail.price = 5
+        detail.save()
+        response = self.client.get(url)
+        self.assertEqual(response.data["results"][0]["min_price"], "5.00")
+
+        self.offer.delete()
+        response = self.client.get(url)
+        self.assertEqual(response.data["results"], [])
+
+
+    # cache counters only for admins (valid / invalid)
+    def test_offer_cache_stats(self):
+        url = reverse("offers-list")
+        self.client.get(url)
+        self.client.get(url)
+
+        admin = User.objects.create_superuser(username="admin", password="pass123")
+        self.client.force_authenticate(admin)
+        response = self.client.get(reverse("offers-cache-stats"))
+        self.assertEqual(response.status_code, status.HTTP_200_OK)
+        self.assertEqual((response.data["hits"], response.data["misses"]), (1, 1))
+
+        self.client.force_authenticate(self.customer_user)
+        response = self.client.get(reverse("offers-cache-stats"))
+        self.assertEqual(response.status_code, status.HTTP_403_FORBIDDEN)
+
+
+
+    """ TESTS QUERY BUDGET """
+    """ ------------------ """
+    # offer list query count does not grow with page size (valid)
+    def test_offer_list_constant_queries(self):
+        url = reverse("offers-list")
+
+        def grow():
+            for index in range(5):
+                self.create_offer(f"Offer {index}")
+            cache.clear()
+
+        self.assertConstantQueries(lambda: self.client.get(url, {"page_size": 100}), grow)
+        with self.assertQueryBudget(3):  # count, page, details
+            cache.clear()
+            self.client.get(url, {"page_size": 100})
+
+
+    # offer detail runs a fixed number of queries (valid)
+    def test_offer_detail_query_budget(self):
+        self.client.force_authenticate(self.customer_user)
+        with self.assertQueryBudget(3):  # validators, offer + user, details
+            response = self.client.get(reverse("offer-detail", args=[self.offer.pk]))
+        self.assertEqual(len(response.data["details"]), 3)
+        self.assertEqual(response.data["user_details"]["username"], "biz")
+
+
+
+    # middleware logs requests over their view's budget (valid)
+    @override_settings(QUERY_BUDGET_LOGGING=True)
+    def test_query_budget_middleware_logs(self):
+        client = APIClient()
+        with mock.patch.object(OffersListCreateView, "query_budget", 1):
+            with self.assertLogs("core.query_budget", level="WARNING") as logs:
+                client.get(reverse("offers-list"))
+        self.assertIn("GET /api/offers/ ran 3 queries (budget 1)", logs.output[0])
+
+
+    """ TESTS BULK WRITES """
+    """ ----------------- """
+    def offer_payload(self, title, base_price=10):
+        return {
+            "title": title,
+            "description": "Desc",
+            "details": [
+                {"title": "Basic", "offer_type": "basic", "price": base_price, "delivery_time_in_days": 7, "revisions": 1},
+                {"title": "Standard", "offer_type": "standard", "price": base_price * 2, "delivery_time_in_days": 5, "revisions": 2},
+                {"title": "Premium", "offer_type": "premium", "price": base_price * 3, "delivery_time_in_days": 3, "revisions": 3},
+            ]
+        }
+
+
+    # CREATE writes details with one bulk insert (valid)
+    def test_create_offer_bulk_inserts_details(self):
+        self.client.force_authenticate(self.business_user)
+        get_profile_type(self.business_user.pk)  # cached after the first write request
+        # savepoint, offer, offer facets, platform stats, details, offer_type facets, release, response details
+        with self.assertQueryBudget(8):
+            response = self.client.post(reverse("offers-list"), self.offer_payload("Bulk"), format="json")
+
+        self.assertEqual(response.status_code, status.HTTP_201_CREATED)
+        self.assertEqual(response.data["min_price"], "10.00")
+        self.assertEqual(response.data["min_delivery_time"], 3)
+
+
+    # PATCH three tiers with one read and one bulk update (valid)
+    def test_patch_offer_details_bulk_update(self):
+        self.client.force_authenticate(self.business_user)
+        url = reverse("offer-detail", args=[self.offer.pk])
+        payload = {
+            "details": [
+                {"offer_type": "basic", "price": 40},
+                {"offer_type": "standard", "price": 90},
+                {"offer_type": "premium", "price": 150, "delivery_time_in_days": 2},
+            ]
+        }
+        # offer, savepoint, details, bulk update, offer update, facets, release, response details
+        with self.assertQueryBudget(8):
+            response = self.client.patch(url, payload, format="json")
+
+        self.assertEqual(response.status_code, status.HTTP_200_OK)
+        self.assertEqual(
+            sorted(detail["price"] for detail in response.data["details"]),
+            ["150.00", "40.00", "90.00"]
+        )
+        self.assertEqual(response.data["min_delivery_time"], 2)
+
+
+    # PATCH with unknown tier leaves nothing half-applied (invalid)
+    def test_patch_offer_details_atomic(self):
+        self.offer.details.get(offer_type="premium").delete()
+        self.client.force_authenticate(self.business_user)
+        url = reverse("offer-detail", args=[self.offer.pk])
+        payload = {
+            "title": "Changed",
+            "details": [
+                {"offer_type": "basic", "price": 1},
+                {"offer_type": "premium", "price": 2},
+            ]
+        }
+        response = self.client.patch(url, payload, format="json")
+
+        self.assertEqual(response.status_code, status.HTTP_400_BAD_REQUEST)
+        self.offer.refresh_from_db()
+        self.assertEqual(self.offer.title, "Logo Design")
+        self.assertEqual(self.offer.details.get(offer_type="basic").price, 50)
+
+
+    # bulk create endpoint (valid)
+    def test_bulk_create_offers(self):
+        self.authenticate_user("business")
+        self.client.get(reverse("offers-list"))  # fill list cache
+        payload = [self.offer_payload(f"Bulk {index}", base_price=10 + index) for index in range(3)]
+        response = self.client.post(reverse("offers-bulk-create"), payload, format="json")
+
+        self.assertEqual(response.status_code, status.HTTP_201_CREATED)
+        self.assertEqual(response.data["count"], 3)
+        offers = Offer.objects.filter(pk__in=response.data["ids"]).order_by("id")
+        self.assertEqual([offer.min_price for offer in offers], [10, 11, 12])
+        self.assertEqual(OfferDetail.objects.filter(offer__in=offers).count(), 9)
+
+        response = self.client.get(reverse("offers-list"))
+        self.assertEqual(response.data["count"], 4)  # cache invalidated
+
+
+    # bulk create is all-or-nothing (invalid)
+    def test_bulk_create_offers_invalid_item(self):
+        self.authenticate_user("business")
+        invalid = self.offer_payload("Broken")
+        invalid["details"] = invalid["details"][:2]
+        response = self.client.post(reverse("offers-bulk-create"), [self.offer_payload("Fine"), invalid], format="json")
+
+        self.assertEqual(response.status_code, status.HTTP_400_BAD_REQUEST)
+        self.assertEqual(response.data[0], {})
+        self.assertIn("details", response.data[1])
+        self.assertEqual(Offer.objects.count(), 1)
+
+
+    # bulk create as customer (invalid)
+    def test_bulk_create_offers_as_customer_forbidden(self):
+        self.authenticate_user("customer")
+        response = self.client.post(reverse("offers-bulk-create"), [self.offer_payload("X")], format="json")
+
+        self.assertEqual(response.status_code, status.HTTP_403_FORBIDDEN)
+
+
+    # import command (valid)
+    def test_import_offers_command(self):
+        with tempfile.NamedTemporaryFile("w", suffix=".json", delete=False) as file:
+            json.dump([self.offer_payload(f"Imported {index}") for index in range(4)], file)
+        self.addCleanup(os.remove, file.name)
+
+        call_command("import_offers", "biz", file.name, stdout=StringIO())
+
+        self.assertEqual(Offer.objects.filter(title__startswith="Imported").count(), 4)
+
+
+
+    """ TESTS IMAGE DERIVATIVES """
+    """ ----------------------- """
+    def use_temp_media(self):
+        media_root = tempfile.mkdtemp()
+        self.addCleanup(shutil.rmtree, media_root, ignore_errors=True)
+        settings_override = override_settings(MEDIA_ROOT=media_root, IMAGE_PIPELINE_EAGER=True)
+        settings_override.enable()
+        self.addCleanup(settings_override.disable)
+        return media_root
+
+
+    def make_logo(self, size=(1200, 600)):
+        buffer = BytesIO()
+        Image.new("RGBA", size, (0, 128, 255, 128)).save(buffer, format="PNG")
+        return SimpleUploadedFile("logo.png", buffer.getvalue(), content_type="image/png")
+
+
+    def upload_logo(self, size=(1200, 600), execute=True):
+        self.offer.image = self.make_logo(size)
+        with self.captureOnCommitCallbacks(execute=execute):
+            self.offer.save()
+        self.offer.refresh_from_db()
+
+
+    # offer list exposes logo derivative URLs once generated (valid)
+    def test_offer_list_image_variants(self):
+        self.use_temp_media()
+        self.upload_logo()
+
+        response = self.client.get(reverse("offers-list"))
+        variants = response.data["results"][0]["image_variants"]
+        self.assertRegex(
+            variants["640"]["webp"],
+            rf"^http://testserver/media/offers/offer_{self.business_user.id}/logo_{self.offer.pk}_[0-9a-f]{{16}}_640\.webp$"
+        )
+        self.assertEqual(sorted(variants["160"]), ["jpg", "webp"])
+
+
+    # re-upload under the same name replaces the derivatives and removes the old files (valid)
+    def test_offer_logo_reupload_replaces_variants(self):
+        media_root = self.use_temp_media()
+        self.upload_logo()
+        old_variants = self.offer.image_variants
+
+        self.upload_logo(size=(800, 800))
+        self.assertEqual(self.offer.image.name, f"offers/offer_{self.business_user.id}/logo.png")
+        new_variants = self.offer.image_variants
+        self.assertNotEqual(new_variants["160"]["webp"], old_variants["160"]["webp"])
+        with self.offer.image.storage.open(new_variants["160"]["webp"]) as derivative:
+            self.assertEqual(Image.open(derivative).size, (160, 160))
+        self.assertEqual(
+            sorted(os.listdir(os.path.join(media_root, f"offers/offer_{self.business_user.id}"))),
+            sorted(["logo.png"] + [os.path.basename(name) for names in new_variants.values() for name in names.values()])
+        )
+
+
+    # derivatives of a logo replaced while they were rendered are discarded (invalid)
+    def test_offer_logo_replaced_during_rendering(self):
+        media_root = self.use_temp_media()
+        self.upload_logo(execute=False)
+        generate_derivatives = signals.generate_derivatives
+
+        def replace_logo_meanwhile(*args, **kwargs):
+            variants = generate_derivatives(*args, **kwargs)
+            self.upload_logo(size=(800, 800), execute=False)
+            return variants
+
+        with mock.patch.object(signals, "generate_derivatives", replace_logo_meanwhile):
+            signals.build_offer_image_variants(self.offer.pk)
+
+        self.offer.refresh_from_db()
+        self.assertEqual(self.offer.image_variants, {})
+        self.assertEqual(os.listdir(os.path.join(media_root, f"offers/offer_{self.business_user.id}")), ["logo.png"])
+
+
+
+    """ TESTS CONDITIONAL GET """
+    """ -------------------- """
+    # offer detail answers 304 until the offer or one of its details changes (valid)
+    def test_offer_detail_conditional_get(self):
+        self.client.force_authenticate(self.customer_user)
+        url = reverse("offer-detail", args=[self.offer.pk])
+        response = self.client.get(url)
+        etag = response["ETag"]
+        self.assertIn("Last-Modified", response)
+
+        with self.assertQueryBudget(1):  # validators only
+            response = self.client.get(url, HTTP_IF_NONE_MATCH=etag)
+        self.assertEqual(response.status_code, status.HTTP_304_NOT_MODIFIED)
+        self.assertEqual(response["ETag"], etag)
+
+        detail = self.offer.details.get(offer_type="basic")
+        detail.price = 10
+        detail.save()
+        response = self.client.get(url, HTTP_IF_NONE_MATCH=etag)
+        self.assertEqual(response.status_code, status.HTTP_200_OK)
+        self.assertEqual(response.data["min_price"], "10.00")
+        self.assertNotEqual(response["ETag"], etag)
+
+
+    # offer details detail is validated by a content hash (valid)
+    def test_offerdetails_conditional_get(self):
+        self.client.force_authenticate(self.customer_user)
+        detail = self.offer.details.get(offer_type="basic")
+        url = reverse("offerdetails-detail", args=[detail.pk])
+        etag = self.client.get(url)["ETag"]
+
+        response = self.client.get(url, HTTP_IF_NONE_MATCH=etag)
+        self.assertEqual(response.status_code, status.HTTP_304_NOT_MODIFIED)
+
+        OfferDetail.objects.filter(pk=detail.pk).update(features=["Logo"])
+        response = self.client.get(url, HTTP_IF_NONE_MATCH=etag)
+        self.assertEqual(response.status_code, status.HTTP_200_OK)
+        self.assertEqual(response.data["features"], ["Logo"])
+
+
+    # offer list revalidates against the cache generation without queries (valid)
+    def test_offer_list_conditional_get(self):
+        url = reverse("offers-list")
+        etag = self.client.get(url)["ETag"]
+
+        with self.assertNumQueries(0):
+            response = self.client.get(url, HTTP_IF_NONE_MATCH=etag)
+        self.assertEqual(response.status_code, status.HTTP_304_NOT_MODIFIED)
+        self.assertNotEqual(self.client.get(url, {"page_size": 1})["ETag"], etag)
+
+        self.create_offer("Another offer")
+        response = self.client.get(url, HTTP_IF_NONE_MATCH=etag)
+        self.assertEqual(response.status_code, status.HTTP_200_OK)
+        self.assertEqual(response.data["count"], 2)
+
+
+    # renaming a creator changes the offer list ETag; other user edits do not (valid)
+    def test_offer_list_etag_follows_user_details(self):
+        url = reverse("offers-list")
+        etag = self.client.get(url)["ETag"]
+
+        self.business_user.email = "biz@example.com"
+        self.business_user.save()
+        self.assertEqual(self.client.get(url, HTTP_IF_NONE_MATCH=etag).status_code, status.HTTP_304_NOT_MODIFIED)
+
+        self.business_user.first_name = "Renamed"
+        self.business_user.save()
+        response = self.client.get(url, HTTP_IF_NONE_MATCH=etag)
+        self.assertEqual(response.status_code, status.HTTP_200_OK)
+        self.assertEqual(response.data["results"][0]["user_details"]["first_name"], "Renamed")
+
+
+    # unknown offer is still a 404 without ETag (invalid)
+    def test_offer_detail_conditional_get_not_found(self):
+        self.client.force_authenticate(self.customer_user)
+        response = self.client.get(reverse("offer-detail", args=[9999]), HTTP_IF_NONE_MATCH="*")
+        self.assertEqual(response.status_code, status.HTTP_404_NOT_FOUND)
+        self.assertNotIn("ETag", response)
+
+
+
+    """ TESTS FACETS """
+    """ ------------ """
+    def assertFacetsConsistent(self):
+        recount = facets.serialize(facets.filtered_counts(Offer.objects.all()))
+        self.assertEqual(facets.serialize(facets.stored_counts()), recount)
+        return recount
+
+
+    # unfiltered facets are read from the summary table (valid)
+    def test_offer_facets_unfiltered(self):
+        with self.assertQueryBudget(1):
+            response = self.client.get(reverse("offers-facets"))
+
+        self.assertEqual(response.status_code, status.HTTP_200_OK)
+        self.assertEqual(response.data["count"], 1)
+        self.assertEqual(response.data["min_price"][1], {"from": 50, "to": 100, "count": 1})
+        self.assertEqual(response.data["min_delivery_time"][0], {"from": 1, "to": 3, "count": 1})
+        self.assertEqual(response.data["offer_type"], {"basic": 1, "standard": 1, "premium": 1})
+        self.assertEqual(response.data, self.assertFacetsConsistent())
+
+
+    # summary table follows creates, updates and deletes on every write path (valid)
+    def test_offer_facets_maintained_incrementally(self):
+        self.authenticate_user("business")
+        self.client.post(reverse("offers-list"), self.offer_payload("Single", base_price=300), format="json")
+        self.client.post(reverse("offers-bulk-create"), [self.offer_payload("Bulk", base_price=5)], format="json")
+        self.client.patch(
+            reverse("offer-detail", args=[self.offer.pk]),
+            {"details": [{"offer_type": "basic", "price": 20, "delivery_time_in_days": 10}]},
+            format="json",
+        )
+        self.offer.details.get(offer_type="premium").delete()
+        data = self.assertFacetsConsistent()
+        self.assertEqual(data["count"], 3)
+        self.assertEqual(data["offer_type"], {"basic": 3, "standard": 3, "premium": 2})
+
+        self.create_offer("No details").details.all().delete()
+        Offer.objects.filter(title="Single").delete()
+        self.business_user.delete()
+        data = self.assertFacetsConsistent()
+        self.assertEqual(data["count"], 0)
+        self.assertEqual(data["offer_type"], {"basic": 0, "standard": 0, "premium": 0})
+
+
+    # filtered facets respect the offer list filters and search (valid)
+    def test_offer_facets_filtered(self):
+        self.create_offer("Website Development", price=400)
+        url = reverse("offers-facets")
+
+        response = self.client.get(url, {"min_price": 100})
+        self.assertEqual(response.data["count"], 1)
+        self.assertEqual(response.data["min_price"][3]["count"], 1)
+        self.assertEqual(response.data["offer_type"], {"basic": 1, "standard": 0, "premium": 0})
+
+        response = self.client.get(url, {"search": "logo"})
+        self.assertEqual(response.data["count"], 1)
+        self.assertEqual(response.data["offer_type"]["premium"], 1)
+
+        response = self.client.get(url, {"min_price": "abc"})
+        self.assertEqual(response.status_code, status.HTTP_400_BAD_REQUEST)
+
+
+    # rebuild command repairs drift from writes that bypass signals (valid)
+    def test_rebuild_offer_facets_command(self):
+        Offer.objects.filter(pk=self.offer.pk).update(min_price=999)
+        call_command("rebuild_offer_facets", stdout=StringIO())
+        data = self.assertFacetsConsistent()
+        self.assertEqual(data["min_price"][4]["count"], 1)
+
+
+
+    """ TESTS DETAIL HYPERLINKS """
+    """ ----------------------- """
+    # templated detail links equal reverse() + build_absolute_uri() (valid)
+    def test_offer_detail_urls_match_reverse(self):
+        self.create_offer("Second offer")
+        response = self.client.get(reverse("offers-list"), {"page_size": 100})
+
+        for offer in response.data["results"]:
+            for detail in offer["details"]:
+                expected = "http://testserver" + reverse("offerdetails-detail", args=[detail["id"]])
+                self.assertEqual(detail["url"], expected)
+
+
+    # benchmark command checks both outputs are identical (valid)
+    def test_bench_offer_detail_urls_command(self):
+        out = StringIO()
+        call_command("bench_offer_detail_urls", details=6, repeat=2, stdout=out)
+        self.assertIn("6 detail links per page", out.getvalue())
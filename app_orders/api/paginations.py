@@ -0,0 +1,11 @@
+from core.pagination import KeysetPagination
+
+
+class OrderCursorPagination(KeysetPagination):
+    """
+    Cursor pagination for the order list, newest first, keyed on `(created_at, id)`.
+    """
+    page_size = 20
+    max_page_size = 100
+    ordering_fields = ['created_at']
+    default_ordering = '-created_at'
@@ -1,15 +1,14 @@
 from rest_framework import permissions
 
-class IsAssignedBusinessOrAdmin(permissions.BasePermission):
+from app_auth.cache import profile_type_of
+from core.updates import IsAnnotatedOwnerOrAdmin
+
+class IsAssignedBusinessOrAdmin(IsAnnotatedOwnerOrAdmin):
     """
     Object-level permission to only allow owners of an order object to edit it.
+    The view annotates `is_owner` (business user is the current user) onto its queryset.
     """
-
-    def has_object_permission(self, request, view, obj):
-        is_owner = obj.offer_detail.offer.user == request.user
-        is_admin = request.user.is_staff or request.user.is_superuser
-        return is_owner or is_admin
     
 class IsCustomerUser(permissions.BasePermission):
     def has_permission(self, request, view):
-        return request.user.profile.type == "customer"
\ No newline at end of file
+        return profile_type_of(request.user) == "customer"
\ No newline at end of file
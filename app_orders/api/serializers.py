@@ -5,22 +5,11 @@ from app_offers.models import OfferDetail
 class OrdersListCreateSerializer(serializers.ModelSerializer):
     """
     Serializer for listing and creating orders.
-    Includes nested fields from related OfferDetail and Offer.
+    The offer detail terms and business user are read from the order row,
+    where they were copied when the order was placed.
     """
-
-    # Fields OfferDetail
-    title = serializers.CharField(source='offer_detail.title', read_only=True)
-    revisions = serializers.IntegerField(source='offer_detail.revisions', read_only=True)
-    delivery_time_in_days = serializers.IntegerField(source='offer_detail.delivery_time_in_days', read_only=True)
-    price = serializers.DecimalField(source='offer_detail.price', max_digits=10, decimal_places=2, read_only=True)
-    features = serializers.JSONField(source='offer_detail.features', read_only=True)
-    offer_type = serializers.CharField(source='offer_detail.offer_type', read_only=True)
-    
-    # Fields Offer
-    business_user = serializers.PrimaryKeyRelatedField(source='offer_detail.offer.user', read_only=True)
-
     offer_detail_id = serializers.PrimaryKeyRelatedField(
-        queryset = OfferDetail.objects.all(),
+        queryset = OfferDetail.objects.select_related('offer'),
         source='offer_detail',
         write_only=True
     )
@@ -44,6 +33,13 @@ class OrdersListCreateSerializer(serializers.ModelSerializer):
         ]
         read_only_fields = [
             'customer_user',
+            'business_user',
+            'title',
+            'revisions',
+            'delivery_time_in_days',
+            'price',
+            'features',
+            'offer_type',
             'status',
             'created_at',
             'updated_at'
@@ -70,3 +66,48 @@ class OrderDetailSerializer(serializers.ModelSerializer):
     class Meta:
         model = Order
         fields = ['status']
+
+
+MAX_BATCH_ORDER_COUNTS = 500
+
+
+class OrderCountBatchQuerySerializer(serializers.Serializer):
+    """
+    Query parameters of the batch order count endpoint.
+    `business_user_ids` is a comma-separated list, duplicates are dropped.
+    """
+    business_user_ids = serializers.CharField(
+        help_text=f"Comma-separated business user ids (at most {MAX_BATCH_ORDER_COUNTS})."
+    )
+
+    def validate_business_user_ids(self, value):
+        try:
+            ids = [int(part) for part in value.split(',') if part.strip()]
+        except ValueError:
+            raise serializers.ValidationError("Ids must be integers separated by commas.")
+        ids = list(dict.fromkeys(ids))
+        if not ids:
+            raise serializers.ValidationError("At least one id is required.")
+        if len(ids) > MAX_BATCH_ORDER_COUNTS:
+            raise serializers.ValidationError(f"At most {MAX_BATCH_ORDER_COUNTS} ids per request.")
+        return ids
+
+
+MAX_BULK_STATUS_ORDERS = 500
+
+
+class OrderBulkStatusSerializer(serializers.Serializer):
+    """
+    Request body of the bulk status endpoint: the orders to move and their new status.
+    Duplicate ids are dropped, the order of the first occurrence is kept.
+    """
+    ids = serializers.ListField(
+        child=serializers.IntegerField(min_value=1),
+        allow_empty=False,
+        max_length=MAX_BULK_STATUS_ORDERS,
+        help_text=f"Order ids (at most {MAX_BULK_STATUS_ORDERS})."
+    )
+    status = serializers.ChoiceField(choices=['completed', 'cancelled'])
+
+    def validate_ids(self, value):
+        return list(dict.fromkeys(value))
@@ -1,7 +1,9 @@
 from django.urls import path
-from .views import OrdersListCreateView, OrderDetailView
+from .views import OrdersListCreateView, OrderDetailView, OrderBulkStatusView, OrderExportView
 
 urlpatterns = [
     path('', OrdersListCreateView.as_view(), name="orders-list"),
+    path('export/', OrderExportView.as_view(), name="orders-export"),
+    path('bulk-status/', OrderBulkStatusView.as_view(), name="orders-bulk-status"),
     path('<int:pk>/', OrderDetailView.as_view(), name="order-detail"),
-]
\ No newline at end of file
+]
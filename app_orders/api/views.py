@@ -2,16 +2,31 @@ from rest_framework import generics, status
 from rest_framework.views import APIView
 from rest_framework.response import Response
 from rest_framework.permissions import IsAuthenticated, SAFE_METHODS
-from django.shortcuts import get_object_or_404
 
 from drf_spectacular.utils import extend_schema, OpenApiResponse
 
-from app_orders.models import Order
-from app_auth.models import UserProfile
-from .serializers import OrdersListCreateSerializer, OrderDetailSerializer
+from django.db import transaction
+from django.db.models import Q
+from django.utils import timezone
+
+from app_orders.models import BusinessOrderCount, Order
+from app_orders.signals import order_statuses_bulk_updated
+from core.exports import ExportView
+from core.updates import OwnerAnnotationMixin, UpdateResponseMixin
+from .paginations import OrderCursorPagination
+from .serializers import (
+    OrdersListCreateSerializer, OrderDetailSerializer, OrderCountBatchQuerySerializer, OrderBulkStatusSerializer
+)
 from .permissions import IsAssignedBusinessOrAdmin, IsCustomerUser
 
 
+def orders_of(user):
+    """Orders the user takes part in (as customer or business user); all of them for superusers."""
+    if user.is_superuser:
+        return Order.objects.all()
+    return Order.objects.filter(Q(customer_user=user) | Q(business_user=user))
+
+
 @extend_schema(
     description="List all orders for the authenticated user or create a new order.",
     responses=OrdersListCreateSerializer
@@ -20,24 +35,23 @@ class OrdersListCreateView(generics.ListCreateAPIView):
     """
     List orders for the current user (customer or business) or create a new order.
     Superusers can see all orders.
+    The list is cursor-paginated, newest first.
     """
     serializer_class = OrdersListCreateSerializer
+    pagination_class = OrderCursorPagination
+    query_budget = 3
 
     def get_queryset(self):
         """
-        Return queryset based on user type:
-        - Customers: only their own orders
+        Return the orders the user takes part in:
+        - Customers: their own orders
         - Business users: orders for their offers
         - Superusers: all orders
+        Customers cannot own offers and businesses cannot order, so one OR
+        condition covers both without loading the profile; each branch is an
+        index lookup on the order table, which holds everything the serializer reads.
         """
-        user = self.request.user
-        if not user.is_superuser:
-            if user.profile.type == 'customer':
-                return Order.objects.filter(customer_user=self.request.user)
-            else:
-                return Order.objects.filter(offer_detail__offer__user=user)
-        else:
-            return Order.objects.all()
+        return orders_of(self.request.user)
 
     def get_permissions(self):
         """
@@ -55,24 +69,92 @@ class OrdersListCreateView(generics.ListCreateAPIView):
     description="Retrieve, update, or delete a specific order.",
     responses=OrderDetailSerializer
 )
-class OrderDetailView(generics.RetrieveUpdateDestroyAPIView):
+class OrderDetailView(OwnerAnnotationMixin, UpdateResponseMixin, generics.RetrieveUpdateDestroyAPIView):
     """
     Retrieve, update, or delete a specific order.
-    Only assigned business or admin users can modify orders.
+    Only assigned business or admin users can modify orders; ownership is
+    resolved in the SELECT of the order, and updates answer with the saved
+    order serialized by OrdersListCreateSerializer.
     """
     queryset = Order.objects.all()
     serializer_class = OrderDetailSerializer
+    response_serializer_class = OrdersListCreateSerializer
+    owner_lookup = 'business_user'
     http_method_names = ['put', 'patch', 'delete']
     permission_classes = [IsAuthenticated, IsAssignedBusinessOrAdmin]
 
-    def update(self, request, *args, **kwargs):
+
+@extend_schema(
+    description="Stream the authenticated user's full order history as NDJSON (default) or CSV (`?output=csv`).",
+    responses={
+        200: OpenApiResponse(description="One record per order, oldest first, with the fields of the order list."),
+        400: OpenApiResponse(description="Unknown output format.")
+    }
+)
+class OrderExportView(ExportView):
+    """
+    Export every order of the current user (see OrdersListCreateView) with the
+    fields of OrdersListCreateSerializer, streamed in chunks.
+    """
+    serializer_class = OrdersListCreateSerializer
+    export_name = 'orders'
+
+    def get_queryset(self):
+        return orders_of(self.request.user).order_by('created_at', 'id')
+
+
+@extend_schema(
+    description="Move many orders to `completed` or `cancelled` at once.",
+    request=OrderBulkStatusSerializer,
+    responses={
+        200: OpenApiResponse(description="One entry per requested id, in request order. Missing orders and orders of other businesses carry a `detail` message."),
+        400: OpenApiResponse(description="Missing or malformed ids or status, or too many ids.")
+    }
+)
+class OrderBulkStatusView(APIView):
+    """
+    Change the status of up to MAX_BULK_STATUS_ORDERS orders with one UPDATE.
+    Same rules as OrderDetailView: the assigned business user or an admin may
+    change an order; other ids are reported per entry instead of failing the
+    request. The counters are adjusted through order_statuses_bulk_updated,
+    as the queryset update does not send post_save.
+    """
+    permission_classes = [IsAuthenticated]
+    query_budget = 4
+
+    def post(self, request):
         """
-        Update the order and return serialized data using OrdersListCreateSerializer.
+        POST: `{"ids": [1, 2, 3], "status": "completed"}`
         """
-        super().update(request, *args, **kwargs)
-        instance = self.get_object()
-        return Response(OrdersListCreateSerializer(instance).data)
-    
+        serializer = OrderBulkStatusSerializer(data=request.data)
+        serializer.is_valid(raise_exception=True)
+        ids = serializer.validated_data['ids']
+        new_status = serializer.validated_data['status']
+        user = request.user
+        is_admin = user.is_staff or user.is_superuser
+
+        with transaction.atomic():
+            rows = Order.objects.select_for_update().filter(pk__in=ids).values_list('pk', 'business_user_id', 'status')
+            orders = {pk: (business_user_id, status) for pk, business_user_id, status in rows}
+            allowed = {pk for pk, (business_user_id, _) in orders.items() if is_admin or business_user_id == user.id}
+            changed = {pk: orders[pk] for pk in allowed if orders[pk][1] != new_status}
+            if changed:
+                Order.objects.filter(pk__in=changed).update(status=new_status, updated_at=timezone.now())
+                order_statuses_bulk_updated.send(
+                    sender=Order,
+                    changes=[(business_user_id, previous, new_status) for business_user_id, previous in changed.values()],
+                )
+
+        results = []
+        for pk in ids:
+            if pk not in orders:
+                results.append({"id": pk, "detail": "Order not found"})
+            elif pk not in allowed:
+                results.append({"id": pk, "detail": "You do not have permission to change this order"})
+            else:
+                results.append({"id": pk, "status": new_status, "updated": pk in changed})
+        return Response({"results": results})
+
 
 @extend_schema(
     description="Return the number of orders for a given business user. Supports 'completed' or 'in_progress' filter.",
@@ -84,26 +166,65 @@ class OrderDetailView(generics.RetrieveUpdateDestroyAPIView):
 class OrderCountView(APIView):
     """
     Return the count of orders for a business user, filtered by status.
+    Read from the BusinessOrderCount counters with one primary-key lookup;
+    only business users have a counters row.
     """
     permission_classes = [IsAuthenticated]
+    query_budget = 2
 
     def get(self, request, business_user_id):
         """
         GET: Return order count for the specified business user.
         """
-        profile = get_object_or_404(UserProfile, user_id=business_user_id)
-
-        if profile.type != 'business':
-            return Response({"detail": "Business user not found"}, status=status.HTTP_404_NOT_FOUND)
-        
         status_filter = 'completed' if 'completed' in request.path else 'in_progress'
 
-        count = Order.objects.filter(
-            offer_detail__offer__user_id=business_user_id,
-            status=status_filter
-        ).count()
+        count = BusinessOrderCount.objects.filter(pk=business_user_id).values_list(status_filter, flat=True).first()
+        if count is None:
+            return Response({"detail": "Business user not found"}, status=status.HTTP_404_NOT_FOUND)
 
         if status_filter == 'completed':
             return Response({"completed_order_count": count})
         else:
             return Response({"order_count": count})
+
+
+@extend_schema(
+    description="Return in-progress and completed order counts for many business users at once.",
+    parameters=[OrderCountBatchQuerySerializer],
+    responses={
+        200: OpenApiResponse(description="One entry per requested id, in request order. Unknown or non-business ids carry a `detail` message."),
+        400: OpenApiResponse(description="Missing, malformed or too many ids.")
+    }
+)
+class OrderCountBatchView(APIView):
+    """
+    Return order counts for up to MAX_BATCH_ORDER_COUNTS business users with
+    one query on the BusinessOrderCount counters; ids that are not business
+    users are reported per entry instead of failing the request.
+    """
+    permission_classes = [IsAuthenticated]
+    query_budget = 2
+
+    def get(self, request):
+        """
+        GET: `?business_user_ids=1,2,3`
+        """
+        query = OrderCountBatchQuerySerializer(data=request.query_params)
+        query.is_valid(raise_exception=True)
+        ids = query.validated_data['business_user_ids']
+
+        rows = BusinessOrderCount.objects.filter(pk__in=ids).values_list('pk', 'in_progress', 'completed')
+        counts = {pk: (in_progress, completed) for pk, in_progress, completed in rows}
+
+        results = []
+        for business_user_id in ids:
+            if business_user_id in counts:
+                in_progress, completed = counts[business_user_id]
+                results.append({
+                    "business_user_id": business_user_id,
+                    "order_count": in_progress,
+                    "completed_order_count": completed,
+                })
+            else:
+                results.append({"business_user_id": business_user_id, "detail": "Business user not found"})
+        return Response({"results": results})
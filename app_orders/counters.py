@@ -0,0 +1,76 @@
+"""
+Per-business order counters behind the order count endpoints.
+
+BusinessOrderCount holds one row per business profile with a column per
+order status; the row is added and dropped with the profile and its type.
+The signals in app_orders.signals apply +/- deltas inside the order's own
+transaction, from the status read under a row lock (see Order.save());
+`rebuild()` recounts everything from the orders.
+"""
+from collections import Counter
+
+from django.db import transaction
+from django.db.models import Count, F
+
+from app_auth.models import UserProfile
+from app_orders.models import ORDER_STATUSES, BusinessOrderCount, Order
+
+STATUS_FIELDS = [value for value, _ in ORDER_STATUSES]
+
+
+def rebuild_row(business_user_id):
+    """Recount one business user's orders into their counter row, creating it if missing."""
+    counts = Counter(dict(
+        Order.objects.filter(business_user_id=business_user_id).order_by()
+        .values_list('status').annotate(count=Count('pk'))
+    ))
+    BusinessOrderCount.objects.update_or_create(
+        business_user_id=business_user_id, defaults={status: counts[status] for status in STATUS_FIELDS}
+    )
+
+
+def drop_row(business_user_id):
+    """Remove the counter row of a user who is no longer a business user."""
+    BusinessOrderCount.objects.filter(pk=business_user_id).delete()
+
+
+def apply_deltas(business_user_id, deltas):
+    """
+    Add `{status: delta}` to a business user's counters with one UPDATE.
+    Only business profiles have a row (see app_orders.signals); orders of
+    other users are not counted.
+    """
+    deltas = {status: delta for status, delta in deltas.items() if delta}
+    if business_user_id is None or not deltas:
+        return
+    BusinessOrderCount.objects.filter(pk=business_user_id).update(
+        **{status: F(status) + delta for status, delta in deltas.items()}
+    )
+
+
+def count_orders():
+    """`{business_user_id: Counter(status -> count)}` for every business profile, zeros included."""
+    counts = {
+        user_id: Counter()
+        for user_id in UserProfile.objects.filter(type='business').values_list('user_id', flat=True)
+    }
+    grouped = (
+        Order.objects.order_by()
+        .values_list('business_user_id', 'status')
+        .annotate(count=Count('pk'))
+    )
+    for user_id, status, count in grouped:
+        counts.setdefault(user_id, Counter())[status] = count
+    return counts
+
+
+def rebuild():
+    """Recount all orders and replace the counters table."""
+    counts = count_orders()
+    with transaction.atomic():
+        BusinessOrderCount.objects.all().delete()
+        BusinessOrderCount.objects.bulk_create(
+            BusinessOrderCount(business_user_id=user_id, **{status: per_status[status] for status in STATUS_FIELDS})
+            for user_id, per_status in counts.items()
+        )
+    return len(counts)
@@ -0,0 +1,17 @@
+from django.core.management.base import BaseCommand
+
+from app_orders import counters
+
+
+class Command(BaseCommand):
+    """
+    Recount BusinessOrderCount from the orders table.
+
+    Used to reconcile drift caused by writes that bypassed the model layer
+    (raw SQL, queryset.update(), fixtures, ...).
+    """
+    help = "Rebuild the per-business order counters."
+
+    def handle(self, *args, **options):
+        rows = counters.rebuild()
+        self.stdout.write(self.style.SUCCESS(f"Rebuilt order counters for {rows} business user(s)."))
@@ -0,0 +1,54 @@
+# Generated by Django 5.2.5 on 2026-10-18 05:55
+
+import django.db.models.deletion
+from django.conf import settings
+from django.db import migrations, models
+from django.db.models import Count
+
+
+def backfill_order_counts(apps, schema_editor):
+    """
+    Count the existing orders into the new counters table: one row per
+    business profile, orders grouped by the offer owner and status.
+    """
+    Order = apps.get_model('app_orders', 'Order')
+    UserProfile = apps.get_model('app_auth', 'UserProfile')
+    BusinessOrderCount = apps.get_model('app_orders', 'BusinessOrderCount')
+
+    counts = {
+        user_id: {'in_progress': 0, 'completed': 0, 'cancelled': 0}
+        for user_id in UserProfile.objects.filter(type='business').values_list('user_id', flat=True)
+    }
+    grouped = (
+        Order.objects.order_by()
+        .values_list('offer_detail__offer__user_id', 'status')
+        .annotate(count=Count('pk'))
+    )
+    for user_id, status, count in grouped:
+        counts.setdefault(user_id, {'in_progress': 0, 'completed': 0, 'cancelled': 0})[status] = count
+    BusinessOrderCount.objects.bulk_create(
+        BusinessOrderCount(business_user_id=user_id, **per_status) for user_id, per_status in counts.items()
+    )
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('app_auth', '0003_list_indexes'),
+        ('app_offers', '0007_offer_facet_count'),
+        ('app_orders', '0002_list_indexes'),
+        ('auth', '0012_alter_user_first_name_max_length'),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name='BusinessOrderCount',
+            fields=[
+                ('business_user', models.OneToOneField(on_delete=django.db.models.deletion.CASCADE, primary_key=True, related_name='order_counts', serialize=False, to=settings.AUTH_USER_MODEL)),
+                ('in_progress', models.IntegerField(default=0)),
+                ('completed', models.IntegerField(default=0)),
+                ('cancelled', models.IntegerField(default=0)),
+            ],
+        ),
+        migrations.RunPython(backfill_order_counts, migrations.RunPython.noop),
+    ]
@@ -0,0 +1,69 @@
+# Generated by Django 5.2.5 on 2026-10-18 06:10
+
+import django.db.models.deletion
+from django.conf import settings
+from django.db import migrations, models
+from django.db.models import OuterRef, Subquery
+
+SNAPSHOT_FIELDS = ['title', 'revisions', 'delivery_time_in_days', 'price', 'features', 'offer_type']
+
+
+def backfill_offer_snapshot(apps, schema_editor):
+    """Copy the current offer detail terms and business user onto existing orders."""
+    Order = apps.get_model('app_orders', 'Order')
+    OfferDetail = apps.get_model('app_offers', 'OfferDetail')
+    detail = OfferDetail.objects.filter(pk=OuterRef('offer_detail_id'))
+    values = {field: Subquery(detail.values(field)[:1]) for field in SNAPSHOT_FIELDS}
+    values['business_user_id'] = Subquery(detail.values('offer__user_id')[:1])
+    Order.objects.update(**values)
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('app_offers', '0007_offer_facet_count'),
+        ('app_orders', '0004_order_created_at_index'),
+        migrations.swappable_dependency(settings.AUTH_USER_MODEL),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name='order',
+            name='business_user',
+            field=models.ForeignKey(null=True, on_delete=django.db.models.deletion.CASCADE, related_name='business_orders', to=settings.AUTH_USER_MODEL),
+        ),
+        migrations.AddField(
+            model_name='order',
+            name='title',
+            field=models.CharField(default='', max_length=150),
+            preserve_default=False,
+        ),
+        migrations.AddField(
+            model_name='order',
+            name='revisions',
+            field=models.PositiveIntegerField(default=0),
+        ),
+        migrations.AddField(
+            model_name='order',
+            name='delivery_time_in_days',
+            field=models.PositiveIntegerField(default=0),
+        ),
+        migrations.AddField(
+            model_name='order',
+            name='price',
+            field=models.DecimalField(decimal_places=2, default=0, max_digits=10),
+            preserve_default=False,
+        ),
+        migrations.AddField(
+            model_name='order',
+            name='features',
+            field=models.JSONField(blank=True, default=list),
+        ),
+        migrations.AddField(
+            model_name='order',
+            name='offer_type',
+            field=models.CharField(default='', max_length=10),
+            preserve_default=False,
+        ),
+        migrations.RunPython(backfill_offer_snapshot, migrations.RunPython.noop),
+    ]
@@ -1,20 +1,105 @@
-from django.db import models
+from django.db import models, transaction
 from django.contrib.auth.models import User
 
 from app_offers.models import OfferDetail
 
+# OfferDetail terms copied onto the order when it is placed.
+SNAPSHOT_FIELDS = ['title', 'revisions', 'delivery_time_in_days', 'price', 'features', 'offer_type']
+
+ORDER_STATUSES = [
+    ('in_progress', 'In Progress'),
+    ('completed', 'Completed'),
+    ('cancelled', 'Cancelled'),
+]
+
+
 class Order(models.Model):
     """
     Represents a customer's order for a specific offer detail.
 
     Tracks the status, creation, and update timestamps.
+    The offer detail's terms and its business user are copied onto the order
+    when it is created, so later edits of the offer do not change past orders
+    and reads need no joins.
+    Saves and deletes are atomic, so BusinessOrderCount (kept current by
+    signals) always commits together with the order.
     """
     customer_user = models.ForeignKey(User, on_delete=models.CASCADE)
+    business_user = models.ForeignKey(User, on_delete=models.CASCADE, related_name='business_orders')
     offer_detail = models.ForeignKey(OfferDetail, on_delete=models.CASCADE)
-    status = models.CharField(max_length=12, default='in_progress', choices=[
-        ('in_progress', 'In Progress'),
-        ('completed', 'Completed'),
-        ('cancelled', 'Cancelled'),
-    ])
+    title = models.CharField(max_length=150)
+    revisions = models.PositiveIntegerField(default=0)
+    delivery_time_in_days = models.PositiveIntegerField(default=0)
+    price = models.DecimalField(max_digits=10, decimal_places=2)
+    features = models.JSONField(default=list, blank=True)
+    offer_type = models.CharField(max_length=10)
+    status = models.CharField(max_length=12, default='in_progress', choices=ORDER_STATUSES)
     created_at = models.DateTimeField(auto_now_add=True)
-    updated_at = models.DateTimeField(auto_now=True)
\ No newline at end of file
+    updated_at = models.DateTimeField(auto_now=True)
+
+    class Meta:
+        """Indexes for the order count per status and the order list by date."""
+        indexes = [
+            models.Index(fields=['offer_detail', 'status'], name='order_offer_detail_status_idx'),
+            models.Index(fields=['customer_user', 'created_at'], name='order_customer_created_idx'),
+            models.Index(fields=['business_user', 'created_at'], name='order_business_created_idx'),
+            models.Index(fields=['created_at', 'id'], name='order_created_at_id_idx'),
+        ]
+
+    @classmethod
+    def from_db(cls, db, field_names, values):
+        """Remember the stored status, so a later save() can tell if it changed."""
+        instance = super().from_db(db, field_names, values)
+        instance._saved_status = instance.__dict__.get('status')
+        return instance
+
+    def copy_offer_detail_terms(self):
+        """Copy the ordered offer detail's terms and its business user onto this order."""
+        detail = self.offer_detail
+        for field in SNAPSHOT_FIELDS:
+            setattr(self, field, getattr(detail, field))
+        self.business_user_id = detail.offer.user_id
+
+    def lock_saved_status(self, using=None):
+        """
+        Reread the stored status under a row lock. Counters move from what is
+        stored, not from what this instance loaded: two concurrent saves of one
+        order would otherwise both move it out of the same status.
+        """
+        self._saved_status = (
+            Order.objects.using(using).select_for_update().filter(pk=self.pk)
+            .values_list('status', flat=True).first()
+        )
+
+    def save(self, *args, **kwargs):
+        if self._state.adding and self.business_user_id is None:
+            self.copy_offer_detail_terms()
+        update_fields = kwargs.get('update_fields')
+        with transaction.atomic(using=kwargs.get('using')):
+            if not self._state.adding and (update_fields is None or 'status' in update_fields):
+                self.lock_saved_status(kwargs.get('using'))
+            super().save(*args, **kwargs)
+
+    def delete(self, *args, **kwargs):
+        with transaction.atomic(using=kwargs.get('using')):
+            self.lock_saved_status(kwargs.get('using'))
+            return super().delete(*args, **kwargs)
+
+
+class BusinessOrderCount(models.Model):
+    """
+    Number of orders per status for one business user, keyed by the user id.
+
+    Maintained by the signals in app_orders.signals on every order create,
+    status change and delete; a row exists for every business profile, so
+    the order count views are a single primary-key lookup.
+    """
+    business_user = models.OneToOneField(
+        User, on_delete=models.CASCADE, primary_key=True, related_name='order_counts'
+    )
+    in_progress = models.IntegerField(default=0)
+    completed = models.IntegerField(default=0)
+    cancelled = models.IntegerField(default=0)
+
+    def __str__(self):
+        return f"{self.business_user_id}: {self.in_progress} / {self.completed} / {self.cancelled}"
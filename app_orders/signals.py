@@ -0,0 +1,66 @@
+from collections import Counter
+
+from django.db.models.signals import post_save, post_delete
+from django.dispatch import Signal, receiver
+
+from app_auth.models import UserProfile
+from app_orders import counters
+from app_orders.models import Order
+
+
+# Sent after order statuses were changed with a queryset update(), which
+# bypasses post_save. Arguments: `changes` (list of
+# `(business_user_id, previous_status, new_status)`, one per changed order).
+order_statuses_bulk_updated = Signal()
+
+
+@receiver(post_save, sender=Order)
+def count_order_on_save(sender, instance, created, raw=False, **kwargs):
+    """Count a new order, or move a saved one to its new status column."""
+    if raw:
+        return
+    previous = None if created else getattr(instance, '_saved_status', None)
+    if created:
+        counters.apply_deltas(instance.business_user_id, {instance.status: 1})
+    elif previous is not None and previous != instance.status:
+        counters.apply_deltas(instance.business_user_id, {previous: -1, instance.status: 1})
+    instance._saved_status = instance.status
+
+
+@receiver(post_delete, sender=Order)
+def count_order_on_delete(sender, instance, **kwargs):
+    """Uncount a deleted order, cascaded deletes included."""
+    status = getattr(instance, '_saved_status', None) or instance.status
+    counters.apply_deltas(instance.business_user_id, {status: -1})
+
+
+@receiver(order_statuses_bulk_updated)
+def count_orders_on_bulk_status_update(sender, changes, **kwargs):
+    """Move bulk-updated orders between status columns, one UPDATE per business user."""
+    deltas = {}
+    for business_user_id, previous, status in changes:
+        per_business = deltas.setdefault(business_user_id, Counter())
+        per_business[previous] -= 1
+        per_business[status] += 1
+    for business_user_id, per_business in deltas.items():
+        counters.apply_deltas(business_user_id, per_business)
+
+
+@receiver(post_save, sender=UserProfile)
+def sync_order_counts_with_profile(sender, instance, created, raw=False, **kwargs):
+    """
+    Business profiles have a counter row and other users none, so the row
+    alone tells the count endpoints who is a business user: a new business
+    profile or a switch to business (re)counts it, a switch away drops it.
+    """
+    if raw or (not created and getattr(instance, '_saved_type', None) == instance.type):
+        return
+    if instance.type == 'business':
+        counters.rebuild_row(instance.user_id)
+    elif not created:
+        counters.drop_row(instance.user_id)
+
+
+@receiver(post_delete, sender=UserProfile)
+def drop_order_counts_with_profile(sender, instance, **kwargs):
+    counters.drop_row(instance.user_id)
@@ -3,13 +3,24 @@ from rest_framework import status
 from rest_framework.test import APIClient, APITestCase
 from django.contrib.auth.models import User
 from app_offers.models import Offer, OfferDetail
-from app_orders.models import Order
+import csv
+import json
+from io import StringIO
+
+from django.core.exceptions import ImproperlyConfigured
+from django.core.management import call_command
+
+from app_orders import counters
+from app_orders.api.serializers import OrdersListCreateSerializer
+from app_orders.models import BusinessOrderCount, Order
 from rest_framework.authtoken.models import Token
 
 from app_auth.models import UserProfile
+from core.exports import ExportView
+from core.query_budget import QueryBudgetTestMixin
 
 
-class OrderTests(APITestCase):
+class OrderTests(QueryBudgetTestMixin, APITestCase):
 
     def setUp(self):
         """ Create Users"""
@@ -65,9 +76,10 @@ class OrderTests(APITestCase):
         response = self.client.get(url)
 
         self.assertEqual(response.status_code, status.HTTP_200_OK)
-        self.assertEqual(response.data[0]['title'], "Premium Offer")
-        self.assertEqual(response.data[0]['status'], "in_progress")  # default set?
-        self.assertEqual(response.data[0]['customer_user'], self.customer_user.id)
+        self.assertIn("results", response.data)  # Pagination active?
+        self.assertEqual(response.data["results"][0]['title'], "Premium Offer")
+        self.assertEqual(response.data["results"][0]['status'], "in_progress")  # default set?
+        self.assertEqual(response.data["results"][0]['customer_user'], self.customer_user.id)
 
 
     # CREATE as customer (valid)
@@ -86,6 +98,23 @@ class OrderTests(APITestCase):
         self.assertEqual(response.data['status'], "in_progress")  # default set?
 
 
+    # orders keep the terms they were bought with (valid)
+    def test_order_keeps_purchased_terms(self):
+        self.assertEqual(self.order.business_user, self.business_user)
+        detail = self.details[2]
+        detail.price = 999
+        detail.title = "Premium Offer v2"
+        detail.save()
+
+        self.authenticate_user("customer")
+        response = self.client.get(reverse("orders-list"))
+
+        order = response.data["results"][0]
+        self.assertEqual(order["title"], "Premium Offer")
+        self.assertEqual(float(order["price"]), 200)
+        self.assertEqual(order["business_user"], self.business_user.id)
+
+
     # CREATE as business (invalid)
     def test_create_order_as_business_fails(self):
         self.authenticate_user("business")
@@ -106,9 +135,12 @@ class OrderTests(APITestCase):
         payload = {
             "status": "completed"
         }
-        response = self.client.patch(url, payload)
+        with self.assertQueryBudget(7):  # token, order + ownership, locked status, update, counters + savepoint pair
+            response = self.client.patch(url, payload)
 
         self.assertEqual(response.status_code, status.HTTP_200_OK)
+        self.assertEqual(response.data["status"], "completed")
+        self.assertEqual(response.data["title"], "Premium Offer")
         self.order.refresh_from_db()
         self.assertEqual(self.order.status, "completed")  # check db
 
@@ -169,4 +201,255 @@ class OrderTests(APITestCase):
         response = self.client.delete(url)
 
         self.assertEqual(response.status_code, status.HTTP_403_FORBIDDEN)
-        self.assertTrue(Order.objects.filter(pk=self.order.pk).exists()) 
\ No newline at end of file
+        self.assertTrue(Order.objects.filter(pk=self.order.pk).exists()) 
+
+
+    """ TESTS QUERY BUDGET """
+    """ ------------------ """
+    # order list query count does not grow with number of orders (valid)
+    def test_order_list_constant_queries(self):
+        self.authenticate_user("business")
+        url = reverse("orders-list")
+
+        def grow():
+            for detail in self.details:
+                Order.objects.create(customer_user=self.customer_user, offer_detail=detail)
+
+        self.assertConstantQueries(lambda: self.client.get(url), grow)
+        with self.assertQueryBudget(2):  # token, orders (no profile lookup)
+            self.client.get(url)
+
+
+    # order list is cursor-paginated newest first, for both sides of the order (valid)
+    def test_order_list_cursor_pagination(self):
+        for detail in self.details:
+            Order.objects.create(customer_user=self.customer_user, offer_detail=detail)
+        expected = list(Order.objects.order_by("-created_at", "-id").values_list("id", flat=True))
+
+        for user_type in ("customer", "business"):
+            self.authenticate_user(user_type)
+            response = self.client.get(reverse("orders-list"), {"page_size": 3})
+            ids = [order["id"] for order in response.data["results"]]
+            response = self.client.get(response.data["next"])
+            ids += [order["id"] for order in response.data["results"]]
+
+            self.assertEqual(ids, expected)
+            self.assertIsNone(response.data["next"])
+
+
+    # order list of an unrelated customer is empty (valid)
+    def test_order_list_other_customer_empty(self):
+        other = User.objects.create_user(username="cust2", password="pass123")
+        UserProfile.objects.create(user=other, type="customer")
+        self.client.force_authenticate(other)
+
+        response = self.client.get(reverse("orders-list"))
+        self.assertEqual(response.data["results"], [])
+
+
+
+    """ TESTS ORDER COUNTS """
+    """ ------------------ """
+    def stored_counts(self):
+        row = BusinessOrderCount.objects.get(pk=self.business_user.pk)
+        return {field: getattr(row, field) for field in counters.STATUS_FIELDS}
+
+
+    # order counts are one primary-key lookup on the counters table (valid)
+    def test_order_count_views(self):
+        self.authenticate_user("customer")
+        with self.assertQueryBudget(2):  # token, counters row
+            response = self.client.get(reverse("ordercount-inprogress", args=[self.business_user.pk]))
+        self.assertEqual(response.data, {"order_count": 1})
+
+        response = self.client.get(reverse("ordercount-completed", args=[self.business_user.pk]))
+        self.assertEqual(response.data, {"completed_order_count": 0})
+
+
+    # order counts for customers or unknown users (invalid)
+    def test_order_count_not_business(self):
+        self.authenticate_user("customer")
+        for user_id in (self.customer_user.pk, 9999):
+            response = self.client.get(reverse("ordercount-inprogress", args=[user_id]))
+            self.assertEqual(response.status_code, status.HTTP_404_NOT_FOUND)
+
+
+    # counter rows follow profile type changes and deletes (valid)
+    def test_order_counts_follow_profile_type(self):
+        self.authenticate_user("customer")
+        url = reverse("ordercount-inprogress", args=[self.business_user.pk])
+
+        self.business_profile.type = "customer"
+        self.business_profile.save()
+        self.assertEqual(self.client.get(url).status_code, status.HTTP_404_NOT_FOUND)
+
+        self.business_profile.type = "business"
+        self.business_profile.save()
+        response = self.client.get(url)
+        self.assertEqual(response.status_code, status.HTTP_200_OK)
+        self.assertEqual(response.data, {"order_count": 1})
+
+        self.business_profile.delete()
+        self.assertEqual(self.client.get(url).status_code, status.HTTP_404_NOT_FOUND)
+
+
+    # counters follow order create, status changes and deletes (valid)
+    def test_order_counts_follow_writes(self):
+        self.authenticate_user("customer")
+        self.client.post(reverse("orders-list"), {"offer_detail_id": self.details[0].pk}, format="json")
+        self.assertEqual(self.stored_counts(), {"in_progress": 2, "completed": 0, "cancelled": 0})
+
+        self.authenticate_user("business")
+        self.client.patch(reverse("order-detail", args=[self.order.pk]), {"status": "completed"}, format="json")
+        self.client.patch(reverse("order-detail", args=[self.order.pk]), {"status": "completed"}, format="json")
+        self.assertEqual(self.stored_counts(), {"in_progress": 1, "completed": 1, "cancelled": 0})
+
+        self.client.delete(reverse("order-detail", args=[self.order.pk]))
+        self.assertEqual(self.stored_counts(), {"in_progress": 1, "completed": 0, "cancelled": 0})
+
+        self.offer.delete()
+        self.assertEqual(self.stored_counts(), {"in_progress": 0, "completed": 0, "cancelled": 0})
+
+
+    # saves from stale instances count from the stored status (valid)
+    def test_order_counts_concurrent_status_changes(self):
+        first, second = Order.objects.get(pk=self.order.pk), Order.objects.get(pk=self.order.pk)
+        first.status = "completed"
+        first.save()
+        second.status = "completed"
+        second.save()
+        self.assertEqual(self.stored_counts(), {"in_progress": 0, "completed": 1, "cancelled": 0})
+
+        second.status = "cancelled"
+        second.save()
+        first.delete()
+        self.assertEqual(self.stored_counts(), {"in_progress": 0, "completed": 0, "cancelled": 0})
+
+
+    # rebuild command reconciles writes that bypassed the signals (valid)
+    def test_rebuild_order_counts_command(self):
+        Order.objects.update(status="cancelled")
+        call_command("rebuild_order_counts", stdout=StringIO())
+        self.assertEqual(self.stored_counts(), {"in_progress": 0, "completed": 0, "cancelled": 1})
+
+
+    # batch order counts for many businesses in one query (valid)
+    def test_order_count_batch(self):
+        other = User.objects.create_user(username="biz2", password="pass123")
+        UserProfile.objects.create(user=other, type="business")
+        self.authenticate_user("customer")
+        ids = f"{self.business_user.pk},{other.pk},{self.customer_user.pk},9999,{other.pk}"
+
+        with self.assertQueryBudget(2):  # token, counters
+            response = self.client.get(reverse("ordercount-batch"), {"business_user_ids": ids})
+
+        self.assertEqual(response.status_code, status.HTTP_200_OK)
+        self.assertEqual(response.data["results"], [
+            {"business_user_id": self.business_user.pk, "order_count": 1, "completed_order_count": 0},
+            {"business_user_id": other.pk, "order_count": 0, "completed_order_count": 0},
+            {"business_user_id": self.customer_user.pk, "detail": "Business user not found"},
+            {"business_user_id": 9999, "detail": "Business user not found"},
+        ])
+
+
+    # batch order counts with malformed or too many ids (invalid)
+    def test_order_count_batch_invalid(self):
+        self.authenticate_user("customer")
+        url = reverse("ordercount-batch")
+        for ids in (None, "", "1,abc", ",".join(str(i) for i in range(501))):
+            params = {} if ids is None else {"business_user_ids": ids}
+            response = self.client.get(url, params)
+            self.assertEqual(response.status_code, status.HTTP_400_BAD_REQUEST)
+            self.assertIn("business_user_ids", response.data)
+
+
+    # bulk status change with per-id outcomes and counters kept in sync (valid)
+    def test_bulk_status(self):
+        other_business = User.objects.create_user(username="biz2", password="pass123")
+        other_offer = Offer.objects.create(user=other_business, title="Other", description="Desc")
+        other_detail = OfferDetail.objects.create(
+            offer=other_offer, title="Basic", offer_type="basic", price=10, delivery_time_in_days=1
+        )
+        foreign = Order.objects.create(customer_user=self.customer_user, offer_detail=other_detail)
+        done = Order.objects.create(customer_user=self.customer_user, offer_detail=self.details[0], status="completed")
+        ids = [self.order.pk, done.pk, foreign.pk, 9999, self.order.pk]
+
+        self.authenticate_user("business")
+        with self.assertQueryBudget(6):  # token, select, update, counters + savepoint pair
+            response = self.client.post(
+                reverse("orders-bulk-status"), {"ids": ids, "status": "completed"}, format="json"
+            )
+
+        self.assertEqual(response.status_code, status.HTTP_200_OK)
+        self.assertEqual(response.data["results"], [
+            {"id": self.order.pk, "status": "completed", "updated": True},
+            {"id": done.pk, "status": "completed", "updated": False},
+            {"id": foreign.pk, "detail": "You do not have permission to change this order"},
+            {"id": 9999, "detail": "Order not found"},
+        ])
+        self.order.refresh_from_db()
+        foreign.refresh_from_db()
+        self.assertEqual(self.order.status, "completed")
+        self.assertEqual(foreign.status, "in_progress")
+        self.assertEqual(self.stored_counts(), {"in_progress": 0, "completed": 2, "cancelled": 0})
+
+
+    # bulk status change with a bad status or too many ids (invalid)
+    def test_bulk_status_invalid(self):
+        self.authenticate_user("business")
+        url = reverse("orders-bulk-status")
+        for payload in (
+            {"ids": [self.order.pk], "status": "in_progress"},
+            {"ids": [], "status": "completed"},
+            {"ids": list(range(1, 502)), "status": "completed"},
+        ):
+            response = self.client.post(url, payload, format="json")
+            self.assertEqual(response.status_code, status.HTTP_400_BAD_REQUEST)
+        self.order.refresh_from_db()
+        self.assertEqual(self.order.status, "in_progress")
+
+
+    # export streams the list fields as NDJSON, one line per order (valid)
+    def test_export_ndjson(self):
+        second = Order.objects.create(customer_user=self.customer_user, offer_detail=self.details[0])
+        self.authenticate_user("business")
+        with self.assertQueryBudget(2):  # token, orders
+            response = self.client.get(reverse("orders-export"))
+            body = b"".join(response.streaming_content).decode()
+
+        self.assertEqual(response.status_code, status.HTTP_200_OK)
+        self.assertEqual(response["Content-Type"], "application/x-ndjson")
+        records = [json.loads(line) for line in body.splitlines()]
+        expected = OrdersListCreateSerializer([self.order, second], many=True).data
+        self.assertEqual(records, json.loads(json.dumps(expected)))
+
+
+    # export as CSV, other users' orders are not included (valid)
+    def test_export_csv(self):
+        other = User.objects.create_user(username="cust2", password="pass123")
+        Order.objects.create(customer_user=other, offer_detail=self.details[0])
+        self.authenticate_user("customer")
+        response = self.client.get(reverse("orders-export"), {"output": "csv"})
+
+        self.assertEqual(response.status_code, status.HTTP_200_OK)
+        rows = list(csv.DictReader(StringIO(b"".join(response.streaming_content).decode())))
+        self.assertEqual(len(rows), 1)
+        self.assertEqual(rows[0]["id"], str(self.order.pk))
+        self.assertEqual(rows[0]["price"], "200.00")
+        self.assertNotIn("offer_detail_id", rows[0])
+
+
+    # export with an unknown output format (invalid)
+    def test_export_unknown_output(self):
+        self.authenticate_user("customer")
+        response = self.client.get(reverse("orders-export"), {"output": "xml"})
+        self.assertEqual(response.status_code, status.HTTP_400_BAD_REQUEST)
+
+
+    # export view without a queryset (invalid)
+    def test_export_view_requires_queryset(self):
+        view = ExportView(serializer_class=OrdersListCreateSerializer)
+        with self.assertRaises(ImproperlyConfigured):
+            view.get_queryset()
+        view.queryset = Order.objects.filter(customer_user=self.customer_user)
+        self.assertEqual(list(view.get_queryset()), list(view.queryset))
@@ -0,0 +1,26 @@
+from django.db.models import Sum
+
+from app_reviews.ratings import stats_scope
+from core.pagination import KeysetPagination
+
+
+class ReviewCursorPagination(KeysetPagination):
+    """
+    Cursor pagination for the review list, keyed on `(updated_at, id)` or `(rating, id)`.
+    `?with_count=true` reads the total from BusinessRatingStats when the
+    list is filtered by business user only.
+    """
+    page_size = 20
+    max_page_size = 100
+    ordering_fields = ['updated_at', 'rating']
+    default_ordering = '-updated_at'
+
+    def get_paging_params(self):
+        """Query parameters that page or order the list without filtering it."""
+        return (self.cursor_query_param, self.page_size_query_param, self.count_query_param, self.ordering_query_param)
+
+    def get_count(self, queryset):
+        scope = stats_scope(self.request.query_params, self.get_paging_params())
+        if scope is None:
+            return super().get_count(queryset)
+        return scope.aggregate(count=Sum('review_count'))['count'] or 0
@@ -1,12 +1,7 @@
-from rest_framework import permissions
+from core.updates import IsAnnotatedOwnerOrAdmin
 
-class IsOwnerOrAdmin(permissions.BasePermission):
+class IsOwnerOrAdmin(IsAnnotatedOwnerOrAdmin):
     """
     Object-level permission to only allow owners of an review object to edit it.
-    Assumes the model instance has an `reviewer` attribute.
+    The view annotates `is_owner` (reviewer is the current user) onto its queryset.
     """
-
-    def has_object_permission(self, request, view, obj):
-        is_owner = obj.reviewer == request.user
-        is_admin = request.user.is_staff or request.user.is_superuser
-        return is_owner or is_admin
\ No newline at end of file
@@ -1,6 +1,9 @@
+from django.db import IntegrityError
 from rest_framework import serializers
+from rest_framework.settings import api_settings
 
-from app_reviews.models import Review
+from app_auth.cache import get_profile_type
+from app_reviews.models import BusinessRatingStats, Review
 
 class ReviewListCreateSerializer(serializers.ModelSerializer):
     """
@@ -8,8 +11,11 @@ class ReviewListCreateSerializer(serializers.ModelSerializer):
     
     - GET: Used for listing reviews.
     - POST: Used for creating a new review. Validates that the business user is of type 'business'
-      and that the current user has not already reviewed this business.
+      (cached profile type, no query) and relies on the unique (reviewer, business_user)
+      constraint to reject a second review of the same business.
     """
+    business_user = serializers.IntegerField(source='business_user_id', help_text="ID of the reviewed business user")
+
     class Meta:
         model = Review
         fields = [
@@ -30,32 +36,37 @@ class ReviewListCreateSerializer(serializers.ModelSerializer):
     
     def validate(self, attrs):
         """
-        Validate POST requests to ensure:
-        1. The selected user is a business.
-        2. The current user has not already submitted a review for this business.
+        Validate POST requests to ensure the selected user is a business.
+        Duplicates are caught by the database on insert (see create()).
         """
         request = self.context.get("request")
         if request and request.method != "POST":
             return attrs
 
-        current_user = self.context["request"].user
-        business_user = attrs["business_user"]
-
-        if business_user.profile.type != "business":
+        if get_profile_type(attrs["business_user_id"]) != "business":
             raise serializers.ValidationError("Selected user is not a business.")
-        
-        if Review.objects.filter(reviewer=current_user, business_user=business_user).exists():
-            raise serializers.ValidationError("You have already reviewed this business.")
 
         return attrs
         
 
     def create(self, validated_data):
         """
-        Assign the current user as the reviewer and create a new review instance.
+        Assign the current user as the reviewer and insert the review.
+        A concurrent or repeated review of the same business violates the
+        unique constraint and is reported as a validation error.
         """
         validated_data["reviewer"] = self.context["request"].user
-        return Review.objects.create(**validated_data)
+        try:
+            return Review.objects.create(**validated_data)
+        except IntegrityError:
+            duplicate = Review.objects.filter(
+                reviewer=validated_data["reviewer"], business_user_id=validated_data["business_user_id"]
+            )
+            if not duplicate.exists():
+                raise
+            raise serializers.ValidationError(
+                {api_settings.NON_FIELD_ERRORS_KEY: ["You have already reviewed this business."]}
+            )
     
 
 
@@ -70,4 +81,34 @@ class ReviewUpdateDeleteSerializer(serializers.ModelSerializer):
         fields = [
             "rating",
             "description",
-        ]
\ No newline at end of file
+        ]
+
+class RatingStatsSerializer(serializers.ModelSerializer):
+    """
+    A business user's rating aggregates, read from BusinessRatingStats.
+    Nested into the business profile serializers.
+    """
+    average_rating = serializers.DecimalField(
+        read_only=True, max_digits=2, decimal_places=1, allow_null=True,
+        help_text="Average rating, null without reviews."
+    )
+    rating_histogram = serializers.SerializerMethodField(help_text="Number of reviews per rating (1-5).")
+
+    class Meta:
+        model = BusinessRatingStats
+        fields = [
+            "review_count",
+            "average_rating",
+            "rating_histogram",
+            "last_review_at"
+        ]
+
+    def get_rating_histogram(self, obj) -> dict:
+        return {str(rating): count for rating, count in obj.histogram.items()}
+
+
+class BusinessRatingStatsSerializer(RatingStatsSerializer):
+    """Rating aggregates of the stats endpoint, including the business user id."""
+
+    class Meta(RatingStatsSerializer.Meta):
+        fields = ["business_user"] + RatingStatsSerializer.Meta.fields
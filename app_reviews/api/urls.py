@@ -1,8 +1,9 @@
-
 from django.urls import path
-from app_reviews.api.views import ReviewListCreateView, ReviewUpdateDeleteView
+from app_reviews.api.views import ReviewListCreateView, ReviewUpdateDeleteView, ReviewExportView, BusinessRatingStatsView
 
 urlpatterns = [
     path('', ReviewListCreateView.as_view(), name='review-list'),
+    path('export/', ReviewExportView.as_view(), name='review-export'),
+    path('stats/<int:business_user_id>/', BusinessRatingStatsView.as_view(), name='review-stats'),
     path('<int:pk>/', ReviewUpdateDeleteView.as_view(), name='review-detail')
-]
\ No newline at end of file
+]
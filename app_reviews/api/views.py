@@ -1,16 +1,21 @@
 from rest_framework import generics, filters
-from rest_framework.response import Response
 from rest_framework.permissions import IsAuthenticated, SAFE_METHODS
 
+from django.db.models import Count, Max, Q, Sum
 from django_filters.rest_framework import DjangoFilterBackend
 
 from drf_spectacular.utils import extend_schema, OpenApiResponse
 
-from app_reviews.models import Review
-from .serializers import ReviewListCreateSerializer, ReviewUpdateDeleteSerializer
+from app_reviews.models import BusinessRatingStats, Review
+from app_reviews.ratings import stats_scope
+from .paginations import ReviewCursorPagination
+from .serializers import ReviewListCreateSerializer, ReviewUpdateDeleteSerializer, BusinessRatingStatsSerializer
 from .permissions import IsOwnerOrAdmin
 from app_orders.api.permissions import IsCustomerUser
 from .filters import ReviewFilter
+from core.conditional import ConditionalGetMixin
+from core.exports import ExportView
+from core.updates import OwnerAnnotationMixin, UpdateResponseMixin
 
 
 @extend_schema(
@@ -21,17 +26,38 @@ from .filters import ReviewFilter
         400: OpenApiResponse(description="Invalid input data or validation errors")
     }
 )
-class ReviewListCreateView(generics.ListCreateAPIView):
+class ReviewListCreateView(ConditionalGetMixin, generics.ListCreateAPIView):
     """
     List existing reviews or create a new review.
-    GET: List reviews for authenticated users.
+    GET: Cursor-paginated reviews for authenticated users, by `updated_at`
+         (default, newest first) or `rating` (304 while the filtered set is unchanged).
     POST: Create a new review for authenticated customers.
     """
     queryset = Review.objects.all()
     serializer_class = ReviewListCreateSerializer
     filter_backends = [DjangoFilterBackend, filters.SearchFilter, filters.OrderingFilter]
     filterset_class = ReviewFilter
+    pagination_class = ReviewCursorPagination
     ordering_fields = ['updated_at', 'rating']
+    ordering = ['-updated_at']
+    query_budget = 5
+
+    def get_validators(self):
+        """
+        max(updated_at) and the row count of the filtered set, in one aggregate.
+        The count catches deletions, which leave max(updated_at) untouched.
+        Per-business lists read both from the business's BusinessRatingStats
+        row, so their revalidation does not grow with the number of reviews.
+        """
+        scope = stats_scope(self.request.query_params, self.paginator.get_paging_params())
+        if scope is not None:
+            stats = scope.aggregate(last_modified=Max('last_review_at'), count=Sum('review_count'))
+            stats['count'] = stats['count'] or 0
+        else:
+            stats = self.filter_queryset(self.get_queryset()).aggregate(
+                last_modified=Max('updated_at'), count=Count('id')
+            )
+        return (stats['last_modified'], stats['count']), stats['last_modified']
 
     def get_permissions(self):
         """
@@ -55,22 +81,59 @@ class ReviewListCreateView(generics.ListCreateAPIView):
         404: OpenApiResponse(description="Review not found")
     }
 )
-class ReviewUpdateDeleteView(generics.RetrieveUpdateDestroyAPIView):
+class ReviewUpdateDeleteView(OwnerAnnotationMixin, UpdateResponseMixin, generics.RetrieveUpdateDestroyAPIView):
     """
     Update, or delete a specific review.
-    PUT/PATCH: Update review (owner/admin only).
+    PUT/PATCH: Update review (owner/admin only), answered with the saved review.
     DELETE: Delete review (owner/admin only).
+    Ownership is resolved in the SELECT of the review.
     """
     queryset = Review.objects.all()
     serializer_class = ReviewUpdateDeleteSerializer
+    response_serializer_class = ReviewListCreateSerializer
+    owner_lookup = 'reviewer'
     http_method_names = ['put', 'patch', 'delete']
     permission_classes = [IsAuthenticated, IsOwnerOrAdmin]
 
-    def update(self, request, *args, **kwargs):
-        """
-        Override update to return serialized review data after update.
-        """
-        super().update(request, *args, **kwargs)
-        instance = self.get_object()
-        return Response(ReviewListCreateSerializer(instance).data)
-    
\ No newline at end of file
+
+@extend_schema(
+    description="Stream the reviews the authenticated user received or wrote as NDJSON (default) or CSV (`?output=csv`).",
+    responses={
+        200: OpenApiResponse(description="One record per review, oldest first, with the fields of the review list."),
+        400: OpenApiResponse(description="Unknown output format.")
+    }
+)
+class ReviewExportView(ExportView):
+    """
+    Export every review the current user received (business) or wrote
+    (customer) -- all reviews for superusers -- with the fields of
+    ReviewListCreateSerializer, streamed in chunks.
+    """
+    serializer_class = ReviewListCreateSerializer
+    export_name = 'reviews'
+
+    def get_queryset(self):
+        user = self.request.user
+        reviews = Review.objects.order_by('id')
+        if user.is_superuser:
+            return reviews
+        return reviews.filter(Q(business_user=user) | Q(reviewer=user))
+
+
+@extend_schema(
+    description="Return review count, average rating, rating histogram and latest review time of a business user.",
+    responses={
+        200: OpenApiResponse(response=BusinessRatingStatsSerializer, description="Rating stats."),
+        404: OpenApiResponse(description="Business user not found.")
+    }
+)
+class BusinessRatingStatsView(generics.RetrieveAPIView):
+    """
+    Rating aggregates of one business user, read from BusinessRatingStats with
+    one primary-key lookup; only business users have a stats row.
+    """
+    queryset = BusinessRatingStats.objects.all()
+    serializer_class = BusinessRatingStatsSerializer
+    permission_classes = [IsAuthenticated]
+    lookup_url_kwarg = 'business_user_id'
+    query_budget = 2
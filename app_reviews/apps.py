@@ -4,3 +4,6 @@ from django.apps import AppConfig
 class AppReviewsConfig(AppConfig):
     default_auto_field = 'django.db.models.BigAutoField'
     name = 'app_reviews'
+
+    def ready(self):
+        from . import signals  # noqa: F401
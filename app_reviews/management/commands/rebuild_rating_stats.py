@@ -0,0 +1,17 @@
+from django.core.management.base import BaseCommand
+
+from app_reviews import ratings
+
+
+class Command(BaseCommand):
+    """
+    Recount BusinessRatingStats from the reviews table.
+
+    Used to reconcile drift caused by writes that bypassed the model layer
+    (raw SQL, queryset.update(), fixtures, ...).
+    """
+    help = "Rebuild the per-business rating stats."
+
+    def handle(self, *args, **options):
+        rows = ratings.rebuild()
+        self.stdout.write(self.style.SUCCESS(f"Rebuilt rating stats for {rows} business user(s)."))
@@ -0,0 +1,61 @@
+# Generated by Django 5.2.5 on 2026-10-18 06:16
+
+import django.db.models.deletion
+from django.conf import settings
+from django.db import migrations, models
+from django.db.models import Count, Max, Q, Sum
+
+
+def backfill_rating_stats(apps, schema_editor):
+    """Count the existing reviews into the new stats table, one row per business profile."""
+    Review = apps.get_model('app_reviews', 'Review')
+    UserProfile = apps.get_model('app_auth', 'UserProfile')
+    BusinessRatingStats = apps.get_model('app_reviews', 'BusinessRatingStats')
+
+    ratings = [1, 2, 3, 4, 5]
+    stats = {
+        user_id: {'last_review_at': None}
+        for user_id in UserProfile.objects.filter(type='business').values_list('user_id', flat=True)
+    }
+    grouped = (
+        Review.objects.order_by()
+        .values('business_user_id')
+        .annotate(
+            review_count=Count('pk'),
+            rating_sum=Sum('rating'),
+            last_review_at=Max('updated_at'),
+            **{f'rating_{rating}': Count('pk', filter=Q(rating=rating)) for rating in ratings},
+        )
+    )
+    for row in grouped:
+        stats[row.pop('business_user_id')] = row
+    BusinessRatingStats.objects.bulk_create(
+        BusinessRatingStats(business_user_id=user_id, **values) for user_id, values in stats.items()
+    )
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('app_auth', '0003_list_indexes'),
+        ('app_reviews', '0002_list_indexes'),
+        ('auth', '0012_alter_user_first_name_max_length'),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name='BusinessRatingStats',
+            fields=[
+                ('business_user', models.OneToOneField(on_delete=django.db.models.deletion.CASCADE, primary_key=True, related_name='rating_stats', serialize=False, to=settings.AUTH_USER_MODEL)),
+                ('review_count', models.IntegerField(default=0)),
+                ('rating_sum', models.IntegerField(default=0)),
+                ('rating_1', models.IntegerField(default=0)),
+                ('rating_2', models.IntegerField(default=0)),
+                ('rating_3', models.IntegerField(default=0)),
+                ('rating_4', models.IntegerField(default=0)),
+                ('rating_5', models.IntegerField(default=0)),
+                ('last_review_at', models.DateTimeField(blank=True, null=True)),
+            ],
+        ),
+        migrations.RunPython(backfill_rating_stats, migrations.RunPython.noop),
+    ]
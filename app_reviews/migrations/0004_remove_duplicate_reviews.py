@@ -0,0 +1,86 @@
+from django.db import migrations
+from django.db.models import Count, Max, Q, Sum
+
+# Removed duplicates are copied here first; reversing the migration puts them back.
+BACKUP_TABLE = 'app_reviews_review_removed_duplicates'
+
+
+def remove_duplicate_reviews(apps, schema_editor):
+    """
+    Keep only the newest review per (reviewer, business_user) before the
+    unique constraint is added, and recount the rating stats. The removed
+    rows are copied to BACKUP_TABLE and listed in the migration output.
+    """
+    Review = apps.get_model('app_reviews', 'Review')
+    keep = (
+        Review.objects.order_by().values('reviewer_id', 'business_user_id')
+        .annotate(keep_id=Max('id')).values_list('keep_id', flat=True)
+    )
+    duplicates = Review.objects.exclude(id__in=keep)
+    removed = list(duplicates.order_by('id').values_list('id', 'reviewer_id', 'business_user_id'))
+    if not removed:
+        return
+
+    quote = schema_editor.quote_name
+    table = quote(Review._meta.db_table)
+    schema_editor.execute(
+        f'CREATE TABLE {quote(BACKUP_TABLE)} AS SELECT * FROM {table} WHERE {quote("id")} NOT IN '
+        f'(SELECT MAX({quote("id")}) FROM {table} GROUP BY {quote("reviewer_id")}, {quote("business_user_id")})'
+    )
+    print(f"\n  Removing {len(removed)} duplicate review(s), copied to {BACKUP_TABLE}:")
+    for review_id, reviewer_id, business_user_id in removed:
+        print(f"    review {review_id} (reviewer {reviewer_id}, business user {business_user_id})")
+    duplicates.delete()
+    recount_rating_stats(apps)
+
+
+def restore_duplicate_reviews(apps, schema_editor):
+    """Put the reviews removed by remove_duplicate_reviews back and recount the rating stats."""
+    if BACKUP_TABLE not in schema_editor.connection.introspection.table_names():
+        return
+    Review = apps.get_model('app_reviews', 'Review')
+    quote = schema_editor.quote_name
+    schema_editor.execute(f'INSERT INTO {quote(Review._meta.db_table)} SELECT * FROM {quote(BACKUP_TABLE)}')
+    schema_editor.execute(f'DROP TABLE {quote(BACKUP_TABLE)}')
+    recount_rating_stats(apps)
+
+
+def recount_rating_stats(apps):
+    Review = apps.get_model('app_reviews', 'Review')
+    UserProfile = apps.get_model('app_auth', 'UserProfile')
+    BusinessRatingStats = apps.get_model('app_reviews', 'BusinessRatingStats')
+
+    ratings = [1, 2, 3, 4, 5]
+    stats = {
+        user_id: {'last_review_at': None}
+        for user_id in UserProfile.objects.filter(type='business').values_list('user_id', flat=True)
+    }
+    grouped = (
+        Review.objects.order_by()
+        .values('business_user_id')
+        .annotate(
+            review_count=Count('pk'),
+            rating_sum=Sum('rating'),
+            last_review_at=Max('updated_at'),
+            **{f'rating_{rating}': Count('pk', filter=Q(rating=rating)) for rating in ratings},
+        )
+    )
+    for row in grouped:
+        stats[row.pop('business_user_id')] = row
+    BusinessRatingStats.objects.all().delete()
+    BusinessRatingStats.objects.bulk_create(
+        BusinessRatingStats(business_user_id=user_id, **values) for user_id, values in stats.items()
+    )
+
+
+class Migration(migrations.Migration):
+    """Data cleanup only; the constraint is added in the next migration (see 0005)."""
+
+    dependencies = [
+        ('app_auth', '0003_list_indexes'),
+        ('app_reviews', '0003_business_rating_stats'),
+    ]
+
+    operations = [
+        migrations.RunPython(remove_duplicate_reviews, restore_duplicate_reviews),
+    ]
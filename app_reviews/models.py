@@ -1,12 +1,16 @@
-from django.db import models
+from django.db import models, transaction
 
 from django.contrib.auth.models import User
 
+RATINGS = [1, 2, 3, 4, 5]
+
 class Review(models.Model):
     """
     Represents a review given by a user (reviewer) to a business user.
 
     Includes a rating (1-5), optional description, and timestamps.
+    Saves and deletes are atomic, so BusinessRatingStats (kept current by
+    signals) always commits together with the review.
     """
     business_user = models.ForeignKey(
         User,
@@ -19,13 +23,96 @@ class Review(models.Model):
         related_name="written_reviews",
     )
     rating = models.PositiveSmallIntegerField(
-        choices= [
-            (1, 1),
-            (2, 2),
-            (3, 3),
-            (4, 4),
-            (5, 5)]
+        choices=[(rating, rating) for rating in RATINGS]
         )
     description = models.TextField(max_length=150, blank=True)
     created_at = models.DateTimeField(auto_now_add=True)
     updated_at = models.DateTimeField(auto_now=True)
+
+    class Meta:
+        """
+        Indexes for the review list pages, unfiltered and per business user,
+        by `(updated_at, id)` or `(rating, id)` as the cursor pagination orders them.
+        A reviewer can review each business user once, enforced by the database.
+        """
+        constraints = [
+            models.UniqueConstraint(fields=['reviewer', 'business_user'], name='review_unique_reviewer_business'),
+        ]
+        indexes = [
+            models.Index(fields=['updated_at', 'id'], name='review_updated_at_id_idx'),
+            models.Index(fields=['rating', 'id'], name='review_rating_id_idx'),
+            models.Index(fields=['business_user', 'updated_at', 'id'], name='review_business_updated_id_idx'),
+            models.Index(fields=['business_user', 'rating', 'id'], name='review_business_rating_id_idx'),
+        ]
+
+    @classmethod
+    def from_db(cls, db, field_names, values):
+        """Remember the stored business user and rating, so a later save() can move the stats."""
+        instance = super().from_db(db, field_names, values)
+        instance._saved_rating = (instance.__dict__.get('business_user_id'), instance.__dict__.get('rating'))
+        return instance
+
+    def lock_saved_rating(self, using=None):
+        """
+        Reread the stored business user and rating under a row lock. Stats move
+        from what is stored, not from what this instance loaded: two concurrent
+        rating edits would otherwise both subtract the same old rating.
+        """
+        stored = (
+            Review.objects.using(using).select_for_update().filter(pk=self.pk)
+            .values_list('business_user_id', 'rating').first()
+        )
+        if stored is not None:
+            self._saved_rating = stored
+
+    def save(self, *args, **kwargs):
+        update_fields = kwargs.get('update_fields')
+        with transaction.atomic(using=kwargs.get('using')):
+            if not self._state.adding and (
+                update_fields is None or {'rating', 'business_user', 'business_user_id'} & set(update_fields)
+            ):
+                self.lock_saved_rating(kwargs.get('using'))
+            super().save(*args, **kwargs)
+        # After post_save: every receiver sees the values this save replaced.
+        self._saved_rating = (self.business_user_id, self.rating)
+
+    def delete(self, *args, **kwargs):
+        with transaction.atomic(using=kwargs.get('using')):
+            self.lock_saved_rating(kwargs.get('using'))
+            return super().delete(*args, **kwargs)
+
+
+class BusinessRatingStats(models.Model):
+    """
+    Review count, rating sum, rating histogram and latest review time for one
+    business user, keyed by the user id.
+
+    Maintained by the signals in app_reviews.signals on every review create,
+    update and delete; a row exists for every business profile.
+    """
+    business_user = models.OneToOneField(
+        User, on_delete=models.CASCADE, primary_key=True, related_name='rating_stats'
+    )
+    review_count = models.IntegerField(default=0)
+    rating_sum = models.IntegerField(default=0)
+    rating_1 = models.IntegerField(default=0)
+    rating_2 = models.IntegerField(default=0)
+    rating_3 = models.IntegerField(default=0)
+    rating_4 = models.IntegerField(default=0)
+    rating_5 = models.IntegerField(default=0)
+    last_review_at = models.DateTimeField(null=True, blank=True)
+
+    def __str__(self):
+        return f"{self.business_user_id}: {self.review_count} review(s), avg {self.average_rating}"
+
+    @property
+    def average_rating(self):
+        """Mean rating rounded to one decimal, None without reviews."""
+        if not self.review_count:
+            return None
+        return round(self.rating_sum / self.review_count, 1)
+
+    @property
+    def histogram(self):
+        """`{rating: count}` for ratings 1-5."""
+        return {rating: getattr(self, f'rating_{rating}') for rating in RATINGS}
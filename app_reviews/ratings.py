@@ -0,0 +1,112 @@
+"""
+Per-business rating aggregates behind the profile serializers and the stats endpoint.
+
+BusinessRatingStats holds one row per business profile (added and dropped
+with the profile and its type) with the review count, the rating sum, a
+column per rating and the latest review time. The signals
+in app_reviews.signals apply +/- deltas inside the review's own transaction,
+from the rating read under a row lock (see Review.save());
+`rebuild()` recounts everything from the reviews.
+"""
+from collections import Counter
+
+from django.db import transaction
+from django.db.models import Count, F, Max, Q, Subquery, Sum
+
+from app_auth.models import UserProfile
+from app_reviews.models import RATINGS, BusinessRatingStats, Review
+
+HISTOGRAM_FIELDS = [f'rating_{rating}' for rating in RATINGS]
+
+
+def rebuild_row(business_user_id):
+    """Recount one business user's reviews into their stats row, creating it if missing."""
+    values = Review.objects.filter(business_user_id=business_user_id).aggregate(
+        review_count=Count('pk'),
+        rating_sum=Sum('rating'),
+        last_review_at=Max('updated_at'),
+        **{f'rating_{rating}': Count('pk', filter=Q(rating=rating)) for rating in RATINGS},
+    )
+    values['rating_sum'] = values['rating_sum'] or 0
+    BusinessRatingStats.objects.update_or_create(business_user_id=business_user_id, defaults=values)
+
+
+def drop_row(business_user_id):
+    """Remove the stats row of a user who is no longer a business user."""
+    BusinessRatingStats.objects.filter(pk=business_user_id).delete()
+
+
+def review_deltas(rating, sign=1):
+    """Deltas for a review with the given rating being added (sign=1) or removed (sign=-1)."""
+    return Counter({'review_count': sign, 'rating_sum': sign * rating, f'rating_{rating}': sign})
+
+
+def latest_review_at(business_user_id):
+    """Subquery: the newest updated_at among the business user's reviews."""
+    return Subquery(
+        Review.objects.filter(business_user_id=business_user_id)
+        .order_by().values('business_user_id').annotate(latest=Max('updated_at')).values('latest')
+    )
+
+
+def apply_deltas(business_user_id, deltas, last_review_at=None):
+    """
+    Add `{field: delta}` to a business user's stats with one UPDATE.
+    `last_review_at` is stored as given (saves); without it (deletes) it is
+    recomputed in the same UPDATE from the remaining reviews. Only business
+    profiles have a row (see app_reviews.signals).
+    """
+    deltas = {field: delta for field, delta in deltas.items() if delta}
+    if business_user_id is None or not (deltas or last_review_at):
+        return
+    values = {field: F(field) + delta for field, delta in deltas.items()}
+    values['last_review_at'] = last_review_at or latest_review_at(business_user_id)
+    BusinessRatingStats.objects.filter(pk=business_user_id).update(**values)
+
+
+def stats_scope(query_params, ignored=()):
+    """
+    BusinessRatingStats row covering exactly the reviews selected by the
+    review list filters in `query_params` (keys in `ignored` are paging /
+    ordering parameters): the business user's row for a lone
+    `business_user_id` / `business_user` filter, else None.
+    """
+    filters = [key for key in query_params if key not in ignored]
+    if len(filters) == 1 and filters[0] in ('business_user_id', 'business_user'):
+        try:
+            return BusinessRatingStats.objects.filter(pk=int(query_params[filters[0]]))
+        except ValueError:
+            return None
+    return None
+
+
+def count_ratings():
+    """`{business_user_id: {field: value}}` for every business profile, zeros included."""
+    stats = {
+        user_id: {'last_review_at': None}
+        for user_id in UserProfile.objects.filter(type='business').values_list('user_id', flat=True)
+    }
+    grouped = (
+        Review.objects.order_by()
+        .values('business_user_id')
+        .annotate(
+            review_count=Count('pk'),
+            rating_sum=Sum('rating'),
+            last_review_at=Max('updated_at'),
+            **{f'rating_{rating}': Count('pk', filter=Q(rating=rating)) for rating in RATINGS},
+        )
+    )
+    for row in grouped:
+        stats[row.pop('business_user_id')] = row
+    return stats
+
+
+def rebuild():
+    """Recount all reviews and replace the stats table."""
+    stats = count_ratings()
+    with transaction.atomic():
+        BusinessRatingStats.objects.all().delete()
+        BusinessRatingStats.objects.bulk_create(
+            BusinessRatingStats(business_user_id=user_id, **values) for user_id, values in stats.items()
+        )
+    return len(stats)
@@ -0,0 +1,49 @@
+from django.db.models.signals import post_save, post_delete
+from django.dispatch import receiver
+
+from app_auth.models import UserProfile
+from app_reviews import ratings
+from app_reviews.models import Review
+
+
+@receiver(post_save, sender=Review)
+def count_rating_on_save(sender, instance, created, raw=False, **kwargs):
+    """Count a new review; a changed rating (or business user) moves it between the stats."""
+    if raw:
+        return
+    previous_business, previous_rating = (None, None) if created else getattr(instance, '_saved_rating', (None, None))
+    deltas = ratings.review_deltas(instance.rating)
+    if previous_business == instance.business_user_id:
+        deltas.update(ratings.review_deltas(previous_rating, sign=-1))
+    elif previous_business is not None:
+        ratings.apply_deltas(previous_business, ratings.review_deltas(previous_rating, sign=-1))
+    elif not created:
+        # Saved without having been loaded from the database: the old values are unknown.
+        deltas = {}
+    ratings.apply_deltas(instance.business_user_id, deltas, last_review_at=instance.updated_at)
+
+
+@receiver(post_delete, sender=Review)
+def count_rating_on_delete(sender, instance, **kwargs):
+    """Uncount a deleted review, cascaded deletes included."""
+    business_user_id, rating = getattr(instance, '_saved_rating', None) or (instance.business_user_id, instance.rating)
+    ratings.apply_deltas(business_user_id, ratings.review_deltas(rating, sign=-1))
+
+
+@receiver(post_save, sender=UserProfile)
+def sync_rating_stats_with_profile(sender, instance, created, raw=False, **kwargs):
+    """
+    Business profiles have a stats row and other users none: a new business
+    profile or a switch to business (re)counts it, a switch away drops it.
+    """
+    if raw or (not created and getattr(instance, '_saved_type', None) == instance.type):
+        return
+    if instance.type == 'business':
+        ratings.rebuild_row(instance.user_id)
+    elif not created:
+        ratings.drop_row(instance.user_id)
+
+
+@receiver(post_delete, sender=UserProfile)
+def drop_rating_stats_with_profile(sender, instance, **kwargs):
+    ratings.drop_row(instance.user_id)
@@ -1,12 +1,22 @@
+import csv
+from io import StringIO
+
+from django.core.management import call_command
 from django.urls import reverse
+from rest_framework.exceptions import ValidationError
+from rest_framework.test import APIRequestFactory
 from rest_framework import status
 from rest_framework.test import APIClient, APITestCase
 from django.contrib.auth.models import User
 from rest_framework.authtoken.models import Token
+from app_auth.cache import get_profile_type
 from app_auth.models import UserProfile
-from app_reviews.models import Review
+from app_meta.models import PlatformStats
+from app_reviews.api.serializers import ReviewListCreateSerializer
+from app_reviews.models import BusinessRatingStats, Review
+from core.query_budget import QueryBudgetTestMixin
 
-class ReviewTests(APITestCase):
+class ReviewTests(QueryBudgetTestMixin, APITestCase):
 
     def setUp(self):
         """ Users, Profiles, Tokens """
@@ -48,11 +58,32 @@ class ReviewTests(APITestCase):
         response = self.client.get(url, format="json")
 
         self.assertEqual(response.status_code, status.HTTP_200_OK)
-        self.assertEqual(len(response.data), 1)
-        self.assertEqual(response.data[0]['rating'], 5)
-        self.assertEqual(response.data[0]['description'], "Excellent service!")
-        self.assertEqual(response.data[0]['reviewer'], self.customer_user.id)
-        self.assertEqual(response.data[0]['business_user'], self.business_user.id)
+        self.assertEqual(len(response.data["results"]), 1)
+        self.assertEqual(response.data["results"][0]['rating'], 5)
+        self.assertEqual(response.data["results"][0]['description'], "Excellent service!")
+        self.assertEqual(response.data["results"][0]['reviewer'], self.customer_user.id)
+        self.assertEqual(response.data["results"][0]['business_user'], self.business_user.id)
+
+
+    # review list answers 304 until the filtered set changes, deletions included (valid)
+    def test_review_list_conditional_get(self):
+        self.authenticate_user("customer")
+        url = reverse("review-list")
+        other = User.objects.create_user(username="cust2", password="pass123")
+        older = Review.objects.create(business_user=self.business_user, reviewer=other, rating=3)
+        Review.objects.filter(pk=older.pk).update(updated_at=self.review.updated_at.replace(year=2000))
+
+        response = self.client.get(url)
+        etag = response["ETag"]
+        self.assertIn("Last-Modified", response)
+        response = self.client.get(url, HTTP_IF_NONE_MATCH=etag)
+        self.assertEqual(response.status_code, status.HTTP_304_NOT_MODIFIED)
+        self.assertNotEqual(self.client.get(url, {"reviewer_id": other.pk})["ETag"], etag)
+
+        older.delete()
+        response = self.client.get(url, HTTP_IF_NONE_MATCH=etag)
+        self.assertEqual(response.status_code, status.HTTP_200_OK)
+        self.assertEqual(len(response.data["results"]), 1)
 
 
     # POST review as customer (duplicate) (valid)
@@ -94,9 +125,12 @@ class ReviewTests(APITestCase):
         self.authenticate_user("customer")
         url = reverse("review-detail", args=[self.review.pk])
         payload = {"rating": 3, "description": "Changed mind"}
-        response = self.client.patch(url, payload, format="json")
+        with self.assertQueryBudget(8):  # token, review + ownership, locked rating, update, rating and platform stats + savepoint pair
+            response = self.client.patch(url, payload, format="json")
         
         self.assertEqual(response.status_code, status.HTTP_200_OK)
+        self.assertEqual(response.data["rating"], 3)
+        self.assertEqual(response.data["reviewer"], self.customer_user.id)
         self.review.refresh_from_db()
         self.assertEqual(self.review.rating, 3)
         self.assertEqual(self.review.description, "Changed mind")
@@ -139,4 +173,176 @@ class ReviewTests(APITestCase):
         response = self.client.delete(url)
 
         self.assertEqual(response.status_code, status.HTTP_403_FORBIDDEN)
-        self.assertTrue(Review.objects.filter(pk=self.review.pk).exists())
\ No newline at end of file
+        self.assertTrue(Review.objects.filter(pk=self.review.pk).exists())
+
+
+    # GET review list query count does not grow with number of reviews (valid)
+    def test_review_list_constant_queries(self):
+        self.authenticate_user("customer")
+        url = reverse("review-list")
+
+        def grow():
+            for index in range(3):
+                reviewer = User.objects.create(username=f"reviewer{index}")
+                Review.objects.create(business_user=self.business_user, reviewer=reviewer, rating=4)
+
+        self.assertConstantQueries(lambda: self.client.get(url), grow)
+
+
+    # export received reviews as CSV (valid)
+    def test_export_reviews_csv(self):
+        self.authenticate_user("business")
+        response = self.client.get(reverse("review-export"), {"output": "csv"})
+
+        self.assertEqual(response.status_code, status.HTTP_200_OK)
+        self.assertIn('filename="reviews.csv"', response["Content-Disposition"])
+        rows = list(csv.DictReader(StringIO(b"".join(response.streaming_content).decode())))
+        self.assertEqual(rows, [{
+            "id": str(self.review.pk),
+            "business_user": str(self.business_user.pk),
+            "reviewer": str(self.customer_user.pk),
+            "rating": "5",
+            "description": "Excellent service!",
+            "created_at": rows[0]["created_at"],
+            "updated_at": rows[0]["updated_at"],
+        }])
+
+
+    def stored_stats(self):
+        row = BusinessRatingStats.objects.get(pk=self.business_user.pk)
+        return row.review_count, row.rating_sum, row.histogram
+
+
+    # saves from stale instances count from the stored rating (valid)
+    def test_rating_stats_concurrent_rating_changes(self):
+        first, second = Review.objects.get(pk=self.review.pk), Review.objects.get(pk=self.review.pk)
+        first.rating = 1
+        first.save()
+        second.rating = 1
+        second.save()
+        self.assertEqual(self.stored_stats(), (1, 1, {1: 1, 2: 0, 3: 0, 4: 0, 5: 0}))
+        self.assertEqual(PlatformStats.objects.get().rating_sum, 1)
+
+        second.rating = 4
+        second.save()
+        first.delete()
+        self.assertEqual(self.stored_stats(), (0, 0, {1: 0, 2: 0, 3: 0, 4: 0, 5: 0}))
+        self.assertEqual(PlatformStats.objects.get().rating_sum, 0)
+
+
+    # rating stats follow review create, rating changes and deletes (valid)
+    def test_rating_stats_follow_writes(self):
+        other = User.objects.create_user(username="cust2", password="pass123")
+        UserProfile.objects.create(user=other, type="customer")
+        self.client.credentials(HTTP_AUTHORIZATION='Token ' + Token.objects.create(user=other).key)
+        self.client.post(reverse("review-list"), {"business_user": self.business_user.pk, "rating": 3}, format="json")
+        self.assertEqual(self.stored_stats(), (2, 8, {1: 0, 2: 0, 3: 1, 4: 0, 5: 1}))
+
+        self.authenticate_user("customer")
+        self.client.patch(reverse("review-detail", args=[self.review.pk]), {"rating": 1}, format="json")
+        self.assertEqual(self.stored_stats(), (2, 4, {1: 1, 2: 0, 3: 1, 4: 0, 5: 0}))
+
+        self.client.delete(reverse("review-detail", args=[self.review.pk]))
+        self.assertEqual(self.stored_stats(), (1, 3, {1: 0, 2: 0, 3: 1, 4: 0, 5: 0}))
+        stats = BusinessRatingStats.objects.get(pk=self.business_user.pk)
+        self.assertEqual(stats.last_review_at, Review.objects.get().updated_at)
+
+
+    # stats endpoint and business profile list expose the aggregates (valid)
+    def test_rating_stats_endpoint(self):
+        self.authenticate_user("customer")
+        with self.assertQueryBudget(2):  # token, stats row
+            response = self.client.get(reverse("review-stats", args=[self.business_user.pk]))
+
+        self.assertEqual(response.status_code, status.HTTP_200_OK)
+        self.assertEqual(response.data["review_count"], 1)
+        self.assertEqual(response.data["average_rating"], "5.0")
+        self.assertEqual(response.data["rating_histogram"], {"1": 0, "2": 0, "3": 0, "4": 0, "5": 1})
+        self.assertEqual(self.client.get(reverse("review-stats", args=[self.customer_user.pk])).status_code, 404)
+
+        business = self.client.get(reverse("business-list")).data[0]
+        self.assertEqual(business["ratings"]["review_count"], 1)
+
+
+    # stats rows follow profile type changes and deletes (valid)
+    def test_rating_stats_follow_profile_type(self):
+        self.authenticate_user("customer")
+        url = reverse("review-stats", args=[self.business_user.pk])
+
+        self.business_profile.type = "customer"
+        self.business_profile.save()
+        self.assertEqual(self.client.get(url).status_code, status.HTTP_404_NOT_FOUND)
+
+        self.business_profile.type = "business"
+        self.business_profile.save()
+        response = self.client.get(url)
+        self.assertEqual(response.status_code, status.HTTP_200_OK)
+        self.assertEqual(response.data["review_count"], 1)
+
+        self.business_profile.delete()
+        self.assertEqual(self.client.get(url).status_code, status.HTTP_404_NOT_FOUND)
+
+
+    # rebuild command reconciles writes that bypassed the signals (valid)
+    def test_rebuild_rating_stats_command(self):
+        Review.objects.update(rating=2)
+        call_command("rebuild_rating_stats", stdout=StringIO())
+        self.assertEqual(self.stored_stats(), (1, 2, {1: 0, 2: 1, 3: 0, 4: 0, 5: 0}))
+
+
+
+    # create is a single INSERT (plus the rating stats), profile types come from the cache (valid)
+    def test_create_review_queries(self):
+        other = User.objects.create_user(username="cust2", password="pass123")
+        UserProfile.objects.create(user=other, type="customer")
+        self.client.credentials(HTTP_AUTHORIZATION='Token ' + Token.objects.create(user=other).key)
+        url = reverse("review-list")
+        get_profile_type(other.pk), get_profile_type(self.business_user.pk)  # warm the type cache
+
+        with self.assertQueryBudget(6):  # token, insert, rating and platform stats + savepoint pair
+            response = self.client.post(url, {"business_user": self.business_user.pk, "rating": 4}, format="json")
+
+        self.assertEqual(response.status_code, status.HTTP_201_CREATED)
+        self.assertEqual(response.data["business_user"], self.business_user.pk)
+        self.assertEqual(response.data["reviewer"], other.pk)
+
+
+    # two POSTs that both pass validation before either inserts: one review, one 400 (invalid)
+    def test_concurrent_create_review_duplicate(self):
+        other = User.objects.create_user(username="cust2", password="pass123")
+        UserProfile.objects.create(user=other, type="customer")
+        request = APIRequestFactory().post(reverse("review-list"))
+        request.user = other
+        payload = {"business_user": self.business_user.pk, "rating": 4}
+        first, second = (
+            ReviewListCreateSerializer(data=payload, context={"request": request}) for _ in range(2)
+        )
+        self.assertTrue(first.is_valid())
+        self.assertTrue(second.is_valid())
+
+        first.save()
+        with self.assertRaises(ValidationError) as raised:
+            second.save()
+
+        self.assertEqual(raised.exception.detail, {"non_field_errors": ["You have already reviewed this business."]})
+        self.assertEqual(Review.objects.filter(reviewer=other).count(), 1)
+
+
+    # cursor pages by rating for one business, total from the rating stats (valid)
+    def test_review_list_cursor_pagination(self):
+        for index, rating in enumerate([1, 4, 2, 4]):
+            reviewer = User.objects.create(username=f"reviewer{index}")
+            Review.objects.create(business_user=self.business_user, reviewer=reviewer, rating=rating)
+        self.authenticate_user("customer")
+        params = {"business_user_id": self.business_user.pk, "ordering": "-rating", "page_size": 3, "with_count": "true"}
+
+        with self.assertQueryBudget(4):  # token, validators, count, page
+            first = self.client.get(reverse("review-list"), params)
+        second = self.client.get(first.data["next"])
+
+        self.assertEqual(first.data["count"], 5)
+        ratings = [review["rating"] for review in first.data["results"] + second.data["results"]]
+        self.assertEqual(ratings, [5, 4, 4, 2, 1])
+        self.assertIsNone(second.data["next"])
+        filtered = self.client.get(reverse("review-list"), {"reviewer_id": self.customer_user.pk, "with_count": "true"})
+        self.assertEqual(filtered.data["count"], 1)
@@ -0,0 +1,56 @@
+"""
+Conditional GET (ETag / Last-Modified) for DRF views.
+
+Views mix in `ConditionalGetMixin` and implement `get_validators()`. It must
+be cheap -- one single-row or aggregate query, never serialization -- and
+return the values the representation depends on. They are hashed together
+with the absolute request URI (the bodies hold absolute URLs and the query
+string selects the page) into the ETag. When the client's If-None-Match /
+If-Modified-Since still matches, a 304 is returned before the object is
+fetched or serialized.
+
+Last-Modified is only a second-class validator here: it is sent when the view
+has a timestamp, but If-None-Match takes precedence when both are present.
+"""
+import hashlib
+
+from django.utils.cache import get_conditional_response
+from django.utils.http import http_date
+
+
+def make_etag(*parts):
+    """Quoted strong ETag from the repr of the given values."""
+    digest = hashlib.md5(repr(parts).encode(), usedforsecurity=False).hexdigest()
+    return f'"{digest}"'
+
+
+class ConditionalGetMixin:
+    """Answer GET with 304 Not Modified when the client's copy is still current."""
+
+    def get_validators(self):
+        """
+        Return `(source, last_modified)` for the requested resource.
+
+        `source` is any repr-able value that changes whenever the response body
+        does; `last_modified` is a datetime or None. Return None to skip
+        conditional handling, e.g. when the object does not exist.
+        """
+        return None
+
+    def get(self, request, *args, **kwargs):
+        validators = self.get_validators()
+        if validators is None:
+            return super().get(request, *args, **kwargs)
+
+        source, last_modified = validators
+        etag = make_etag(request.build_absolute_uri(), source)
+        timestamp = int(last_modified.timestamp()) if last_modified else None
+        response = get_conditional_response(request, etag=etag, last_modified=timestamp)
+        if response is None:
+            response = super().get(request, *args, **kwargs)
+            if response.status_code != 200:
+                return response
+        response['ETag'] = etag
+        if timestamp is not None:
+            response['Last-Modified'] = http_date(timestamp)
+        return response
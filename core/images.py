@@ -0,0 +1,115 @@
+"""
+Background image derivatives (resized WebP/JPEG thumbnails).
+
+Originals are stored by the upload request as before. Once the transaction
+commits, a job on a small per-process thread pool renders one WebP and one
+JPEG per width in settings.IMAGE_DERIVATIVE_WIDTHS and stores them next to
+the original. The apps record the stored names on the model
+(`{"<width>": {"webp": name, "jpg": name}}`) so serializers can expose URLs
+without touching the file system.
+"""
+import hashlib
+import logging
+from concurrent.futures import ThreadPoolExecutor
+from io import BytesIO
+
+from django.conf import settings
+from django.core.files.base import ContentFile
+from django.db import close_old_connections, transaction
+from PIL import Image, ImageOps
+
+logger = logging.getLogger(__name__)
+
+DERIVATIVE_FORMATS = {
+    'webp': 'WEBP',
+    'jpg': 'JPEG',
+}
+
+_executor = None
+
+
+def get_executor():
+    global _executor
+    if _executor is None:
+        _executor = ThreadPoolExecutor(
+            max_workers=settings.IMAGE_PIPELINE_WORKERS,
+            thread_name_prefix='image-derivatives',
+        )
+    return _executor
+
+
+def _run(job, *args):
+    try:
+        job(*args)
+    except Exception:
+        logger.exception("Image derivative job %s%r failed", job.__name__, args)
+    finally:
+        close_old_connections()
+
+
+def enqueue_after_commit(job, *args):
+    """
+    Run `job(*args)` on the image worker pool once the current transaction
+    commits (inline when settings.IMAGE_PIPELINE_EAGER is set, e.g. in tests).
+    """
+    def submit():
+        if settings.IMAGE_PIPELINE_EAGER:
+            job(*args)
+        else:
+            get_executor().submit(_run, job, *args)
+    transaction.on_commit(submit)
+
+
+def read_source(field_file):
+    """The bytes of `field_file` and a short hash of them (to tell re-uploads under the same name apart)."""
+    with field_file.open('rb') as source:
+        content = source.read()
+    return content, hashlib.sha256(content).hexdigest()[:16]
+
+
+def generate_derivatives(field_file, derivative_path, content=None):
+    """
+    Render all derivatives of `field_file` and store them in its storage.
+
+    `derivative_path(width, ext)` returns the storage name of one derivative.
+    `content` is the source already read with `read_source()`, if any.
+    Images are never upscaled. Returns the variants mapping.
+    """
+    if content is None:
+        content, _ = read_source(field_file)
+    image = Image.open(BytesIO(content))
+    image.load()
+    image = ImageOps.exif_transpose(image)
+
+    variants = {}
+    for width in settings.IMAGE_DERIVATIVE_WIDTHS:
+        resized = image.copy()
+        resized.thumbnail((width, width * 10), Image.LANCZOS)
+        variants[str(width)] = {}
+        for ext, image_format in DERIVATIVE_FORMATS.items():
+            converted = resized
+            if image_format == 'JPEG' and resized.mode != 'RGB':
+                converted = resized.convert('RGB')
+            elif image_format == 'WEBP' and resized.mode not in ('RGB', 'RGBA'):
+                converted = resized.convert('RGBA')
+            buffer = BytesIO()
+            converted.save(buffer, format=image_format, quality=80)
+            name = field_file.storage.save(derivative_path(width, ext), ContentFile(buffer.getvalue()))
+            variants[str(width)][ext] = name
+    return variants
+
+
+def variant_names(variants):
+    """All storage names in a variants mapping."""
+    return {name for names in variants.values() for name in names.values()}
+
+
+def variant_urls(storage, variants, build_url=None):
+    """Map a stored variants mapping to URLs, optionally post-processed by `build_url`."""
+    urls = {}
+    for width, names in variants.items():
+        urls[width] = {}
+        for ext, name in names.items():
+            url = storage.url(name)
+            urls[width][ext] = build_url(url) if build_url else url
+    return urls
@@ -0,0 +1,171 @@
+"""
+Keyset (cursor) pagination shared by the list endpoints.
+"""
+import base64
+import binascii
+import json
+from collections import OrderedDict
+
+from django.core.exceptions import ValidationError
+from django.db import connections
+from django.db.models import Q
+from rest_framework.exceptions import NotFound
+from rest_framework.pagination import BasePagination
+from rest_framework.response import Response
+from rest_framework.utils.urls import replace_query_param
+
+
+class KeysetPagination(BasePagination):
+    """
+    Cursor pagination keyed on `(<ordering field>, id)`.
+
+    Each page is a `WHERE (field, id) > (last_value, last_id) ORDER BY field, id LIMIT n`,
+    so page 1000 costs the same as page 1. The ordering follows the `?ordering=`
+    parameter when it names one of `ordering_fields`, else `default_ordering`.
+    No COUNT(*) is run unless `?with_count=true` is passed.
+    """
+    page_size = 6
+    page_size_query_param = 'page_size'
+    max_page_size = 100
+    cursor_query_param = 'cursor'
+    count_query_param = 'with_count'
+    ordering_query_param = 'ordering'
+    ordering_fields = []
+    default_ordering = '-id'
+    invalid_cursor_message = 'Invalid cursor'
+
+    def paginate_queryset(self, queryset, request, view=None):
+        self.request = request
+        self.base_url = request.build_absolute_uri()
+        self.page_size = self.get_page_size(request)
+        self.field, self.ascending = self.get_ordering(request)
+        self.nullable = self.field != 'id' and queryset.model._meta.get_field(self.field).null
+        self.nulls_largest = connections[queryset.db].vendor != 'sqlite'
+
+        self.count = None
+        if request.query_params.get(self.count_query_param, '').lower() in ('1', 'true', 'yes'):
+            self.count = self.get_count(queryset)
+
+        cursor = self.decode_cursor(request, queryset.model)
+        self.reverse = bool(cursor and cursor['reverse'])
+        scan_ascending = self.ascending != self.reverse
+
+        queryset = queryset.order_by(*self.get_order_by(scan_ascending))
+        if cursor:
+            queryset = queryset.filter(self.after(scan_ascending, cursor['value'], cursor['id']))
+
+        results = list(queryset[:self.page_size + 1])
+        has_more = len(results) > self.page_size
+        results = results[:self.page_size]
+        if self.reverse:
+            results.reverse()
+
+        self.page = results
+        self.has_next = has_more if not self.reverse else True
+        self.has_previous = has_more if self.reverse else cursor is not None
+        return results
+
+    def get_paginated_response(self, data):
+        response = OrderedDict()
+        if self.count is not None:
+            response['count'] = self.count
+        response['next'] = self.get_next_link()
+        response['previous'] = self.get_previous_link()
+        response['results'] = data
+        return Response(response)
+
+    def get_paginated_response_schema(self, schema):
+        return {
+            'type': 'object',
+            'required': ['results'],
+            'properties': {
+                'count': {'type': 'integer', 'example': 123},
+                'next': {'type': 'string', 'nullable': True, 'format': 'uri'},
+                'previous': {'type': 'string', 'nullable': True, 'format': 'uri'},
+                'results': schema,
+            },
+        }
+
+    def get_schema_operation_parameters(self, view):
+        return [
+            {'name': self.cursor_query_param, 'required': False, 'in': 'query',
+             'description': 'The pagination cursor value.', 'schema': {'type': 'string'}},
+            {'name': self.page_size_query_param, 'required': False, 'in': 'query',
+             'description': 'Number of results to return per page.', 'schema': {'type': 'integer'}},
+            {'name': self.count_query_param, 'required': False, 'in': 'query',
+             'description': 'Include the total number of results.', 'schema': {'type': 'boolean'}},
+        ]
+
+    def get_count(self, queryset):
+        """Total number of rows; override to read it from somewhere cheaper."""
+        return queryset.count()
+
+    def get_page_size(self, request):
+        try:
+            size = int(request.query_params[self.page_size_query_param])
+        except (KeyError, ValueError):
+            return self.page_size
+        if size <= 0:
+            return self.page_size
+        return min(size, self.max_page_size)
+
+    def get_ordering(self, request):
+        """Return (field, ascending) from `?ordering=` if allowed, else from `default_ordering`."""
+        requested = request.query_params.get(self.ordering_query_param, '').split(',')[0].strip()
+        ordering = requested if requested.lstrip('-') in self.ordering_fields else self.default_ordering
+        return ordering.lstrip('-'), not ordering.startswith('-')
+
+    def get_order_by(self, ascending):
+        if self.field == 'id':
+            return ['id' if ascending else '-id']
+        prefix = '' if ascending else '-'
+        return [prefix + self.field, prefix + 'id']
+
+    def after(self, ascending, value, pk):
+        """Rows strictly after `(value, pk)` when scanning in the given direction."""
+        op = 'gt' if ascending else 'lt'
+        after_id = Q(**{f'id__{op}': pk})
+        if self.field == 'id':
+            return after_id
+        # NULLs sort last ascending where they count as largest (PostgreSQL), first on SQLite.
+        nulls_after = self.nullable and self.nulls_largest == ascending
+        if value is None:
+            condition = Q(**{f'{self.field}__isnull': True}) & after_id
+            if not nulls_after:
+                condition |= Q(**{f'{self.field}__isnull': False})
+            return condition
+        condition = Q(**{f'{self.field}__{op}': value}) | (Q(**{self.field: value}) & after_id)
+        if nulls_after:
+            condition |= Q(**{f'{self.field}__isnull': True})
+        return condition
+
+    def get_next_link(self):
+        if not self.has_next or not self.page:
+            return None
+        return self.encode_cursor(self.page[-1], reverse=False)
+
+    def get_previous_link(self):
+        if not self.has_previous or not self.page:
+            return None
+        return self.encode_cursor(self.page[0], reverse=True)
+
+    def encode_cursor(self, obj, reverse):
+        value = getattr(obj, self.field)
+        if value is not None and not isinstance(value, (int, str)):
+            value = value.isoformat() if hasattr(value, 'isoformat') else str(value)
+        payload = json.dumps({'v': value, 'id': obj.pk, 'r': int(reverse)}, separators=(',', ':'))
+        encoded = base64.urlsafe_b64encode(payload.encode()).decode().rstrip('=')
+        return replace_query_param(self.base_url, self.cursor_query_param, encoded)
+
+    def decode_cursor(self, request, model):
+        encoded = request.query_params.get(self.cursor_query_param)
+        if not encoded:
+            return None
+        try:
+            payload = json.loads(base64.urlsafe_b64decode(encoded + '=' * (-len(encoded) % 4)))
+            value = payload['v']
+            if value is not None:
+                value = model._meta.get_field(self.field).to_python(value)
+            return {'value': value, 'id': int(payload['id']), 'reverse': bool(payload.get('r'))}
+        except (binascii.Error, ValueError, TypeError, KeyError, AttributeError, ValidationError):
+            raise NotFound(self.invalid_cursor_message)
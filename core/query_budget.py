@@ -0,0 +1,98 @@
+"""
+Query budgets: keep the number of SQL queries per request bounded.
+
+- `QueryBudgetMiddleware` counts the queries of every request and logs a
+  warning when a view exceeds its budget (`query_budget` attribute on the
+  view class, else settings.QUERY_BUDGET_DEFAULT). Enabled with
+  settings.QUERY_BUDGET_LOGGING, so it is free when switched off.
+- `QueryBudgetTestMixin` gives test cases assertions that an endpoint stays
+  within a budget and that its query count does not grow with the data.
+"""
+import logging
+from contextlib import contextmanager
+
+from django.conf import settings
+from django.core.exceptions import MiddlewareNotUsed
+from django.db import connections
+from django.test.utils import CaptureQueriesContext
+
+logger = logging.getLogger(__name__)
+
+
+class QueryCounter:
+    """Database execute wrapper that counts executed statements."""
+
+    def __init__(self):
+        self.count = 0
+
+    def __call__(self, execute, sql, params, many, context):
+        self.count += 1
+        return execute(sql, params, many, context)
+
+
+@contextmanager
+def count_queries(using='default'):
+    """Count queries run on `using` inside the block (works with DEBUG off)."""
+    counter = QueryCounter()
+    with connections[using].execute_wrapper(counter):
+        yield counter
+
+
+class QueryBudgetMiddleware:
+    """Log requests whose query count exceeds the view's budget."""
+
+    def __init__(self, get_response):
+        if not settings.QUERY_BUDGET_LOGGING:
+            raise MiddlewareNotUsed()
+        self.get_response = get_response
+
+    def __call__(self, request):
+        with count_queries() as counter:
+            response = self.get_response(request)
+        budget = getattr(request, 'query_budget', settings.QUERY_BUDGET_DEFAULT)
+        if counter.count > budget:
+            logger.warning(
+                "Query budget exceeded: %s %s ran %d queries (budget %d)",
+                request.method, request.path, counter.count, budget,
+            )
+        return response
+
+    def process_view(self, request, view_func, view_args, view_kwargs):
+        budget = getattr(getattr(view_func, 'view_class', None), 'query_budget', None)
+        if budget is not None:
+            request.query_budget = budget
+
+
+class QueryBudgetTestMixin:
+    """Assertions for test cases that guard endpoints against N+1 queries."""
+
+    @contextmanager
+    def assertQueryBudget(self, budget, using='default'):
+        """Fail if the block runs more than `budget` queries."""
+        with CaptureQueriesContext(connections[using]) as context:
+            yield context
+        executed = len(context.captured_queries)
+        if executed > budget:
+            queries = '\n'.join(query['sql'] for query in context.captured_queries)
+            self.fail(f"{executed} queries executed, budget is {budget}:\n{queries}")
+
+    def assertConstantQueries(self, request, grow, using='default'):
+        """
+        Call `request()`, then `grow()` (adds more rows), then `request()` again
+        and fail unless both requests ran the same number of queries. Each
+        measured request is preceded by an unmeasured one, so per-process
+        caches (e.g. cached token authentication) are warm both times.
+        """
+        request()
+        with CaptureQueriesContext(connections[using]) as before:
+            request()
+        grow()
+        request()
+        with CaptureQueriesContext(connections[using]) as after:
+            request()
+        if len(before.captured_queries) != len(after.captured_queries):
+            queries = '\n'.join(query['sql'] for query in after.captured_queries)
+            self.fail(
+                f"Query count grew from {len(before.captured_queries)} to "
+                f"{len(after.captured_queries)} with more data:\n{queries}"
+            )
@@ -56,6 +56,7 @@ INSTALLED_APPS = [
 MIDDLEWARE = [
     'corsheaders.middleware.CorsMiddleware', 
     'django.middleware.security.SecurityMiddleware',
+    'core.query_budget.QueryBudgetMiddleware',
     'django.contrib.sessions.middleware.SessionMiddleware',
     'django.middleware.common.CommonMiddleware',
     'django.middleware.csrf.CsrfViewMiddleware',
@@ -97,6 +98,51 @@ DATABASES = {
 }
 
 
+# Cache
+# https://docs.djangoproject.com/en/5.2/topics/cache/
+# Local memory by default (tests, runserver). Multi-worker deployments must
+# point this at a shared backend so offer cache invalidation reaches every worker.
+
+CACHES = {
+    'default': {
+        'BACKEND': config('CACHE_BACKEND', default='django.core.cache.backends.locmem.LocMemCache'),
+        'LOCATION': config('CACHE_LOCATION', default='coderr'),
+    }
+}
+
+OFFERS_CACHE_ALIAS = 'default'
+OFFERS_CACHE_TIMEOUT = config('OFFERS_CACHE_TIMEOUT', default=300, cast=int)
+PROFILE_TYPE_CACHE_TIMEOUT = config('PROFILE_TYPE_CACHE_TIMEOUT', default=3600, cast=int)
+
+# Resolved API tokens kept per worker process (see app_auth/authentication.py)
+AUTH_TOKEN_CACHE_SIZE = config('AUTH_TOKEN_CACHE_SIZE', default=10000, cast=int)
+AUTH_TOKEN_CACHE_TIMEOUT = config('AUTH_TOKEN_CACHE_TIMEOUT', default=60, cast=int)
+
+
+# Image derivatives (see core/images.py)
+
+IMAGE_DERIVATIVE_WIDTHS = (160, 320, 640)
+IMAGE_PIPELINE_WORKERS = config('IMAGE_PIPELINE_WORKERS', default=2, cast=int)
+IMAGE_PIPELINE_EAGER = config('IMAGE_PIPELINE_EAGER', default=False, cast=bool)
+
+# Picture uploads (see core/uploads.py)
+
+IMAGE_UPLOAD_MAX_SIZE = 2 * 1024 * 1024
+IMAGE_UPLOAD_MAX_PIXELS = config('IMAGE_UPLOAD_MAX_PIXELS', default=25_000_000, cast=int)
+
+
+# Platform stats (see app_meta/platform.py)
+# BASE_INFO_MAX_AGE is the Cache-Control max-age of the base-info endpoint.
+
+BASE_INFO_MAX_AGE = config('BASE_INFO_MAX_AGE', default=60, cast=int)
+
+
+# Query budgets (see core/query_budget.py)
+
+QUERY_BUDGET_LOGGING = config('QUERY_BUDGET_LOGGING', default=False, cast=bool)
+QUERY_BUDGET_DEFAULT = config('QUERY_BUDGET_DEFAULT', default=20, cast=int)
+
+
 # Password validation
 # https://docs.djangoproject.com/en/5.2/ref/settings/#auth-password-validators
 
@@ -116,6 +162,30 @@ AUTH_PASSWORD_VALIDATORS = [
 ]
 
 
+# Password hashing (see app_auth/hashers.py and app_auth/hashing.py)
+# PBKDF2 iterations (0: Django's default); changing it rehashes passwords on
+# the next login. Hashes run in PASSWORD_HASHING_WORKERS processes per worker,
+# niced by PASSWORD_HASHING_NICENESS so requests get the CPU first; beyond
+# PASSWORD_HASHING_QUEUE_LIMIT hashes in flight, or after waiting
+# PASSWORD_HASHING_TIMEOUT seconds for one, login and registration answer 503
+# with Retry-After: PASSWORD_HASHING_RETRY_AFTER. Keep the limit below
+# GUNICORN_THREADS, or logins can hold every thread of a worker.
+
+PASSWORD_HASHERS = [
+    'app_auth.hashers.ConfigurablePBKDF2PasswordHasher',
+    'django.contrib.auth.hashers.PBKDF2SHA1PasswordHasher',
+    'django.contrib.auth.hashers.Argon2PasswordHasher',
+    'django.contrib.auth.hashers.BCryptSHA256PasswordHasher',
+    'django.contrib.auth.hashers.ScryptPasswordHasher',
+]
+PASSWORD_PBKDF2_ITERATIONS = config('PASSWORD_PBKDF2_ITERATIONS', default=0, cast=int)
+PASSWORD_HASHING_WORKERS = config('PASSWORD_HASHING_WORKERS', default=2, cast=int)
+PASSWORD_HASHING_NICENESS = config('PASSWORD_HASHING_NICENESS', default=19, cast=int)
+PASSWORD_HASHING_QUEUE_LIMIT = config('PASSWORD_HASHING_QUEUE_LIMIT', default=4, cast=int)
+PASSWORD_HASHING_TIMEOUT = config('PASSWORD_HASHING_TIMEOUT', default=10, cast=float)
+PASSWORD_HASHING_RETRY_AFTER = config('PASSWORD_HASHING_RETRY_AFTER', default=1, cast=int)
+
+
 # Internationalization
 # https://docs.djangoproject.com/en/5.2/topics/i18n/
 
@@ -149,7 +219,7 @@ REST_FRAMEWORK = {
         'rest_framework.permissions.IsAuthenticated'
     ],
     'DEFAULT_AUTHENTICATION_CLASSES': [
-        'rest_framework.authentication.TokenAuthentication',
+        'app_auth.authentication.CachedTokenAuthentication',
         'rest_framework.authentication.SessionAuthentication',
     ],
     'DEFAULT_FILTER_BACKENDS': ['django_filters.rest_framework.DjangoFilterBackend'],
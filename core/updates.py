@@ -0,0 +1,51 @@
+"""
+Shared write path for detail views.
+
+- `OwnerAnnotationMixin` annotates the view's queryset with `is_owner`, so
+  the ownership check is part of the SELECT that `get_object()` runs anyway
+  and object permissions need no further queries (`IsOwnerOrAdmin`).
+- `UpdateResponseMixin` validates and saves with the view's serializer and
+  answers with `response_serializer_class` over the saved instance, instead
+  of fetching (and permission-checking) the object a second time.
+
+Together an update costs the object SELECT plus the UPDATE (and whatever
+the model's signals do).
+"""
+from django.db.models import BooleanField, ExpressionWrapper, Q
+from rest_framework import permissions
+from rest_framework.response import Response
+
+
+class OwnerAnnotationMixin:
+    """Annotate `is_owner` (`owner_lookup` matches the requesting user) onto the queryset."""
+    owner_lookup = None
+
+    def get_queryset(self):
+        queryset = super().get_queryset()
+        is_owner = ExpressionWrapper(Q(**{self.owner_lookup: self.request.user.pk}), output_field=BooleanField())
+        return queryset.annotate(is_owner=is_owner)
+
+
+class IsAnnotatedOwnerOrAdmin(permissions.BasePermission):
+    """
+    Object-level permission for the owner (as annotated by OwnerAnnotationMixin)
+    or staff / superusers.
+    """
+
+    def has_object_permission(self, request, view, obj):
+        is_admin = request.user.is_staff or request.user.is_superuser
+        return bool(obj.is_owner) or is_admin
+
+
+class UpdateResponseMixin:
+    """Answer PUT / PATCH with `response_serializer_class` over the saved instance."""
+    response_serializer_class = None
+
+    def update(self, request, *args, **kwargs):
+        partial = kwargs.pop('partial', False)
+        instance = self.get_object()
+        serializer = self.get_serializer(instance, data=request.data, partial=partial)
+        serializer.is_valid(raise_exception=True)
+        self.perform_update(serializer)
+        response_serializer = self.response_serializer_class(serializer.instance, context=self.get_serializer_context())
+        return Response(response_serializer.data)
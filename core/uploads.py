@@ -0,0 +1,105 @@
+"""
+Streaming image uploads with early rejection.
+
+`ImageUploadHandler` replaces Django's memory / temporary-file handler pair
+for the views that accept pictures (`ImageUploadMixin`). Every file is
+streamed to a temporary file, never held in memory, and the upload is
+aborted as soon as it is known to be bad:
+
+- the type is sniffed from the first bytes (JPEG, PNG, GIF, BMP, TIFF,
+  WebP); anything else is rejected before the rest of the body is read, and
+  the file is renamed to the sniffed extension, so the upload path helpers
+  never see a foreign or missing extension;
+- the upload stops once it grows past settings.IMAGE_UPLOAD_MAX_SIZE;
+- once complete, the image header is read and pictures with more than
+  settings.IMAGE_UPLOAD_MAX_PIXELS pixels (decompression bombs) are refused.
+
+Rejections raise `ImageUploadRejected`, a MultiPartParserError, which DRF
+answers with 400.
+"""
+import os
+
+from django.conf import settings
+from django.core.files.uploadhandler import TemporaryFileUploadHandler
+from django.http.multipartparser import MultiPartParserError
+from PIL import Image
+
+# (magic bytes, offset, extension, content type); WebP is "RIFF....WEBP".
+IMAGE_SIGNATURES = [
+    (b'\xff\xd8\xff', 0, 'jpg', 'image/jpeg'),
+    (b'\x89PNG\r\n\x1a\n', 0, 'png', 'image/png'),
+    (b'GIF87a', 0, 'gif', 'image/gif'),
+    (b'GIF89a', 0, 'gif', 'image/gif'),
+    (b'BM', 0, 'bmp', 'image/bmp'),
+    (b'II*\x00', 0, 'tiff', 'image/tiff'),
+    (b'MM\x00*', 0, 'tiff', 'image/tiff'),
+    (b'WEBP', 8, 'webp', 'image/webp'),
+]
+SNIFF_LENGTH = 12
+
+
+class ImageUploadRejected(MultiPartParserError):
+    """An uploaded file is not an acceptable image."""
+
+
+def sniff_image_type(head):
+    """`(extension, content type)` of the image starting with `head`, or None."""
+    for magic, offset, ext, content_type in IMAGE_SIGNATURES:
+        if head[offset:offset + len(magic)] == magic:
+            if ext == 'webp' and not head.startswith(b'RIFF'):
+                continue
+            return ext, content_type
+    return None
+
+
+class ImageUploadHandler(TemporaryFileUploadHandler):
+    """Stream uploads to a temporary file, checking type, size and pixel count on the way."""
+
+    def new_file(self, *args, **kwargs):
+        super().new_file(*args, **kwargs)
+        self.head = b''
+        self.sniffed = False
+
+    def receive_data_chunk(self, raw_data, start):
+        if start + len(raw_data) > settings.IMAGE_UPLOAD_MAX_SIZE:
+            self.reject(f"Image file too large (max {settings.IMAGE_UPLOAD_MAX_SIZE // (1024 * 1024)}MB)")
+        if not self.sniffed:
+            self.head += raw_data[:SNIFF_LENGTH - len(self.head)]
+            if len(self.head) >= SNIFF_LENGTH:
+                self.sniff()
+        return super().receive_data_chunk(raw_data, start)
+
+    def file_complete(self, file_size):
+        if not self.sniffed:
+            self.sniff()
+        file = super().file_complete(file_size)
+        try:
+            with Image.open(file) as image:
+                width, height = image.size
+        except (OSError, ValueError, SyntaxError, Image.DecompressionBombError):
+            self.reject("Upload a valid image. The file is damaged or not an image.")
+        if width * height > settings.IMAGE_UPLOAD_MAX_PIXELS:
+            self.reject(f"Image dimensions too large (max {settings.IMAGE_UPLOAD_MAX_PIXELS:,} pixels)")
+        file.seek(0)
+        return file
+
+    def sniff(self):
+        """Reject unknown types; name the file after the sniffed type."""
+        image_type = sniff_image_type(self.head)
+        if image_type is None:
+            self.reject("Unsupported image type (JPEG, PNG, GIF, BMP, TIFF or WebP only)")
+        ext, self.file.content_type = image_type
+        self.file.name = f'{os.path.splitext(self.file_name)[0] or "image"}.{ext}'
+        self.sniffed = True
+
+    def reject(self, message):
+        self.file.close()
+        raise ImageUploadRejected(message)
+
+
+class ImageUploadMixin:
+    """Parse the view's multipart uploads with ImageUploadHandler."""
+
+    def initialize_request(self, request, *args, **kwargs):
+        request.upload_handlers = [ImageUploadHandler(request)]
+        return super().initialize_request(request, *args, **kwargs)
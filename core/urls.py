@@ -17,7 +17,7 @@ Including another URLconf
 from django.contrib import admin
 from django.urls import path, include
 from app_offers.api.views import OfferDetailsDetailView
-from app_orders.api.views import OrderCountView
+from app_orders.api.views import OrderCountView, OrderCountBatchView
 
 from django.conf import settings
 from django.conf.urls.static import static
@@ -38,6 +38,7 @@ urlpatterns = [
 
     path('api/order-count/<int:business_user_id>/', OrderCountView.as_view(), name='ordercount-inprogress'),
     path('api/completed-order-count/<int:business_user_id>/', OrderCountView.as_view(), name='ordercount-completed'),
+    path('api/order-counts/', OrderCountBatchView.as_view(), name='ordercount-batch'),
 
     # API documentation (including Swagger UI)
     path("api/schema/", SpectacularAPIView.as_view(), name="schema"),
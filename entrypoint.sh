@@ -57,4 +57,7 @@ for g in guests:
 PYCODE
 
 echo "[entrypoint] Starting Gunicorn"
-exec gunicorn core.wsgi:application --bind 0.0.0.0:8000 --workers 3 --timeout 60
+# Threaded workers: a request waiting for the password hashing pool does not
+# block the worker's other threads.
+exec gunicorn core.wsgi:application --bind 0.0.0.0:8000 --workers 3 \
+    --worker-class gthread --threads "${GUNICORN_THREADS:-8}" --timeout 60